@@ -0,0 +1,87 @@
+"""
+Benchmark: k-NN job index vs exhaustive scan.
+
+    python -m benchmarks.bench_job_index [--jobs N] [--queries Q] [--k K]
+
+Job vectors are drawn around a few hundred "role archetypes" (real postings
+cluster by occupation), candidates uniformly. Checks every query against an
+exhaustive L1 scan, then times build, queries, inserts/deletes and a
+save/load round trip through memory-mapped files.
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from personality_fit.job_index import JobIndex, DIMS, _SCALE
+
+
+def synthetic_points(n: int, rng: np.random.Generator, archetypes: int = 300) -> np.ndarray:
+    hi = np.array([100.0] * 7 + [1.0] * 5, dtype=np.float32)
+    centers = rng.uniform(0, 1, (archetypes, len(DIMS))) * hi
+    raw = centers[rng.integers(0, archetypes, n)] + rng.normal(0, 0.06, (n, len(DIMS))) * hi
+    return (np.clip(raw, 0, hi) * _SCALE).astype(np.float32)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=1_000_000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(3)
+    points = synthetic_points(args.jobs, rng)
+    ids = [f"job-{i}" for i in range(args.jobs)]
+    queries = synthetic_points(args.queries, rng)
+
+    t0 = time.perf_counter()
+    index = JobIndex.build(ids, points)
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    results = [index.query(q, args.k) for q in queries]
+    query_ms = (time.perf_counter() - t0) / args.queries * 1000
+
+    t0 = time.perf_counter()
+    for q in queries[:20]:
+        np.partition(np.abs(points - q).sum(axis=1), args.k)
+    scan_ms = (time.perf_counter() - t0) / 20 * 1000
+
+    wrong = 0
+    for q, res in zip(queries, results):
+        exact = np.sort(np.abs(points - q).sum(axis=1))[:args.k]
+        got = np.array([2 * (100.0 - score) for _, score in res])
+        wrong += not np.allclose(got, exact, atol=0.02)
+
+    # Churn: expire 1% of jobs, insert as many new ones
+    t0 = time.perf_counter()
+    for i in range(0, args.jobs, 100):
+        index.remove(ids[i])
+    for i, p in enumerate(synthetic_points(args.jobs // 100, rng)):
+        index.add(f"new-{i}", p)
+    churn_s = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        index.save(tmp)
+        loaded = JobIndex.load(tmp)
+        io_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for q in queries:
+            loaded.query(q, args.k)
+        mmap_ms = (time.perf_counter() - t0) / args.queries * 1000
+
+    print(f"🏗️  built {args.jobs:,} jobs in {build_s:.1f} s ({len(index.centroids)} clusters)")
+    print(f"🐢 exhaustive scan: {scan_ms:8.3f} ms/query")
+    print(f"⚡ index query:     {query_ms:8.3f} ms/query  (memory-mapped: {mmap_ms:.3f} ms)")
+    print(f"🔁 1% churn {churn_s:.2f} s, save+load {io_s:.2f} s")
+    print(f"📈 speedup {scan_ms / query_ms:.0f}x, {wrong} queries differ from exhaustive")
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Benchmark: /get_jobs response encoding and bytes on the wire.
+
+    python -m benchmarks.bench_json_response [--jobs N] [--rounds R]
+
+Builds N JSearch-like postings (descriptions of a few KB, numpy pay scores as
+compute_relative_pay_scores leaves them), checks that both encoders produce
+the same JSON, then compares FastAPI's default path (jsonable_encoder +
+json.dumps) with utils.fast_json.dumps, and the payload size raw, gzipped
+and brotli-compressed at the middleware's settings.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+
+from utils import fast_json
+from utils.compression import CompressionMiddleware, brotli
+
+WORDS = ("experience team customer support python sales manage develop design data "
+         "service quality schedule communication training inventory health benefits "
+         "remote hybrid shift growth analytics cloud systems operations").split()
+
+
+def random_jobs(n: int, rng: random.Random):
+    jobs = []
+    for i in range(n):
+        description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(250, 700)))
+        jobs.append({
+            "job_id": f"{rng.getrandbits(64):x}==",
+            "job_title": f"{rng.choice(['Senior', 'Junior', 'Lead', ''])} {rng.choice(['Data', 'Sales', 'Support'])} "
+                         f"{rng.choice(['Engineer', 'Analyst', 'Associate'])}".strip(),
+            "employer_name": f"Company {rng.randint(1, 300)}",
+            "employer_logo": f"https://logos.example.com/{i}.png",
+            "employer_website": None,
+            "job_publisher": rng.choice(["LinkedIn", "Indeed", "ZipRecruiter", "Glassdoor"]),
+            "job_employment_type": rng.choice(["FULLTIME", "PARTTIME", "CONTRACTOR"]),
+            "job_apply_link": f"https://jobs.example.com/apply/{i}?utm_source=jsearch",
+            "job_apply_is_direct": rng.random() < 0.3,
+            "job_description": description,
+            "job_is_remote": rng.random() < 0.2,
+            "job_posted_at_timestamp": 1_700_000_000 + rng.randint(0, 5_000_000),
+            "job_posted_at_datetime_utc": "2024-01-15T00:00:00.000Z",
+            "job_city": "Austin", "job_state": "TX", "job_country": "US",
+            "job_latitude": 30.26 + rng.random(), "job_longitude": -97.74 + rng.random(),
+            "job_benefits": rng.sample(["health_insurance", "dental_coverage", "paid_time_off", "retirement_savings"], 2),
+            "job_min_salary": rng.choice([None, 50000.0, 65000.0]),
+            "job_max_salary": rng.choice([None, 90000.0, 120000.0]),
+            "job_salary_period": rng.choice([None, "YEAR", "HOUR"]),
+            "job_highlights": {"Qualifications": [" ".join(rng.choices(WORDS, k=12)) for _ in range(4)],
+                               "Responsibilities": [" ".join(rng.choices(WORDS, k=12)) for _ in range(4)]},
+            "cluster_id": rng.randint(0, 40),
+            "pay_score": np.float64(round(rng.uniform(1, 10), 2)),
+            "pay_percentile": np.float64(round(rng.uniform(0, 100), 1)),
+        })
+    return jobs
+
+
+def best_of(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=500)
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    payload = {"results": random_jobs(args.jobs, random.Random(7))}
+
+    def default_path():
+        # What JSONResponse does for a plain dict returned from an endpoint
+        return json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def fast_path():
+        return fast_json.dumps(payload)
+
+    same = json.loads(default_path()) == json.loads(fast_path())
+    body = fast_path()
+
+    default_s = best_of(default_path, args.rounds)
+    fast_s = best_of(fast_path, args.rounds)
+
+    middleware = CompressionMiddleware(app=None)
+    t0 = time.perf_counter()
+    gz = middleware.compress(body, "gzip")
+    gz_s = time.perf_counter() - t0
+    if brotli is not None:
+        t0 = time.perf_counter()
+        br = middleware.compress(body, "br")
+        br_s = time.perf_counter() - t0
+
+    encoder = "orjson" if fast_json.orjson is not None else "stdlib"
+    print(f"📦 {args.jobs:,} jobs, {len(body) / 1024:,.0f} KB of JSON")
+    print(f"🐢 jsonable_encoder + json.dumps: {default_s * 1000:7.1f} ms")
+    print(f"⚡ fast_json.dumps ({encoder}):   {fast_s * 1000:7.1f} ms  ({default_s / fast_s:.0f}x)")
+    print(f"🗜️ gzip:   {len(gz) / 1024:7,.0f} KB  ({len(body) / len(gz):.1f}x smaller, {gz_s * 1000:.1f} ms)")
+    if brotli is not None:
+        print(f"🗜️ brotli: {len(br) / 1024:7,.0f} KB  ({len(body) / len(br):.1f}x smaller, {br_s * 1000:.1f} ms)")
+    else:
+        print("⚠️ brotli not installed; only gzip is offered")
+    print(f"{'✅' if same else '❌'} both encoders produce the same JSON")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Microbenchmark: salary extraction over saved job pages.
+
+    python -m benchmarks.bench_salary_extraction [PAGES_DIR] [--repeat N]
+
+PAGES_DIR holds saved pages (*.html or *.txt); HTML is converted to visible
+text first, as the pipeline does. Without a directory a synthetic corpus
+of ~200KB pages is generated. Compares the compiled single-pass engine
+against the previous line-by-line implementation and checks that both
+return the same match.
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+from job_search.utils.page_artifact import html_to_text
+from job_search.utils.salary_extractor import extract_salary, extract_salary_from_text
+
+
+def legacy_extract_salary_from_text(text: str):
+    """The pre-compiled-engine implementation, kept here for comparison."""
+    if not text:
+        return None
+
+    lines = text.splitlines()
+    combined = []
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if re.match(r"^(Pay|Salary|Wage|Rate|Compensation)[:\s]*$", line, re.I) and i + 1 < len(lines):
+            combined.append(f"{line} {lines[i+1].strip()}")
+        else:
+            combined.append(line)
+
+    salary_patterns = [
+        r"\$\s?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?"
+        r"(?:\s?[-–to]{1,3}\s?\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)?"
+        r"\s?(?:per\s?(?:hour|annum|year)|/ ?hr|hourly)",
+        r"\b(?:Pay|Salary|Wage|Rate|Compensation)\b[:\s]*\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?"
+        r"(?:\s?[-–to]{1,3}\s?\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)?"
+        r"(?:\s?(?:per\s?(?:hour|annum|year)|/ ?hr|hourly))?",
+    ]
+
+    for line in combined:
+        lower = line.lower()
+        if any(k in lower for k in ["pay", "salary", "wage", "rate", "compensation"]):
+            for pattern in salary_patterns:
+                m = re.search(pattern, line, re.IGNORECASE)
+                if m:
+                    return m.group().strip()
+            if re.search(r"\$\s?\d", line):
+                return line.strip()
+    return None
+
+
+def load_corpus(pages_dir: str | None) -> list[str]:
+    if pages_dir:
+        texts = []
+        for path in sorted(Path(pages_dir).iterdir()):
+            raw = path.read_text(encoding="utf-8", errors="ignore")
+            texts.append(html_to_text(raw) if path.suffix.lower() in {".html", ".htm"} else raw)
+        return texts
+
+    rng = random.Random(42)
+    filler = [
+        "Join our team and grow your career with us.",
+        "We value integrity, collaboration and accurate work.",
+        "Benefits include dental, vision and a generous payment plan.",
+        "Apply today to be considered for this opportunity.",
+        "Responsibilities include customer service and stocking shelves.",
+    ]
+    salaries = ["Salary:\n$45,000 - $55,000 per year", "Pay: $17.50/hr", "Rate: $16 - $18 hourly", ""]
+    texts = []
+    for _ in range(50):
+        lines = [rng.choice(filler) for _ in range(4000)]
+        lines.insert(rng.randrange(len(lines)), rng.choice(salaries))
+        texts.append("\n".join(lines))
+    return texts
+
+
+def bench(fn, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for t in texts:
+            fn(t)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("pages_dir", nargs="?")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    texts = load_corpus(args.pages_dir)
+    size = sum(len(t) for t in texts)
+    mismatches = sum(legacy_extract_salary_from_text(t) != extract_salary_from_text(t) for t in texts)
+
+    legacy = bench(legacy_extract_salary_from_text, texts, args.repeat)
+    compiled = bench(extract_salary, texts, args.repeat)
+
+    print(f"📄 {len(texts)} pages, {size / 1e6:.1f} MB of text")
+    print(f"🐢 legacy:   {legacy * 1000:8.1f} ms  ({legacy / len(texts) * 1000:.2f} ms/page)")
+    print(f"⚡ compiled: {compiled * 1000:8.1f} ms  ({compiled / len(texts) * 1000:.2f} ms/page)")
+    print(f"📈 speedup:  {legacy / compiled:.1f}x, {mismatches} result mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
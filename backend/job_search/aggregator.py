@@ -1,18 +1,57 @@
 import os
+import time
+import asyncio
+import threading
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timezone
 import numpy as np
-import math
 
 # ✅ FIXED: absolute imports (Render-safe)
-from job_search.api_clients.jsearch_api import fetch_jsearch
-from job_search.utils.salary_extractor import extract_salary_for_job, parse_salary_range
-from job_search.utils.date_extractor import extract_posted_date
+from job_search.api_clients.registry import get_sources
+from job_search.utils.salary_extractor import (
+    extract_salary, find_salary_for_job, find_salary_for_job_async,
+)
+from job_search.utils.date_extractor import (
+    scan_text, extract_from_markup, find_posted_date, find_posted_date_async,
+)
+from job_search.utils.page_artifact import PageArtifact
+from job_search.utils.enrichment_cache import get_enrichment, put_enrichment
+from job_search.utils.merger import ResultMerger
+from job_search.utils.job_record import posted_epoch, posted_timestamp, as_record
+from job_search.utils.http_client import private_async_client
+from job_search.utils.salary_distribution import distribution_key, get_salary_distribution
+from job_search.utils.enrichment_queue import get_enrichment_queue
+from job_search.utils.search_index import get_search_index
 
 load_dotenv()
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
 
+# Max jobs enriched at once by the async pipeline (per request)
+ASYNC_ENRICH_CONCURRENCY = int(os.getenv("ASYNC_ENRICH_CONCURRENCY", "16"))
+# Result pages requested from every source, in parallel
+SEARCH_PAGES = int(os.getenv("SEARCH_PAGES", "3"))
+# Seconds to wait for sources before continuing with whatever has arrived
+SEARCH_DEADLINE = float(os.getenv("SEARCH_DEADLINE", "8"))
+# Minimum seconds between interim pay-score events on the streaming endpoint
+SCORE_EVENT_INTERVAL = float(os.getenv("SCORE_EVENT_INTERVAL", "1.0"))
+
+# "inline": scrape apply links during the request
+# "queue": answer from the enrichment cache and hand misses to job_search.enrichment_worker
+ENRICHMENT_MODE = os.getenv("ENRICHMENT_MODE", "inline")
+
+# "prefer": answer from the local search index when it has results for the query and
+# refresh stale queries from the sources in the background; "off": always search live
+INDEX_MODE = os.getenv("INDEX_MODE", "prefer")
+# Seconds after a live search during which its indexed results count as fresh
+INDEX_FRESH_SECONDS = float(os.getenv("INDEX_FRESH_SECONDS", "900"))
+# A stale query is still answered from the index when it has at least this many hits
+# (also the floor for the full-text stand-in when a query's own results were pruned)
+INDEX_MIN_RESULTS = int(os.getenv("INDEX_MIN_RESULTS", "5"))
+INDEX_MAX_RESULTS = int(os.getenv("INDEX_MAX_RESULTS", "200"))
+
+# Fields sent in streaming "update" events
+ENRICHED_FIELDS = ("job_min_salary", "job_max_salary", "job_salary_period", "job_posted_at_datetime_utc")
+
 
 # ========================= UTILITIES =========================
 def normalize_missing(val):
@@ -38,24 +77,39 @@ def is_missing_salary(val):
     return True
 
 
-def within_date_filter(job_date_str, user_filter):
-    if not job_date_str:
-        return False
-    try:
-        job_date = datetime.fromisoformat(job_date_str.replace("Z", "+00:00"))
-    except Exception:
-        return False
+# Max age in days for each date_posted filter; anything else means "all"
+DATE_WINDOWS = {"today": 1, "week": 7, "month": 30}
 
-    now = datetime.now(timezone.utc)
-    delta_days = (now - job_date).days
 
-    if user_filter == "today":
-        return delta_days <= 1
-    elif user_filter == "week":
-        return delta_days <= 7
-    elif user_filter == "month":
-        return delta_days <= 30
-    return True  # "all"
+def posted_timestamps(jobs):
+    """Posting times as a float array of epoch seconds, NaN when unknown."""
+    return np.fromiter((posted_timestamp(j) or np.nan for j in jobs), dtype=float, count=len(jobs))
+
+
+def date_filter_mask(jobs, user_filter, now=None):
+    """
+    Vectorized within_date_filter over all jobs against one `now`.
+    Undated jobs never pass, as before.
+    """
+    ts = posted_timestamps(jobs)
+    mask = np.isfinite(ts)
+    max_days = DATE_WINDOWS.get(user_filter)
+    if max_days is not None:
+        now = time.time() if now is None else now
+        with np.errstate(invalid="ignore"):
+            mask &= np.floor((now - ts) / 86400) <= max_days
+    return mask
+
+
+def within_date_filter(job_date_str, user_filter, now=None):
+    ts = posted_epoch(job_date_str)
+    if ts is None:
+        return False
+    max_days = DATE_WINDOWS.get(user_filter)
+    if max_days is None:
+        return True  # "all"
+    now = time.time() if now is None else now
+    return (now - ts) // 86400 <= max_days
 
 
 def matches_job_type(job_type_field, user_job_type):
@@ -69,75 +123,378 @@ def matches_job_type(job_type_field, user_job_type):
 
 
 # ========================= PAY SCORE LOGIC =========================
+# Annualization multipliers for JSearch's job_salary_period
+PERIOD_TO_ANNUAL = {"HOUR": 2080, "DAY": 260, "WEEK": 52, "MONTH": 12, "YEAR": 1}
+PAY_MIN, PAY_MAX = 15000, 300000
+CA_MIN_HOURLY = 17.20
+
+
+def _to_number(val):
+    """Salary field as float; NaN when missing, zero or unparseable (mirrors `if v`)."""
+    if not val:
+        return np.nan
+    try:
+        return float(str(val).replace(",", ""))
+    except ValueError:
+        return np.nan
+
+
+def salary_columns(jobs):
+    """
+    One pass over the jobs into columns: average of min/max (as posted),
+    annualized salary, hourly flag and lowercased country. Missing salaries
+    are NaN in the numeric columns.
+    """
+    lo = np.fromiter((_to_number(j.get("job_min_salary")) for j in jobs), dtype=float, count=len(jobs))
+    hi = np.fromiter((_to_number(j.get("job_max_salary")) for j in jobs), dtype=float, count=len(jobs))
+    periods = [str(j.get("job_salary_period") or "").upper() for j in jobs]
+    country = np.array([str(j.get("job_country") or "").lower() for j in jobs], dtype=object)
+
+    count = np.isfinite(lo).astype(int) + np.isfinite(hi)
+    total = np.nan_to_num(lo) + np.nan_to_num(hi)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg = np.where(count > 0, total / count, np.nan)
+
+    multiplier = np.array([PERIOD_TO_ANNUAL.get(p, 0) for p in periods], dtype=float)
+    # Unknown period: amounts under 1000 are taken as hourly
+    guessed = np.where(avg < 1000, PERIOD_TO_ANNUAL["HOUR"], 1)
+    multiplier = np.where(multiplier > 0, multiplier, guessed)
+    hourly = multiplier == PERIOD_TO_ANNUAL["HOUR"]
+    return avg, avg * multiplier, hourly, country
+
+
+def _round_scores(scores):
+    return [None if np.isnan(s) else round(float(s), 1) for s in scores]
+
+
+def fallback_pay_scores(annual):
+    """Absolute log-scale score (1–10) between PAY_MIN and PAY_MAX; NaN stays NaN."""
+    clipped = np.clip(annual, PAY_MIN, PAY_MAX)
+    return 1 + 9 * (np.log(clipped) - np.log(PAY_MIN)) / (np.log(PAY_MAX) - np.log(PAY_MIN))
+
+
 def compute_fallback_pay_score(job):
     """Used if too few salaries exist to build a relative distribution."""
-    vals = [v for v in [job.get("job_min_salary"), job.get("job_max_salary")] if v]
-    if not vals:
-        return None
-    avg = np.mean(vals)
-    if avg < 1000:  # hourly → annualize
-        avg *= 2080
-    MIN, MAX = 15000, 300000
-    avg = max(min(avg, MAX), MIN)
-    return round(1 + 9 * (np.log(avg) - np.log(MIN)) / (np.log(MAX) - np.log(MIN)), 1)
-
-
-def compute_relative_pay_scores(jobs):
-    """Compute relative pay scores (1–10) based on salaries among valid results."""
-    salaries = []
-    for job in jobs:
-        vals = [v for v in [job.get("job_min_salary"), job.get("job_max_salary")] if v]
-        if not vals:
-            continue
-        avg = np.mean(vals)
-        if avg < 1000:  # hourly → annualize
-            avg *= 2080
-        salaries.append(avg)
-
-    if len(salaries) < 3:
-        for job in jobs:
-            job["pay_score"] = compute_fallback_pay_score(job)
-        return jobs
+    _, annual, _, _ = salary_columns([job])
+    return _round_scores(fallback_pay_scores(annual))[0]
+
 
-    mean = np.mean(salaries)
-    std = np.std(salaries) if np.std(salaries) > 0 else 1
-
-    for job in jobs:
-        vals = [v for v in [job.get("job_min_salary"), job.get("job_max_salary")] if v]
-        if not vals:
-            job["pay_score"] = None
-            continue
-        avg = np.mean(vals)
-        if avg < 1000:
-            avg *= 2080
-        z = (avg - mean) / std
-        sigmoid = 1 / (1 + math.exp(-z))
-        job["pay_score"] = round(1 + 9 * sigmoid, 1)
+def compute_relative_pay_scores(jobs, dist_key=None, record=True):
+    """
+    Compute pay scores (1–10) in one vectorized pass.
+
+    With `dist_key` and enough stored history, a job scores by its percentile
+    in the persistent keyword/location distribution (`pay_percentile` is set
+    too) and, if `record`, these salaries join the history. Otherwise it is
+    a sigmoid of the z-score among these results, or the absolute log-scale
+    score when fewer than 3 salaries are known.
+
+    The distribution lives in SQLite: async callers run this (and
+    finalize_jobs) through asyncio.to_thread.
+    """
+    if not jobs:
+        return jobs
+    _, annual, _, _ = salary_columns(jobs)
+    valid = np.isfinite(annual)
+
+    percentiles = None
+    if dist_key is not None:
+        dist = get_salary_distribution()
+        percentiles = dist.percentiles(dist_key, annual)
+        if record:
+            dist.record(dist_key, [j.get("job_id") for j in jobs], annual)
+
+    if percentiles is not None:
+        scores = 1 + 9 * percentiles
+        for job, pct in zip(jobs, percentiles):
+            job.pay_percentile = None if np.isnan(pct) else round(float(pct) * 100, 1)
+    elif valid.sum() < 3:
+        scores = fallback_pay_scores(annual)
+    else:
+        mean = annual[valid].mean()
+        std = annual[valid].std() or 1
+        scores = 1 + 9 / (1 + np.exp(-(annual - mean) / std))
+
+    for job, score in zip(jobs, _round_scores(scores)):
+        job.pay_score = score
     return jobs
 
 
+# ========================= SOURCE FAN-OUT =========================
+async def _safe_source(name, fn, page, *args):
+    try:
+        return await fn(*args, page=page)
+    except Exception as e:
+        print(f"⚠️ Source {name} page {page} failed: {e}")
+        return []
+
+
+async def fetch_all_sources(keyword, location, job_type=None, country="us", date_posted="all",
+                            pages=SEARCH_PAGES, deadline=SEARCH_DEADLINE):
+    """
+    Fetch `pages` pages from every enabled source concurrently and merge them
+    as they arrive. Sources still running at `deadline` seconds are cancelled
+    and the partial merged set is returned.
+    """
+    merger = ResultMerger()
+    args = (keyword, location, job_type, country, date_posted)
+    tasks = [
+        asyncio.create_task(_safe_source(name, fn, page, *args))
+        for name, fn in get_sources().items()
+        for page in range(1, pages + 1)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=deadline):
+            merger.add(await next_done)
+    except TimeoutError:
+        late = sum(not t.done() for t in tasks)
+        print(f"⏱️ {late}/{len(tasks)} source pages missed the {deadline}s deadline; using partial results")
+    finally:
+        for t in tasks:
+            t.cancel()
+    return merger.results()
+
+
+def fetch_all_sources_sync(*args, **kwargs):
+    """Blocking wrapper around fetch_all_sources for the CLI and sync pipeline."""
+    async def run():
+        # This loop is short-lived and may be on a worker thread next to the
+        # server's: it gets its own HTTP client rather than the shared one
+        async with private_async_client():
+            return await fetch_all_sources(*args, **kwargs)
+
+    return asyncio.run(run())
+
+
 # ========================= JOB PROCESSING =========================
-def process_job(job):
-    job["job_min_salary"] = normalize_missing(job.get("job_min_salary"))
-    job["job_max_salary"] = normalize_missing(job.get("job_max_salary"))
-    job["job_posted_at_datetime_utc"] = normalize_missing(job.get("job_posted_at_datetime_utc"))
-
-    # Fill missing salaries
-    if is_missing_salary(job["job_min_salary"]) or is_missing_salary(job["job_max_salary"]):
-        detected = extract_salary_for_job(job)
-        parsed_min, parsed_max = parse_salary_range(detected)
-        if parsed_min is not None:
-            job["job_min_salary"] = parsed_min
-        if parsed_max is not None:
-            job["job_max_salary"] = parsed_max
-
-    # Fill missing dates
-    if not job.get("job_posted_at_datetime_utc"):
-        job["job_posted_at_datetime_utc"] = extract_posted_date(job.get("job_apply_link"))
+def _normalize_job(job):
+    job.job_min_salary = normalize_missing(job.job_min_salary)
+    job.job_max_salary = normalize_missing(job.job_max_salary)
+    job.set_posted_at(normalize_missing(job.job_posted_at_datetime_utc))
+
+
+def _needs_salary(job):
+    return is_missing_salary(job.job_min_salary) or is_missing_salary(job.job_max_salary)
+
+
+def _apply_salary(job, parsed_min, parsed_max):
+    if parsed_min is not None:
+        job.job_min_salary = parsed_min
+    if parsed_max is not None:
+        job.job_max_salary = parsed_max
+
+
+def _apply_period(job, period):
+    if period and not job.job_salary_period:
+        job.job_salary_period = period.upper()
+
+
+def _store_salary(job, info):
+    found = info is not None and info.min is not None
+    put_enrichment("salary", job, {
+        "found": found,
+        "text": info.text if info else None,
+        "min": info.min if info else None,
+        "max": info.max if info else None,
+        "period": info.period if info else None,
+        "currency": info.currency if info else None,
+    })
+    if found:
+        _apply_salary(job, info.min, info.max)
+        _apply_period(job, info.period)
+
+
+def _store_date(job, info):
+    posted_at = info.posted_at if info else None
+    put_enrichment("date", job, {
+        "found": info is not None,
+        "posted_at": posted_at,
+        "confidence": info.confidence if info else None,
+    })
+    job.set_posted_at(posted_at)
+
+
+def _fill_from_cache(job):
+    """
+    Apply cached enrichment for repeat postings.
+    Returns (needs_salary, needs_date) for what still has to be scraped.
+    """
+    needs_salary = _needs_salary(job)
+    if needs_salary:
+        hit = get_enrichment("salary", job)
+        if hit is not None:
+            _apply_salary(job, hit["min"], hit["max"])
+            # Same annualization as the first scrape
+            _apply_period(job, hit.get("period"))
+            needs_salary = False
+
+    needs_date = not job.job_posted_at_datetime_utc
+    if needs_date:
+        hit = get_enrichment("date", job)
+        if hit is not None:
+            job.set_posted_at(hit["posted_at"])
+            needs_date = False
+
+    return needs_salary, needs_date
+
+
+def _evidence_seen(needs_salary, needs_date):
+    """
+    stop_when callback for page text extraction: True once every still-missing
+    field has a match, since both extractors only use the first one anyway.
+    """
+    pending = {"salary": needs_salary, "date": needs_date}
+
+    def check(new_text):
+        if pending["salary"] and extract_salary(new_text):
+            pending["salary"] = False
+        if pending["date"]:
+            # A low-confidence date (e.g. a bare date) may be beaten further down
+            info = scan_text(new_text)
+            if info and info.confidence != "low":
+                pending["date"] = False
+        return not any(pending.values())
+
+    return check
+
+
+def _page_for(job, needs_salary, needs_date):
+    # Salary found in the description never needs the page
+    needs_salary = needs_salary and not extract_salary(job.get("job_description") or "")
+
+    def stop_factory():
+        # Text is parsed lazily, after the HTML is in: a date in the markup needs no text
+        markup = extract_from_markup(page.html) if needs_date else None
+        return _evidence_seen(needs_salary, needs_date and not (markup and markup.confidence == "high"))
+
+    page = PageArtifact(job.get("job_apply_link"), stop_factory)
+    return page
+
+
+class ScrapeFailed(Exception):
+    """The apply-link page was blocked or never arrived, so a miss proves nothing."""
+
+
+def _scrape_failed(page):
+    # Requested, but no usable copy (blocked, timed out, errored, or skipped by the scheduler)
+    return (page.fetched or page.rendered) and (page.html is None or page.blocked)
+
+
+def process_job(job, raise_on_failure=False):
+    """
+    Fill a job's missing salary/date from the cache or its apply-link page.
+    With `raise_on_failure` (queue workers), a field still missing because
+    the page couldn't be read is not cached as "not found"; ScrapeFailed is
+    raised so the task is retried later. Plain dicts are converted to a
+    JobRecord, which is returned.
+    """
+    job = as_record(job)
+    _normalize_job(job)
+    needs_salary, needs_date = _fill_from_cache(job)
+
+    # Apply-link page shared by both extractors; downloaded lazily, at most once
+    page = _page_for(job, needs_salary, needs_date)
+
+    salary = find_salary_for_job(job, page) if needs_salary else None
+    date = find_posted_date(job.get("job_apply_link"), page) if needs_date else None
+    failed = raise_on_failure and _scrape_failed(page) and (
+        (needs_salary and salary is None) or (needs_date and date is None))
+
+    # Fill missing salaries and dates; only verified misses are cached
+    if needs_salary and (salary is not None or not failed):
+        _store_salary(job, salary)
+    if needs_date and (date is not None or not failed):
+        _store_date(job, date)
+
+    if failed:
+        raise ScrapeFailed(f"{page.host or page.url}: page blocked or unavailable")
+    return job
+
+
+async def process_job_async(job):
+    """
+    Async version of process_job; network, rendering and the enrichment
+    cache's SQLite calls never block the event loop.
+    """
+    job = as_record(job)
+    _normalize_job(job)
+    needs_salary, needs_date = await asyncio.to_thread(_fill_from_cache, job)
+    page = _page_for(job, needs_salary, needs_date)
+
+    if needs_salary:
+        info = await find_salary_for_job_async(job, page)
+        await asyncio.to_thread(_store_salary, job, info)
+
+    if needs_date:
+        info = await find_posted_date_async(job.get("job_apply_link"), page)
+        await asyncio.to_thread(_store_date, job, info)
+
+    return job
+
 
+def defer_job(job):
+    """
+    Queue-mode counterpart of process_job: apply cached enrichment now and
+    enqueue the job for the background workers if anything is still missing.
+    """
+    job = as_record(job)
+    _normalize_job(job)
+    needs_salary, needs_date = _fill_from_cache(job)
+    if needs_salary or needs_date:
+        get_enrichment_queue().enqueue(job)
     return job
 
 
+def cluster_representatives(jobs):
+    """First job of each near-duplicate cluster; only these get scraped."""
+    return [job for i, job in enumerate(jobs) if job.get("cluster_id", i) == i]
+
+
+def _copy_enrichment(job, rep):
+    _normalize_job(job)
+    if _needs_salary(job):
+        _apply_salary(job, rep.get("job_min_salary"), rep.get("job_max_salary"))
+        _apply_period(job, rep.get("job_salary_period"))
+    if not job.job_posted_at_datetime_utc:
+        job.set_posted_at(rep.job_posted_at_datetime_utc)
+
+
+def share_cluster_enrichment(jobs):
+    """Copy salary/date found for a cluster's representative onto its duplicates."""
+    for i, job in enumerate(jobs):
+        rep_index = job.get("cluster_id", i)
+        if rep_index != i:
+            _copy_enrichment(job, jobs[rep_index])
+    return jobs
+
+
+def finalize_jobs(updated, job_type=None, date_posted="all", keyword=None, location=None, now=None,
+                  record=True):
+    """
+    Filter enriched jobs, drop sub-minimum-wage Canadian postings and rank by
+    pay score. With keyword/location, scores use the stored salary history;
+    `record=False` (answers from the search index) scores without adding the
+    same salaries to it again. Date windows are measured from one `now`
+    (epoch seconds) for the whole request.
+    """
+    in_window = date_filter_mask(updated, date_posted, now)
+    filtered = [
+        job for job, ok in zip(updated, in_window)
+        if ok and matches_job_type(job.get("job_employment_type"), job_type)
+    ]
+
+    # Remove low-paying Canadian jobs (<$17.20/hr)
+    avg, _, hourly, country = salary_columns(filtered)
+    too_low = hourly & (country == "ca") & (avg < CA_MIN_HOURLY)
+    cleaned = [job for job, drop in zip(filtered, too_low) if not drop]
+
+    # Compute pay scores relative to remaining jobs
+    dist_key = distribution_key(keyword, location) if keyword else None
+    cleaned = compute_relative_pay_scores(cleaned, dist_key, record)
+    cleaned.sort(key=lambda j: (j.get("pay_score") or 0), reverse=True)
+    return cleaned
+
+
 def print_job(job):
     description = job.get("job_description", "N/A") or "N/A"
 
@@ -165,87 +522,301 @@ def main():
     country = input("Country code (default: us): ").strip() or "us"
     date_posted = input("Date filter (all, today, week, month): ").strip().lower() or "all"
 
-    print("\n🔍 Fetching from JSearch...\n")
-    data = fetch_jsearch(keyword, location, job_type, country, date_posted)
-    jobs = data.get("data", [])
+    print("\n🔍 Fetching from job sources...\n")
+    jobs = fetch_all_sources_sync(keyword, location, job_type, country, date_posted)
     print(f"✅ Retrieved {len(jobs)} job listings\n")
 
-    # Process jobs concurrently
-    updated = []
+    # Process jobs concurrently, one scrape per near-duplicate cluster
     with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = [executor.submit(process_job, job) for job in jobs]
+        futures = [executor.submit(process_job, job) for job in cluster_representatives(jobs)]
         for f in as_completed(futures):
-            updated.append(f.result())
+            f.result()
+    updated = share_cluster_enrichment(jobs)
 
     print("💡 Filtering results...")
-
-    # Filter by job type & date
-    filtered = [
-        job for job in updated
-        if matches_job_type(job.get("job_employment_type"), job_type)
-        and within_date_filter(job.get("job_posted_at_datetime_utc"), date_posted)
-    ]
-
-    # Remove low-paying Canadian jobs (<$17.20/hr)
-    cleaned = []
-    for job in filtered:
-        vals = [v for v in [job.get("job_min_salary"), job.get("job_max_salary")] if v]
-        if not vals:
-            cleaned.append(job)
-            continue
-        avg = np.mean(vals)
-        if avg < 1000:  # hourly
-            if job.get("job_country", "").lower() == "ca" and avg < 17.20:
-                continue
-        cleaned.append(job)
-
+    cleaned = finalize_jobs(updated, job_type, date_posted, keyword, location)
     print(f"✅ {len(cleaned)}/{len(updated)} jobs remain after filtering.\n")
 
-    # Compute pay scores relative to remaining jobs
-    cleaned = compute_relative_pay_scores(cleaned)
-    cleaned.sort(key=lambda j: (j.get("pay_score") or 0), reverse=True)
-
     for job in cleaned:
         print_job(job)
 
     print("✅ Done — results ranked by relative pay score!\n")
 
 
+# ========================= SEARCH INDEX =========================
+_refreshing: set[str] = set()
+_refreshing_lock = threading.Lock()
+_refresh_pool: ThreadPoolExecutor | None = None
+_refresh_pool_lock = threading.Lock()
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def index_query_key(keyword, location, job_type=None, country="us", date_posted="all"):
+    return "|".join(str(v or "").strip().lower() for v in (keyword, location, job_type, country, date_posted))
+
+
+def index_jobs(jobs, query_key=None):
+    """Add enriched jobs to the local search index and record them as the query's live results."""
+    if INDEX_MODE == "off":
+        return
+    try:
+        index = get_search_index()
+        _, annual, _, _ = salary_columns(jobs)
+        index.upsert(jobs, annual)
+        if query_key:
+            index.mark_refreshed(query_key, jobs)
+    except Exception as e:
+        print(f"⚠️ Search index update failed: {e}")
+
+
+def search_index_first(keyword, location, job_type=None, country="us", date_posted="all"):
+    """
+    Indexed jobs for a query, or None when it has to be searched live.
+    Returns (jobs, stale); stale results should be refreshed in the background.
+
+    A repeat of a live search gets back the jobs that search returned. If some
+    of them have been pruned since, a full-text search of the index stands in,
+    but only when it finds at least as many jobs as the live search did (and
+    at least INDEX_MIN_RESULTS); otherwise the query goes live again.
+    """
+    if INDEX_MODE == "off":
+        return None, True
+    try:
+        index = get_search_index()
+        stored = index.live_results(index_query_key(keyword, location, job_type, country, date_posted),
+                                    limit=INDEX_MAX_RESULTS)
+        if stored is None:
+            return None, True  # never searched live: the index can't know what it's missing
+        hits, live_count = stored["results"], stored["live_count"]
+        expected = min(live_count or 0, INDEX_MAX_RESULTS)
+        if live_count is None or len(hits) < expected:
+            # No country filter: it's a search-market parameter, not necessarily the jobs' country
+            hits = index.search(keyword, location, job_type or "", "", date_posted,
+                                limit=INDEX_MAX_RESULTS, facets=False)["results"]
+            if len(hits) < max(INDEX_MIN_RESULTS, expected):
+                return None, True
+    except Exception as e:
+        print(f"⚠️ Search index lookup failed: {e}")
+        return None, True
+    stale = time.time() - stored["refreshed_at"] > INDEX_FRESH_SECONDS
+    if stale and len(hits) < INDEX_MIN_RESULTS:
+        return None, True
+    return _regroup(hits), stale
+
+
+def _regroup(hits):
+    """
+    Index rows carry no cluster_id: merge and cluster them the way a live
+    search does. Rows indexed before their enrichment finished (queue mode)
+    pick up whatever the workers have since cached, and are re-indexed with it.
+    """
+    merger = ResultMerger()
+    merger.add(hits)
+    jobs = merger.results()
+    filled = []
+    for job in cluster_representatives(jobs):
+        _normalize_job(job)
+        before = (job.job_min_salary, job.job_max_salary, job.job_posted_at_datetime_utc)
+        _fill_from_cache(job)
+        if (job.job_min_salary, job.job_max_salary, job.job_posted_at_datetime_utc) != before:
+            filled.append(job)
+    jobs = share_cluster_enrichment(jobs)
+    if filled:
+        index_jobs(filled)
+    return jobs
+
+
+def _claim_refresh(query_key) -> bool:
+    with _refreshing_lock:
+        if query_key in _refreshing:
+            return False
+        _refreshing.add(query_key)
+        return True
+
+
+def _release_refresh(query_key):
+    with _refreshing_lock:
+        _refreshing.discard(query_key)
+
+
+def _refresh_in_background(keyword, location, job_type, country, date_posted):
+    """Re-run a stale query live on a background thread (once at a time per query)."""
+    global _refresh_pool
+    query_key = index_query_key(keyword, location, job_type, country, date_posted)
+    if not _claim_refresh(query_key):
+        return
+    with _refresh_pool_lock:
+        if _refresh_pool is None:
+            _refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="index-refresh")
+        pool = _refresh_pool
+
+    def refresh():
+        try:
+            search_live(keyword, location, job_type, country, date_posted)
+        except Exception as e:
+            print(f"⚠️ Background refresh failed for {query_key!r}: {e}")
+        finally:
+            _release_refresh(query_key)
+
+    try:
+        pool.submit(refresh)
+    except RuntimeError:  # pool shut down
+        _release_refresh(query_key)
+
+
+def shutdown_refresh_pool():
+    """Stop background index refreshes (queued ones are dropped)."""
+    global _refresh_pool
+    with _refresh_pool_lock:
+        pool, _refresh_pool = _refresh_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _refresh_in_background_async(keyword, location, job_type, country, date_posted):
+    """Async counterpart of _refresh_in_background, as a task on the running loop."""
+    query_key = index_query_key(keyword, location, job_type, country, date_posted)
+    if not _claim_refresh(query_key):
+        return
+
+    async def refresh():
+        try:
+            await search_live_async(keyword, location, job_type, country, date_posted)
+        except Exception as e:
+            print(f"⚠️ Background refresh failed for {query_key!r}: {e}")
+        finally:
+            _release_refresh(query_key)
+
+    task = asyncio.create_task(refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+# ========================= PIPELINES =========================
+def search_live(keyword, location, job_type=None, country="us", date_posted="all"):
+    """Fetch from every source, enrich and index; returns the enriched, unfiltered jobs."""
+    jobs = fetch_all_sources_sync(keyword, location, job_type, country, date_posted)
+    if ENRICHMENT_MODE == "queue":
+        for job in cluster_representatives(jobs):
+            defer_job(job)
+    else:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(process_job, job) for job in cluster_representatives(jobs)]
+            for f in as_completed(futures):
+                f.result()
+    updated = share_cluster_enrichment(jobs)
+    index_jobs(updated, index_query_key(keyword, location, job_type, country, date_posted))
+    return updated
+
+
 def job_search_pipeline(keyword, location, job_type=None, country="us", date_posted="all"):
     """
     Programmatic version of the job search for API or backend usage.
-    Returns a list of processed job dicts.
+    Returns a list of processed job dicts, from the local search index when
+    it can answer the query (stale queries are refreshed in the background).
     """
-    data = fetch_jsearch(keyword, location, job_type, country, date_posted)
-    jobs = data.get("data", [])
-    updated = []
+    hits, stale = search_index_first(keyword, location, job_type, country, date_posted)
+    if hits is not None:
+        if stale:
+            _refresh_in_background(keyword, location, job_type, country, date_posted)
+        return finalize_jobs(hits, job_type, date_posted, keyword, location, record=False)
 
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = [executor.submit(process_job, job) for job in jobs]
-        for f in as_completed(futures):
-            updated.append(f.result())
+    updated = search_live(keyword, location, job_type, country, date_posted)
+    return finalize_jobs(updated, job_type, date_posted, keyword, location)
 
-    filtered = [
-        job for job in updated
-        if matches_job_type(job.get("job_employment_type"), job_type)
-        and within_date_filter(job.get("job_posted_at_datetime_utc"), date_posted)
-    ]
 
-    cleaned = []
-    for job in filtered:
-        vals = [v for v in [job.get("job_min_salary"), job.get("job_max_salary")] if v]
-        if not vals:
-            cleaned.append(job)
-            continue
-        avg = np.mean(vals)
-        if avg < 1000:  # hourly
-            if job.get("job_country", "").lower() == "ca" and avg < 17.20:
-                continue
-        cleaned.append(job)
-
-    cleaned = compute_relative_pay_scores(cleaned)
-    cleaned.sort(key=lambda j: (j.get("pay_score") or 0), reverse=True)
-    return cleaned
+async def search_live_async(keyword, location, job_type=None, country="us", date_posted="all"):
+    """
+    Async version of search_live for the FastAPI event loop.
+    All jobs are enriched concurrently on the shared HTTP client and browser
+    pool; a semaphore bounds how many run at once per request.
+    """
+    jobs = await fetch_all_sources(keyword, location, job_type, country, date_posted)
+    if ENRICHMENT_MODE == "queue":
+        await asyncio.to_thread(lambda: [defer_job(job) for job in cluster_representatives(jobs)])
+    else:
+        sem = asyncio.Semaphore(ASYNC_ENRICH_CONCURRENCY)
+
+        async def enrich(job):
+            async with sem:
+                return await process_job_async(job)
+
+        await asyncio.gather(*(enrich(job) for job in cluster_representatives(jobs)))
+    updated = share_cluster_enrichment(jobs)
+    await asyncio.to_thread(index_jobs, updated, index_query_key(keyword, location, job_type, country, date_posted))
+    return updated
+
+
+async def job_search_pipeline_async(keyword, location, job_type=None, country="us", date_posted="all"):
+    """Async version of job_search_pipeline."""
+    hits, stale = await asyncio.to_thread(search_index_first, keyword, location, job_type, country, date_posted)
+    if hits is not None:
+        if stale:
+            _refresh_in_background_async(keyword, location, job_type, country, date_posted)
+        return await asyncio.to_thread(finalize_jobs, hits, job_type, date_posted, keyword, location,
+                                       record=False)
+
+    updated = await search_live_async(keyword, location, job_type, country, date_posted)
+    return await asyncio.to_thread(finalize_jobs, updated, job_type, date_posted, keyword, location)
+
+
+async def stream_job_search(keyword, location, job_type=None, country="us", date_posted="all"):
+    """
+    Streaming version of job_search_pipeline_async. Yields event dicts:
+
+      {"event": "results", "jobs": [...]}          raw merged results, immediately
+      {"event": "update", "indexes": [...], "job_ids": [...], "fields": {...}}
+                                                   one cluster enriched (indexes into "results")
+      {"event": "scores", "pay_scores": {index: score}}
+                                                   interim pay scores, at most every SCORE_EVENT_INTERVAL
+      {"event": "done", "results": [...]}          final filtered, ranked list (same as /get_jobs)
+
+    Closing the generator (client disconnect) cancels outstanding enrichment.
+    """
+    jobs = await fetch_all_sources(keyword, location, job_type, country, date_posted)
+    yield {"event": "results", "jobs": jobs}
+
+    clusters: dict[int, list[int]] = {}
+    for i, job in enumerate(jobs):
+        clusters.setdefault(job.get("cluster_id", i), []).append(i)
+
+    sem = asyncio.Semaphore(ASYNC_ENRICH_CONCURRENCY)
+    # In queue mode only cache lookups happen here; scraping is left to the workers
+    enrich_one = process_job_async if ENRICHMENT_MODE != "queue" else (
+        lambda job: asyncio.to_thread(defer_job, job))
+
+    async def enrich(index):
+        async with sem:
+            await enrich_one(jobs[index])
+            return index
+
+    tasks = [asyncio.create_task(enrich(rep)) for rep in clusters]
+    dist_key = distribution_key(keyword, location)
+    last_scores = time.monotonic()
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            rep = await next_done
+            members = clusters[rep]
+            for i in members[1:]:
+                _copy_enrichment(jobs[i], jobs[rep])
+            yield {
+                "event": "update",
+                "indexes": members,
+                "job_ids": [jobs[i].get("job_id") for i in members],
+                "fields": {f: jobs[rep].get(f) for f in ENRICHED_FIELDS},
+            }
+
+            if time.monotonic() - last_scores >= SCORE_EVENT_INTERVAL:
+                last_scores = time.monotonic()
+                await asyncio.to_thread(compute_relative_pay_scores, jobs, dist_key, False)
+                yield {"event": "scores", "pay_scores": {i: j.get("pay_score") for i, j in enumerate(jobs)}}
+
+        await asyncio.to_thread(index_jobs, jobs, index_query_key(keyword, location, job_type, country, date_posted))
+        results = await asyncio.to_thread(finalize_jobs, jobs, job_type, date_posted, keyword, location)
+        yield {"event": "done", "results": results}
+    finally:
+        for t in tasks:
+            t.cancel()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
 import os
+import asyncio
 import requests
 from dotenv import load_dotenv
 
+from job_search.utils.http_client import get_async_client
+from job_search.utils.response_cache import LRUCache, SQLiteCache
+
 load_dotenv()
 
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
@@ -9,7 +13,67 @@ RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
 # Base endpoint for JSearch
 BASE_URL = "https://jsearch.p.rapidapi.com/search"
 
-def fetch_jsearch(keyword, location, job_type="", country="us", date_posted="all"):
+# ======== RESPONSE CACHE ========
+
+# Seconds a cached search stays fresh, per date_posted bucket: narrow
+# recency windows go stale faster than "all".
+CACHE_TTL_BY_DATE_POSTED = {
+    "today": int(os.getenv("JSEARCH_TTL_TODAY", "600")),
+    "3days": int(os.getenv("JSEARCH_TTL_3DAYS", "1800")),
+    "week": int(os.getenv("JSEARCH_TTL_WEEK", "1800")),
+    "month": int(os.getenv("JSEARCH_TTL_MONTH", "3600")),
+    "all": int(os.getenv("JSEARCH_TTL_ALL", "7200")),
+}
+
+# "memory" (default) or "sqlite" to survive restarts
+JSEARCH_CACHE_BACKEND = os.getenv("JSEARCH_CACHE_BACKEND", "memory")
+JSEARCH_CACHE_PATH = os.getenv("JSEARCH_CACHE_PATH", "jsearch_cache.sqlite3")
+JSEARCH_CACHE_MAX_ENTRIES = int(os.getenv("JSEARCH_CACHE_MAX_ENTRIES", "512"))
+JSEARCH_CACHE_MAX_BYTES = int(os.getenv("JSEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+if JSEARCH_CACHE_BACKEND == "sqlite":
+    _cache = SQLiteCache(JSEARCH_CACHE_PATH, JSEARCH_CACHE_MAX_ENTRIES, JSEARCH_CACHE_MAX_BYTES)
+else:
+    _cache = LRUCache(JSEARCH_CACHE_MAX_ENTRIES, JSEARCH_CACHE_MAX_BYTES)
+
+
+def _norm(value) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def cache_key(keyword, location, job_type="", country="us", date_posted="all", page=1) -> str:
+    """Normalized query key: case and whitespace differences hit the same entry."""
+    fields = (keyword, location, job_type, country or "us", date_posted or "all", page)
+    return "|".join(_norm(v) for v in fields)
+
+
+def cache_ttl(date_posted) -> int:
+    return CACHE_TTL_BY_DATE_POSTED.get(_norm(date_posted), CACHE_TTL_BY_DATE_POSTED["all"])
+
+
+def jsearch_cache_stats() -> dict:
+    return _cache.stats()
+
+
+def _store(key, date_posted, data):
+    # Never cache failures; the next request should retry the API
+    if "error" not in data:
+        _cache.set(key, data, cache_ttl(date_posted))
+    return data
+
+
+async def _run_cache(fn, *args):
+    # The SQLite backend does disk I/O; keep it off the event loop
+    if isinstance(_cache, SQLiteCache):
+        return await asyncio.to_thread(fn, *args)
+    return fn(*args)
+
+
+# Misses being fetched right now, per event loop and cache key: identical
+# concurrent searches share one paid API call
+_inflight: dict[tuple[int, str], asyncio.Task] = {}
+
+def fetch_jsearch(keyword, location, job_type="", country="us", date_posted="all", page=1):
     """
     Fetch job listings from JSearch API (v1).
 
@@ -25,25 +89,77 @@ def fetch_jsearch(keyword, location, job_type="", country="us", date_posted="all
         Country code (default = 'us')
     date_posted : str
         Filter for recency (e.g., 'all', 'today', 'week', 'month')
+    page : int
+        Result page to fetch (1-based, 10 jobs per page)
+
+    Responses are cached per normalized query (see CACHE_TTL_BY_DATE_POSTED).
+    """
+    key = cache_key(keyword, location, job_type, country, date_posted, page)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    headers, params = _build_request(keyword, location, job_type, country, date_posted, page)
+
+    try:
+        res = requests.get(BASE_URL, headers=headers, params=params)
+        if res.status_code != 200:
+            return {"error": f"JSearch API returned {res.status_code}: {res.text}"}
+        return _store(key, date_posted, res.json())
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def fetch_jsearch_async(keyword, location, job_type="", country="us", date_posted="all", page=1):
+    """
+    Async version of fetch_jsearch using the shared pooled httpx client.
+    Concurrent misses for the same query wait on a single API call; a caller
+    that is cancelled doesn't cancel it for the others.
     """
+    key = cache_key(keyword, location, job_type, country, date_posted, page)
+    cached = await _run_cache(_cache.get, key)
+    if cached is not None:
+        return cached
 
+    flight = (id(asyncio.get_running_loop()), key)
+    task = _inflight.get(flight)
+    if task is None:
+        headers, params = _build_request(keyword, location, job_type, country, date_posted, page)
+        task = asyncio.ensure_future(_fetch_and_store(key, date_posted, headers, params))
+        _inflight[flight] = task
+        task.add_done_callback(lambda _: _inflight.pop(flight, None))
+    return await asyncio.shield(task)
+
+
+async def _fetch_and_store(key, date_posted, headers, params):
+    try:
+        res = await get_async_client().get(BASE_URL, headers=headers, params=params, timeout=30)
+        if res.status_code != 200:
+            return {"error": f"JSearch API returned {res.status_code}: {res.text}"}
+        return await _run_cache(_store, key, date_posted, res.json())
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def search_jsearch_async(keyword, location, job_type="", country="us", date_posted="all", page=1):
+    """Source adapter for the aggregator: one page of JSearch jobs, [] on failure."""
+    data = await fetch_jsearch_async(keyword, location, job_type, country, date_posted, page)
+    if "error" in data:
+        print(f"⚠️ JSearch page {page}: {data['error']}")
+    return data.get("data", [])
+
+
+def _build_request(keyword, location, job_type, country, date_posted, page=1):
     headers = {
         "x-rapidapi-key": RAPIDAPI_KEY,
         "x-rapidapi-host": "jsearch.p.rapidapi.com"
     }
 
     params = {
-        "query": f"{keyword} {job_type} jobs in {location}",
-        "page": "1",
+        "query": f"{keyword} {job_type or ''} jobs in {location}",
+        "page": str(page),
         "num_pages": "1",
         "country": country,
         "date_posted": date_posted
     }
-
-    try:
-        res = requests.get(BASE_URL, headers=headers, params=params)
-        if res.status_code != 200:
-            return {"error": f"JSearch API returned {res.status_code}: {res.text}"}
-        return res.json()
-    except Exception as e:
-        return {"error": str(e)}
+    return headers, params
@@ -0,0 +1,33 @@
+"""
+Pluggable job sources for the aggregator.
+
+A source is an async callable
+
+    async def source(keyword, location, job_type, country, date_posted, page) -> list[dict]
+
+returning one page of job dicts (JSearch field names where possible) and
+[] on failure. New sources live beside jsearch_api.py and are registered
+here; JOB_SOURCES picks which ones run (comma-separated, default "jsearch").
+"""
+
+import os
+from typing import Awaitable, Callable
+
+from job_search.api_clients.jsearch_api import search_jsearch_async
+
+SourceFn = Callable[..., Awaitable[list[dict]]]
+
+SOURCES: dict[str, SourceFn] = {}
+
+
+def register_source(name: str, fn: SourceFn):
+    SOURCES[name] = fn
+
+
+def get_sources() -> dict[str, SourceFn]:
+    """Enabled sources, in JOB_SOURCES order."""
+    enabled = [n.strip() for n in os.getenv("JOB_SOURCES", "jsearch").split(",") if n.strip()]
+    return {name: SOURCES[name] for name in enabled if name in SOURCES}
+
+
+register_source("jsearch", search_jsearch_async)
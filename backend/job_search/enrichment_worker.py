@@ -0,0 +1,82 @@
+"""
+Background scraping workers for the enrichment queue.
+
+    python -m job_search.enrichment_worker --processes 2 --threads 4
+
+Each process owns its own browser pool and runs `--threads` scraping loops.
+Results land in the enrichment cache (utils/enrichment_cache), which the
+web process reads on later searches. Pages that were blocked or never
+arrived aren't cached as "not found": the task goes back to the queue with
+backoff instead.
+
+Worker processes are started with "spawn", so none inherits the parent's
+SQLite connections, browser or event-loop state.
+"""
+
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from job_search.aggregator import process_job, ScrapeFailed
+from job_search.utils.enrichment_queue import get_enrichment_queue
+
+IDLE_SLEEP = 1.0
+
+
+def _worker_loop(stop):
+    queue = get_enrichment_queue()
+    while not stop.is_set():
+        task = queue.claim()
+        if task is None:
+            time.sleep(IDLE_SLEEP)
+            continue
+        url_key, lease, job = task
+        try:
+            # process_job writes found/not-found results to the enrichment cache,
+            # and raises ScrapeFailed instead of caching a miss it couldn't verify
+            process_job(job, raise_on_failure=True)
+            if not queue.complete(url_key, lease):
+                print(f"⚠️ Lease on {url_key} expired before it finished; task stays with its new owner")
+        except ScrapeFailed as e:
+            print(f"⏱️ Scrape failed for {url_key}, will retry: {e}")
+            queue.fail(url_key, lease, str(e))
+        except Exception as e:
+            print(f"⚠️ Enrichment failed for {url_key}: {e}")
+            queue.fail(url_key, lease, str(e))
+
+
+def run_worker_process(threads: int, stop):
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in range(threads):
+            executor.submit(_worker_loop, stop)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Run enrichment queue workers.")
+    ap.add_argument("--processes", type=int, default=2)
+    ap.add_argument("--threads", type=int, default=4, help="scraping loops per process")
+    args = ap.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    stop = ctx.Event()
+    procs = [
+        ctx.Process(target=run_worker_process, args=(args.threads, stop), daemon=True)
+        for _ in range(args.processes)
+    ]
+    for p in procs:
+        p.start()
+    print(f"✅ {args.processes} enrichment worker processes running ({args.threads} loops each)")
+
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping workers...")
+        stop.set()
+        for p in procs:
+            p.join(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
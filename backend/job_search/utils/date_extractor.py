@@ -1,77 +1,352 @@
 # file: backend/job_search/utils/date_extractor.py
+"""
+Posting-date extraction for job pages.
+
+Cheapest and most reliable sources first, all read from the raw HTML with
+compiled patterns (no DOM parse):
+  1) JSON-LD `JobPosting.datePosted`             -> confidence "high"
+  2) <meta> tags (itemprop/property/name)        -> "high" for datePosted,
+                                                    "medium" for publish times
+  3) <time datetime="...">                       -> "medium"
+Only when none of those is conclusive is the visible text parsed and scanned
+once with a single compiled pattern covering "3 days ago", "an hour ago",
+"just posted", "Posted yesterday", "30+ days ago" and absolute dates
+("Posted on January 5, 2024", "2024-01-05").
+
+Relative dates keep their time of day and use calendar months, so
+"1 month ago" on March 31 is February 29/28, not 30 days back.
+"""
+
+import os
 import re
+from calendar import monthrange
 from datetime import datetime, timedelta, timezone
-import requests
-from bs4 import BeautifulSoup
-from .page_fetcher import get_rendered_html  # ✅ fixed import
+from typing import NamedTuple
+
+from .page_artifact import PageArtifact
+from .html_text import html_to_text, HTML_MAX_CHARS
+
+
+# ======== CONFIG ========
+
+CONFIDENCE = {"low": 1, "medium": 2, "high": 3}
+# Weakest result accepted from the plain GET without trying the browser render
+DATE_ACCEPT_CONFIDENCE = os.getenv("DATE_ACCEPT_CONFIDENCE", "low")
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+# ======== COMPILED PATTERNS ========
+
+_JSONLD_RE = re.compile(r'"datePosted"\s*:\s*"([^"]{4,40})"')
+_META_RE = re.compile(r"<meta\b[^>]*>", re.I)
+_ATTR_RE = re.compile(r"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_TIME_RE = re.compile(r"""<time\b[^>]*?\bdatetime\s*=\s*["']([^"']+)["']""", re.I)
+
+# Lowercased itemprop/property/name -> confidence
+_META_KEYS = {
+    "dateposted": "high",
+    "article:published_time": "medium",
+    "og:published_time": "medium",
+    "datepublished": "medium",
+    "publishdate": "medium",
+    "publish-date": "medium",
+    "pubdate": "medium",
+    "dc.date.issued": "medium",
+}
+
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+
+_TEXT_RE = re.compile(
+    r"\b(?P<posted>(?:date\s+)?(?:posted|published|listed)(?:\s+on)?\s*:?\s*)?"
+    r"(?:"
+    r"(?P<fresh>just\s+posted|just\s+now|today|yesterday)"
+    r"|(?P<num>\d{1,3}|an?|one)(?P<plus>\+)?\s*"
+    r"(?P<unit>min(?:ute)?s?|hours?|hrs?|days?|weeks?|months?|years?)\s+ago"
+    r"|(?P<iso>\d{4}-\d{2}-\d{2})"
+    rf"|(?P<m1>{_MONTH})\s+(?P<d1>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<y1>\d{{4}})"
+    rf"|(?P<d2>\d{{1,2}})(?:st|nd|rd|th)?\s+(?P<m2>{_MONTH}),?\s+(?P<y2>\d{{4}})"
+    r")\b",
+    re.I,
+)
+_SLASH_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+
+class DateInfo(NamedTuple):
+    """A posting date with where it came from and how much to trust it."""
+    posted_at: str      # ISO 8601 UTC
+    confidence: str     # "high" | "medium" | "low"
+    source: str         # "jsonld" | "meta" | "time" | "text"
+    text: str           # the value or phrase it was read from
+
+
+# ======== DATE ARITHMETIC ========
+
+def _iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime(ISO_FORMAT)
+
+
+def _minus_months(dt: datetime, months: int) -> datetime:
+    total = dt.year * 12 + dt.month - 1 - months
+    year, month = divmod(total, 12)
+    day = min(dt.day, monthrange(year, month + 1)[1])
+    return dt.replace(year=year, month=month + 1, day=day)
+
 
-# Sites that often block direct HTTP requests
-BLOCKED_SITES = {"indeed.com", "ca.indeed.com", "simplyhired.ca", "glassdoor.com", "ziprecruiter.com"}
+def _ago(num: int, unit: str, now: datetime) -> datetime:
+    unit = unit.lower()
+    if unit.startswith("min"):
+        return now - timedelta(minutes=num)
+    if unit.startswith("h"):
+        return now - timedelta(hours=num)
+    if unit.startswith("d"):
+        return now - timedelta(days=num)
+    if unit.startswith("w"):
+        return now - timedelta(weeks=num)
+    if unit.startswith("mo"):
+        return _minus_months(now, num)
+    return _minus_months(now, num * 12)
+
+
+def _ymd(year, month, day) -> datetime | None:
+    try:
+        return datetime(int(year), int(month), int(day), tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def parse_date(value: str) -> datetime | None:
+    """Absolute date/datetime string (ISO 8601, "Jan 5, 2024", "01/05/2024") as an aware datetime."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    except ValueError:
+        pass
+    m = _TEXT_RE.search(value)
+    if m and not (m.group("fresh") or m.group("num")):
+        return _absolute(m)
+    m = _SLASH_RE.search(value)
+    if m:
+        return _ymd(m.group(3), m.group(1), m.group(2))
+    return None
+
+
+def _absolute(m: re.Match) -> datetime | None:
+    if m.group("iso"):
+        return _ymd(*m.group("iso").split("-"))
+    if m.group("m1"):
+        return _ymd(m.group("y1"), _MONTHS[m.group("m1")[:3].lower()], m.group("d1"))
+    return _ymd(m.group("y2"), _MONTHS[m.group("m2")[:3].lower()], m.group("d2"))
+
+
+def _plausible(dt: datetime | None, now: datetime) -> bool:
+    # Reject future dates (expiry/start dates) beyond clock skew
+    return dt is not None and dt <= now + timedelta(days=1)
 
 
 def relative_to_date(match_text: str) -> str:
     """Convert '3 days ago', '2 weeks ago', etc. into an ISO 8601 UTC datetime string."""
-    now = datetime.now(timezone.utc)
-    num_match = re.search(r"\d+", match_text)
-    num = int(num_match.group()) if num_match else 1
+    info = scan_text(match_text)
+    return info.posted_at if info else _iso(datetime.now(timezone.utc))
 
-    match_lower = match_text.lower()
-    if "day" in match_lower:
-        dt = now - timedelta(days=num)
-    elif "week" in match_lower:
-        dt = now - timedelta(weeks=num)
-    elif "month" in match_lower:
-        dt = now - timedelta(days=num * 30)
-    else:
-        dt = now
 
-    return dt.strftime("%Y-%m-%dT00:00:00Z")
+# ======== STRUCTURED SOURCES (raw HTML) ========
 
+def _meta_attrs(tag: str) -> dict:
+    return {k.lower(): (v1 if v1 is not None else v2) for k, v1, v2 in _ATTR_RE.findall(tag)}
 
-def extract_from_html(html: str) -> str | None:
-    """Extract posting date from visible text (e.g., '3 days ago')."""
+
+def extract_from_markup(html: str, now: datetime | None = None) -> DateInfo | None:
+    """Best date from JSON-LD, <meta> and <time> markup, or None."""
     if not html:
         return None
+    now = now or datetime.now(timezone.utc)
+    html = html[:HTML_MAX_CHARS]
 
-    try:
-        text = BeautifulSoup(html, "html.parser").get_text(separator="\n", strip=True)
-        match = re.search(r"(\d+)\s+(day|days|week|weeks|month|months)\s+ago", text, re.IGNORECASE)
-        if match:
-            return relative_to_date(match.group())
-    except Exception:
-        return None
+    if "datePosted" in html:
+        for m in _JSONLD_RE.finditer(html):
+            dt = parse_date(m.group(1))
+            if _plausible(dt, now):
+                return DateInfo(_iso(dt), "high", "jsonld", m.group(1))
 
+    best = None
+    if "<meta" in html or "<META" in html:
+        for m in _META_RE.finditer(html):
+            attrs = _meta_attrs(m.group())
+            key = (attrs.get("itemprop") or attrs.get("property") or attrs.get("name") or "").lower()
+            confidence = _META_KEYS.get(key)
+            if confidence is None or (best and CONFIDENCE[best.confidence] >= CONFIDENCE[confidence]):
+                continue
+            value = attrs.get("content") or attrs.get("datetime") or ""
+            dt = parse_date(value)
+            if _plausible(dt, now):
+                best = DateInfo(_iso(dt), confidence, "meta", value)
+                if confidence == "high":
+                    return best
+    if best:
+        return best
+
+    if "<time" in html or "<TIME" in html:
+        for m in _TIME_RE.finditer(html):
+            dt = parse_date(m.group(1))
+            if _plausible(dt, now):
+                return DateInfo(_iso(dt), "medium", "time", m.group(1))
     return None
 
 
-def extract_posted_date(url: str) -> str | None:
+# ======== VISIBLE TEXT ========
+
+def _text_match(m: re.Match, now: datetime) -> DateInfo | None:
+    posted = bool(m.group("posted"))
+    phrase = m.group().strip()
+
+    fresh = m.group("fresh")
+    if fresh:
+        fresh = fresh.lower()
+        if fresh.startswith("just"):
+            return DateInfo(_iso(now), "medium", "text", phrase)
+        if not posted:
+            return None  # "Apply today" says nothing about the posting
+        dt = now if fresh == "today" else now - timedelta(days=1)
+        return DateInfo(_iso(dt), "medium", "text", phrase)
+
+    num = m.group("num")
+    if num:
+        n = int(num) if num.isdigit() else 1
+        unit = m.group("unit").lower()
+        dt = _ago(n, unit, now)
+        # "30+ days ago" is only a bound; month/year counts are rounded by the site
+        vague = m.group("plus") or unit.startswith(("mo", "y"))
+        return DateInfo(_iso(dt), "low" if vague else "medium", "text", phrase)
+
+    dt = _absolute(m)
+    if not _plausible(dt, now):
+        return None
+    return DateInfo(_iso(dt), "medium" if posted else "low", "text", phrase)
+
+
+def scan_text(text: str, now: datetime | None = None) -> DateInfo | None:
     """
-    Extract job posting date from a URL.
-    Tries simple GET first; falls back to rendered HTML if blocked.
+    Single pass over visible text. The first medium-confidence match wins;
+    otherwise the first low-confidence one (e.g. a bare date) is returned.
     """
-    if not url:
+    if not text:
+        return None
+    now = now or datetime.now(timezone.utc)
+    fallback = None
+    for m in _TEXT_RE.finditer(text):
+        info = _text_match(m, now)
+        if info is None:
+            continue
+        if info.confidence != "low":
+            return info
+        fallback = fallback or info
+    return fallback
+
+
+def extract_from_text(text: str) -> str | None:
+    """Extract posting date from already-extracted visible text."""
+    info = scan_text(text)
+    return info.posted_at if info else None
+
+
+def extract_from_html(html: str) -> str | None:
+    """Extract posting date from page markup, then visible text (e.g., '3 days ago')."""
+    if not html:
         return None
 
     try:
-        res = requests.get(
-            url,
-            headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                                   "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"},
-            timeout=10,
-        )
-        if res.status_code == 200:
-            date = extract_from_html(res.text)
-            if date:
-                return date
+        info = extract_from_markup(html) or scan_text(html_to_text(html))
     except Exception:
-        pass
+        return None
+    return info.posted_at if info else None
 
-    # Fallback: browser-rendered HTML (Playwright)
+
+# ======== PAGE PIPELINE ========
+
+def _better(a: DateInfo | None, b: DateInfo | None) -> DateInfo | None:
+    if a is None or (b is not None and CONFIDENCE[b.confidence] > CONFIDENCE[a.confidence]):
+        return b
+    return a
+
+
+def _accepted(info: DateInfo | None) -> bool:
+    return info is not None and CONFIDENCE[info.confidence] >= CONFIDENCE.get(DATE_ACCEPT_CONFIDENCE, 1)
+
+
+def _from_markup(page: PageArtifact) -> DateInfo | None:
     try:
-        html = get_rendered_html(url)
-        if html:
-            return extract_from_html(html)
+        return extract_from_markup(page.html)
     except Exception:
-        pass
+        return None
 
-    return None
+
+def find_posted_date(url: str, page: PageArtifact | None = None) -> DateInfo | None:
+    """
+    Posting date of a job page as a DateInfo, or None.
+    Tries simple GET first; renders the page only if that found nothing at
+    DATE_ACCEPT_CONFIDENCE or better.
+
+    Pass the job's shared `page` to reuse a download made by another extractor.
+    """
+    if page is None:
+        page = PageArtifact(url)
+    if not page.url:
+        return None
+
+    page.fetch()
+    info = _from_markup(page)
+    if info is None or info.confidence != "high":
+        info = _better(info, scan_text(page.text))
+    if _accepted(info) or page.rendered:
+        return info
+
+    # Fallback: browser-rendered HTML (Playwright)
+    html = page.html
+    page.render()
+    if page.html is html:
+        return info
+    info = _better(info, _from_markup(page))
+    if info is None or info.confidence != "high":
+        info = _better(info, scan_text(page.text))
+    return info
+
+
+async def find_posted_date_async(url: str, page: PageArtifact | None = None) -> DateInfo | None:
+    """Async version of find_posted_date (httpx + async browser pool)."""
+    if page is None:
+        page = PageArtifact(url)
+    if not page.url:
+        return None
+
+    await page.fetch_async()
+    info = _from_markup(page)
+    if info is None or info.confidence != "high":
+        info = _better(info, scan_text(await page.text_async()))
+    if _accepted(info) or page.rendered:
+        return info
+
+    html = page.html
+    await page.render_async()
+    if page.html is html:
+        return info
+    info = _better(info, _from_markup(page))
+    if info is None or info.confidence != "high":
+        info = _better(info, scan_text(await page.text_async()))
+    return info
+
+
+def extract_posted_date(url: str, page: PageArtifact | None = None) -> str | None:
+    """find_posted_date as an ISO 8601 string."""
+    info = find_posted_date(url, page)
+    return info.posted_at if info else None
+
+
+async def extract_posted_date_async(url: str, page: PageArtifact | None = None) -> str | None:
+    """Async version of extract_posted_date."""
+    info = await find_posted_date_async(url, page)
+    return info.posted_at if info else None
@@ -0,0 +1,131 @@
+"""
+Near-duplicate job detection.
+
+Exact (title, company) matching misses reposts with a reworded title and the
+same posting syndicated to several boards. Here every job gets a MinHash
+signature over word shingles of its normalized title + description; LSH
+banding finds candidate pairs in roughly linear time, and candidates are
+confirmed by estimated Jaccard similarity. Only jobs with the same
+normalized company and location can cluster, so a chain's identical posting
+in two cities stays two jobs.
+"""
+
+import os
+import re
+import zlib
+import numpy as np
+
+from .job_record import JobRecord
+
+# ======== CONFIG ========
+
+NUM_PERM = 64
+BANDS = 16                      # 16 bands x 4 rows: candidates above ~0.5 Jaccard
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = float(os.getenv("DEDUP_SIMILARITY", "0.7"))
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_COMPANY_SUFFIX_RE = re.compile(
+    r"\b(inc|incorporated|llc|ltd|limited|corp|corporation|co|company|plc|gmbh)\b\.?"
+)
+
+
+# ======== NORMALIZATION ========
+
+def normalize_company(name: str) -> str:
+    name = _COMPANY_SUFFIX_RE.sub(" ", str(name or "").lower())
+    return " ".join(_WORD_RE.findall(name))
+
+
+def normalize_location(job: dict) -> str:
+    loc = job.get("location") or ", ".join(
+        p for p in (job.get("job_city"), job.get("job_state"), job.get("job_country")) if p
+    )
+    return " ".join(_WORD_RE.findall(str(loc).lower()))
+
+
+def _fields(job: dict) -> tuple[str, str, str]:
+    title = job.get("title") or job.get("job_title") or ""
+    company = job.get("company") or job.get("employer_name") or ""
+    desc = job.get("description") or job.get("job_description") or ""
+    return str(title), str(company), str(desc)
+
+
+# ======== MINHASH ========
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        grams = [" ".join(words)] if words else [""]
+    else:
+        grams = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64)
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """NUM_PERM-long MinHash signature of the text's word shingles."""
+    x = _shingle_hashes(text) % _PRIME
+    # (a*x + b) mod p for every permutation x shingle, then min over shingles
+    hashed = (np.outer(_A, x) + _B[:, None]) % _PRIME
+    return hashed.min(axis=1)
+
+
+# ======== CLUSTERING ========
+
+def _find(parent: list[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_ids(jobs: list[dict], threshold: float = SIMILARITY_THRESHOLD) -> list[int]:
+    """
+    Cluster near-duplicate jobs. Returns one cluster ID per job: the index of
+    the cluster's first job, so `ids[i] == i` marks a representative.
+    """
+    n = len(jobs)
+    parent = list(range(n))
+    signatures = []
+    buckets: dict[tuple, list[int]] = {}
+
+    for i, job in enumerate(jobs):
+        title, company, desc = _fields(job)
+        sig = minhash_signature(f"{title} {desc}")
+        signatures.append(sig)
+        block = (normalize_company(company), normalize_location(job))
+        for b in range(BANDS):
+            key = (block, b, sig[b * ROWS:(b + 1) * ROWS].tobytes())
+            buckets.setdefault(key, []).append(i)
+
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        # Compare each member with one exemplar per distinct cluster seen in this bucket
+        exemplars: list[int] = []
+        for i in members:
+            for j in exemplars:
+                ri, rj = _find(parent, i), _find(parent, j)
+                if ri == rj:
+                    break
+                if np.mean(signatures[i] == signatures[j]) >= threshold:
+                    # Keep the lower index as root so IDs point at the first occurrence
+                    parent[max(ri, rj)] = min(ri, rj)
+                    break
+            else:
+                exemplars.append(i)
+
+    return [_find(parent, i) for i in range(n)]
+
+
+def assign_clusters(jobs: list[JobRecord]) -> list[JobRecord]:
+    """Tag every record with `cluster_id` in place and return the list."""
+    for job, cid in zip(jobs, cluster_ids(jobs)):
+        job.cluster_id = cid
+    return jobs
@@ -0,0 +1,307 @@
+"""
+Central per-host policy for apply-link fetches.
+
+Every plain GET and browser render of a job page goes through here:
+  - known bot-walled domains skip the plain GET and go straight to render
+  - each host gets a concurrency cap and a minimum gap between requests
+  - per-host EWMAs of latency and block rate are learned from outcomes
+  - per-host circuit breakers for GET and render stop us from paying for
+    timeouts on hosts that keep failing (GET -> render, render -> skip);
+    after the cooldown a single trial request decides whether they close
+  - a per-job Deadline bounds the total time spent on one posting
+  - hosts idle for HOST_IDLE_TTL are forgotten, so the table stays bounded
+"""
+
+import os
+import time
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+
+
+# ======== CONFIG ========
+
+# Domains that almost always require a headless browser (anti-bot pages).
+# Matched on the registrable suffix, so ca.indeed.com is covered by indeed.com.
+BLOCKED_DOMAINS = {
+    "indeed.com", "simplyhired.ca", "simplyhired.com",
+    "glassdoor.ca", "glassdoor.com", "ziprecruiter.com",
+}
+
+PER_DOMAIN_CONCURRENCY = int(os.getenv("PER_DOMAIN_CONCURRENCY", "2"))
+# Minimum seconds between request starts to the same host
+PER_DOMAIN_MIN_INTERVAL = float(os.getenv("PER_DOMAIN_MIN_INTERVAL", "0.25"))
+# Total seconds one job may spend fetching/rendering its apply link
+JOB_FETCH_BUDGET = float(os.getenv("JOB_FETCH_BUDGET", "25"))
+# Below this many seconds left a fetch is not worth starting
+MIN_USEFUL_TIMEOUT = 2.0
+
+BREAKER_THRESHOLD = 3           # consecutive failures that open a breaker
+BREAKER_COOLDOWN = 60.0         # first open period (s), doubles while failing
+BREAKER_MAX_COOLDOWN = 900.0
+EWMA_ALPHA = 0.2
+BLOCK_RATE_TO_RENDER = 0.7      # learned GET block rate that switches a host to render-first
+
+# Per-host state is dropped after this long unused (longer than any breaker cooldown)
+HOST_IDLE_TTL = float(os.getenv("DOMAIN_HOST_IDLE_TTL", "3600"))
+# Hard cap on hosts tracked; the least recently used idle ones go first
+MAX_HOSTS = int(os.getenv("DOMAIN_MAX_HOSTS", "5000"))
+HOST_SWEEP_INTERVAL = 60.0
+
+
+def is_known_blocked(host: str) -> bool:
+    host = (host or "").lower()
+    return any(host == d or host.endswith("." + d) for d in BLOCKED_DOMAINS)
+
+
+# ======== DEADLINE ========
+
+class Deadline:
+    """Time budget shared by every network step of one job."""
+
+    def __init__(self, seconds: float = JOB_FETCH_BUDGET):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def timeout(self, cap: float) -> float | None:
+        """Timeout for the next step (at most `cap`), or None if not worth starting."""
+        left = min(cap, self.remaining())
+        return left if left >= MIN_USEFUL_TIMEOUT else None
+
+
+# ======== PER-HOST STATE ========
+
+class _Breaker:
+    def __init__(self):
+        self.failures = 0
+        self.open_until = 0.0
+        self.cooldown = BREAKER_COOLDOWN
+        self.trial_started: float | None = None  # half-open trial in flight since
+
+    def allow(self) -> bool:
+        """Whether a request could go out now (no side effects; see begin())."""
+        if self.failures < BREAKER_THRESHOLD:
+            return True  # closed
+        now = time.monotonic()
+        if now < self.open_until:
+            return False  # open
+        # Half-open: only while no trial is out. A trial that never reported
+        # back (caller crashed) is written off after one cooldown.
+        return self.trial_started is None or now - self.trial_started > BREAKER_COOLDOWN
+
+    def begin(self) -> bool:
+        """Claim one request. Half-open lets a single trial through until it reports back."""
+        if not self.allow():
+            return False
+        if self.failures >= BREAKER_THRESHOLD:
+            self.trial_started = time.monotonic()
+        return True
+
+    def success(self):
+        self.failures = 0
+        self.cooldown = BREAKER_COOLDOWN
+        self.trial_started = None
+
+    def failure(self):
+        self.failures += 1
+        self.trial_started = None
+        if self.failures >= BREAKER_THRESHOLD:
+            self.open_until = time.monotonic() + self.cooldown
+            self.cooldown = min(self.cooldown * 2, BREAKER_MAX_COOLDOWN)
+
+    @property
+    def is_open(self) -> bool:
+        return not self.allow()
+
+
+class _HostState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(PER_DOMAIN_CONCURRENCY)
+        self.async_slots: asyncio.Semaphore | None = None
+        self.next_start = 0.0
+        self.fetch = _Breaker()
+        self.render = _Breaker()
+        self.samples = 0
+        self.block_rate = 0.0
+        self.latency = 0.0
+        self.active = 0  # callers inside slot()/async_slot()
+        self.last_used = time.monotonic()
+
+    def reserve_start(self) -> tuple[float, float]:
+        """
+        Claim the next politeness slot. Returns (seconds to wait before
+        starting, token for cancel_start()).
+        """
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + PER_DOMAIN_MIN_INTERVAL
+            return start - now, self.next_start
+
+    def cancel_start(self, token: float):
+        """Give back a reserved start that won't be used, unless a later one was reserved since."""
+        with self.lock:
+            if self.next_start == token:
+                self.next_start = token - PER_DOMAIN_MIN_INTERVAL
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.last_used = time.monotonic()
+
+    def leave(self):
+        with self.lock:
+            self.active -= 1
+            self.last_used = time.monotonic()
+
+
+class DomainScheduler:
+    def __init__(self):
+        self._hosts: dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                now = time.monotonic()
+                if len(self._hosts) >= MAX_HOSTS or now - self._last_sweep > HOST_SWEEP_INTERVAL:
+                    self._sweep(now)
+                state = self._hosts[host] = _HostState()
+            else:
+                state.last_used = time.monotonic()
+            return state
+
+    def _sweep(self, now: float):
+        """Forget idle hosts (caller holds self._lock)."""
+        self._last_sweep = now
+        idle = [(s.last_used, h) for h, s in self._hosts.items() if s.active == 0]
+        for last_used, host in idle:
+            if now - last_used > HOST_IDLE_TTL:
+                del self._hosts[host]
+        if len(self._hosts) >= MAX_HOSTS:
+            idle = sorted((lu, h) for lu, h in idle if h in self._hosts)
+            for _, host in idle[:len(self._hosts) - int(MAX_HOSTS * 0.9)]:
+                del self._hosts[host]
+
+    # ---- policy ----
+
+    def plan(self, host: str) -> str:
+        """
+        "fetch": try a plain GET first
+        "render": skip the GET, go straight to the browser
+        "skip": both paths are failing for this host right now
+        """
+        state = self._state(host)
+        if state.render.is_open and (state.fetch.is_open or is_known_blocked(host)):
+            return "skip"
+        if is_known_blocked(host) or state.fetch.is_open:
+            return "render"
+        if state.samples >= 3 and state.block_rate >= BLOCK_RATE_TO_RENDER:
+            return "render"
+        return "fetch"
+
+    def can_render(self, host: str) -> bool:
+        return self._state(host).render.allow()
+
+    def begin(self, host: str, kind: str) -> bool:
+        """
+        Claim one "fetch" or "render" right before it starts; False means the
+        breaker is open, or half-open with its single trial already out.
+        Every begin() that returns True must be followed by record().
+        """
+        state = self._state(host)
+        with state.lock:
+            return (state.fetch if kind == "fetch" else state.render).begin()
+
+    def record(self, host: str, kind: str, ok: bool, blocked: bool = False, latency: float = 0.0):
+        """Feed back one outcome. `kind` is "fetch" or "render"."""
+        state = self._state(host)
+        with state.lock:
+            breaker = state.fetch if kind == "fetch" else state.render
+            if ok:
+                breaker.success()
+            else:
+                breaker.failure()
+            if kind == "fetch":
+                state.samples += 1
+                state.block_rate += EWMA_ALPHA * ((1.0 if blocked else 0.0) - state.block_rate)
+                state.latency += EWMA_ALPHA * (latency - state.latency)
+
+    # ---- concurrency ----
+
+    @contextmanager
+    def slot(self, host: str, deadline: Deadline | None = None):
+        """
+        Per-host concurrency cap plus politeness gap (blocking). Yields True
+        once the request may start, or False (holding nothing) when
+        `deadline` runs out while waiting.
+        """
+        state = self._state(host)
+        state.enter()
+        try:
+            if not state.slots.acquire(timeout=deadline.remaining() if deadline else None):
+                yield False
+                return
+            try:
+                wait, token = state.reserve_start()
+                if deadline and wait >= deadline.remaining():
+                    state.cancel_start(token)
+                    yield False
+                    return
+                if wait:
+                    time.sleep(wait)
+                yield True
+            finally:
+                state.slots.release()
+        finally:
+            state.leave()
+
+    @asynccontextmanager
+    async def async_slot(self, host: str, deadline: Deadline | None = None):
+        """Async `slot()`."""
+        state = self._state(host)
+        if state.async_slots is None:
+            state.async_slots = asyncio.Semaphore(PER_DOMAIN_CONCURRENCY)
+        state.enter()
+        try:
+            try:
+                await asyncio.wait_for(state.async_slots.acquire(), deadline.remaining() if deadline else None)
+            except asyncio.TimeoutError:
+                yield False
+                return
+            try:
+                wait, token = state.reserve_start()
+                if deadline and wait >= deadline.remaining():
+                    state.cancel_start(token)
+                    yield False
+                    return
+                if wait:
+                    await asyncio.sleep(wait)
+                yield True
+            finally:
+                state.async_slots.release()
+        finally:
+            state.leave()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {
+            host: {
+                "samples": s.samples,
+                "block_rate": round(s.block_rate, 3),
+                "latency_s": round(s.latency, 3),
+                "plan": self.plan(host),
+                "fetch_breaker_open": s.fetch.is_open,
+                "render_breaker_open": s.render.is_open,
+            }
+            for host, s in hosts.items()
+        }
+
+
+scheduler = DomainScheduler()
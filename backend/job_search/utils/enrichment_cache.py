@@ -0,0 +1,76 @@
+import os
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .response_cache import SQLiteCache
+
+
+# ======== CONFIG ========
+
+ENRICHMENT_CACHE_PATH = os.getenv("ENRICHMENT_CACHE_PATH", "enrichment_cache.sqlite3")
+# Found values rarely change; misses are retried sooner in case the page was blocked
+POSITIVE_TTL = int(os.getenv("ENRICHMENT_TTL_POSITIVE", str(30 * 24 * 3600)))
+NEGATIVE_TTL = int(os.getenv("ENRICHMENT_TTL_NEGATIVE", str(24 * 3600)))
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "ref", "refid", "src", "source", "trk", "from"}
+
+_store: SQLiteCache | None = None
+
+
+def _get_store() -> SQLiteCache:
+    # Opened on first use, so a connection is never inherited across fork()
+    global _store
+    if _store is None:
+        _store = SQLiteCache(ENRICHMENT_CACHE_PATH, max_entries=500_000, max_bytes=512 * 1024 * 1024)
+    return _store
+
+
+# ======== KEYS ========
+
+def canonicalize_url(url: str) -> str:
+    """Lowercase scheme/host, drop fragments and tracking params, sort the query."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def _keys(field: str, job: dict) -> list[str]:
+    keys = []
+    url = canonicalize_url(job.get("job_apply_link") or "")
+    if url:
+        keys.append(f"{field}|url|{url}")
+    if job.get("job_id"):
+        keys.append(f"{field}|job|{job['job_id']}")
+    return keys
+
+
+# ======== PUBLIC API ========
+
+def get_enrichment(field: str, job: dict) -> dict | None:
+    """
+    Cached enrichment result for `field` ("salary" or "date"), looked up by
+    canonical apply URL then job_id. Returns None on a miss; a hit may be a
+    cached negative ({"found": False, ...}).
+    """
+    for key in _keys(field, job):
+        hit = _get_store().get(key)
+        if hit is not None:
+            return hit
+    return None
+
+
+def put_enrichment(field: str, job: dict, value: dict):
+    """Store an extraction result; `value["found"]` selects the positive or negative TTL."""
+    ttl = POSITIVE_TTL if value.get("found") else NEGATIVE_TTL
+    for key in _keys(field, job):
+        _get_store().set(key, value, ttl)
+
+
+def enrichment_cache_stats() -> dict:
+    return _get_store().stats()
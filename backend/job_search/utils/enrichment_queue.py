@@ -0,0 +1,165 @@
+"""
+Durable SQLite-backed queue of salary/date scraping tasks.
+
+The web process only enqueues; job_search.enrichment_worker processes
+claim tasks, scrape, and write into the enrichment cache that later
+searches read. One task per canonical apply URL, so the same posting
+seen by many searches is scraped once.
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import sqlite3
+import threading
+
+from .enrichment_cache import canonicalize_url
+
+
+# ======== CONFIG ========
+
+ENRICHMENT_QUEUE_PATH = os.getenv("ENRICHMENT_QUEUE_PATH", "enrichment_queue.sqlite3")
+MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "4"))
+RETRY_BASE_DELAY = float(os.getenv("ENRICHMENT_RETRY_BASE", "30"))
+# A claimed task whose worker died is handed out again after this many seconds
+LEASE_SECONDS = float(os.getenv("ENRICHMENT_LEASE_SECONDS", "120"))
+
+# Only what process_job reads travels through the queue
+TASK_FIELDS = (
+    "job_id", "job_apply_link", "job_description", "job_min_salary",
+    "job_max_salary", "job_salary_period", "job_posted_at_datetime_utc",
+)
+
+
+class EnrichmentQueue:
+    def __init__(self, path: str = ENRICHMENT_QUEUE_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                url_key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_run_at REAL NOT NULL,
+                locked_until REAL NOT NULL DEFAULT 0,
+                lease TEXT,
+                last_error TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "lease" not in columns:  # queue files from before lease tokens
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN lease TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_ready ON tasks(status, next_run_at)")
+
+    def enqueue(self, job: dict) -> bool:
+        """
+        Queue one job for scraping. Returns False when its URL is already
+        queued or in progress. Finished tasks are re-queued, since a caller
+        only enqueues after missing the enrichment cache.
+        """
+        url_key = canonicalize_url(job.get("job_apply_link") or "")
+        if not url_key:
+            return False
+        payload = json.dumps({k: job.get(k) for k in TASK_FIELDS})
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                """
+                INSERT INTO tasks (url_key, payload, next_run_at, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(url_key) DO UPDATE SET
+                    payload = excluded.payload, status = 'pending', attempts = 0,
+                    next_run_at = excluded.next_run_at, updated_at = excluded.updated_at
+                WHERE tasks.status IN ('done', 'failed')
+                """,
+                (url_key, payload, now, now),
+            )
+            return cur.rowcount > 0
+
+    def claim(self) -> tuple[str, str, dict] | None:
+        """
+        Lease the next ready task (or one whose lease expired). Returns
+        (url_key, lease, job); complete()/fail() only take effect with the
+        current lease, so a worker that outlived its lease can't overwrite
+        the result of the worker the task was handed to next.
+        """
+        now = time.time()
+        lease = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    """
+                    SELECT url_key, payload FROM tasks
+                    WHERE (status = 'pending' AND next_run_at <= ?)
+                       OR (status = 'running' AND locked_until < ?)
+                    ORDER BY next_run_at LIMIT 1
+                    """,
+                    (now, now),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'running', locked_until = ?, lease = ?, updated_at = ? "
+                        "WHERE url_key = ?",
+                        (now + LEASE_SECONDS, lease, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return (row[0], lease, json.loads(row[1])) if row else None
+
+    def complete(self, url_key: str, lease: str) -> bool:
+        """Mark a leased task done; False if the lease was lost (expired and re-claimed)."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE tasks SET status = 'done', last_error = NULL, lease = NULL, updated_at = ? "
+                "WHERE url_key = ? AND status = 'running' AND lease = ?",
+                (time.time(), url_key, lease),
+            )
+            return cur.rowcount > 0
+
+    def fail(self, url_key: str, lease: str, error: str) -> bool:
+        """
+        Retry with jittered exponential backoff, or give up after MAX_ATTEMPTS.
+        False if the lease was lost.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts FROM tasks WHERE url_key = ? AND status = 'running' AND lease = ?",
+                (url_key, lease),
+            ).fetchone()
+            if row is None:
+                return False
+            attempts = row[0] + 1
+            delay = RETRY_BASE_DELAY * (2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+            status = "failed" if attempts >= MAX_ATTEMPTS else "pending"
+            self._conn.execute(
+                "UPDATE tasks SET status = ?, attempts = ?, next_run_at = ?, last_error = ?, lease = NULL, "
+                "updated_at = ? WHERE url_key = ? AND lease = ?",
+                (status, attempts, now + delay, error[:500], now, url_key, lease),
+            )
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return dict(rows)
+
+
+_queue: EnrichmentQueue | None = None
+
+
+def get_enrichment_queue() -> EnrichmentQueue:
+    global _queue
+    if _queue is None:
+        _queue = EnrichmentQueue()
+    return _queue
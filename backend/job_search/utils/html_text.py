@@ -0,0 +1,182 @@
+"""
+HTML -> visible text for the enrichment extractors.
+
+The streaming backends feed the page to a tokenizer in chunks and never
+build a tree: "lxml" (libxml2's parser with a SAX-style target; the default
+when lxml is installed) or "stream" (the stdlib HTMLParser). Both drop
+script/style content, cap how much HTML is read, and can stop early once
+the caller has seen what it needs. "bs4" is the original BeautifulSoup path
+and the fallback when a streaming backend fails.
+
+Every backend returns the same shape as
+BeautifulSoup.get_text(separator="\n", strip=True): one stripped, non-empty
+text node per line.
+"""
+
+import os
+from html.parser import HTMLParser
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # optional dependency
+    etree = None
+
+
+# ======== CONFIG ========
+
+HTML_TEXT_BACKEND = os.getenv("HTML_TEXT_BACKEND", "lxml" if etree is not None else "stream")
+# Characters of HTML read per page; the rest (footers, inline JSON blobs) is ignored
+HTML_MAX_CHARS = int(os.getenv("HTML_MAX_CHARS", str(2 * 1024 * 1024)))
+CHUNK_CHARS = 64 * 1024
+
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+
+# Receives the text added since the last call (plus a little overlap) and
+# returns True once nothing further in the page is needed
+StopFn = Callable[[str], bool]
+
+
+# ======== STREAMING BACKENDS ========
+
+class _TextCollector(HTMLParser):
+    """
+    stdlib tokenizer. A text node cut by a chunk edge arrives in several
+    handle_data calls, so pieces are buffered until the next tag/comment.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: list[str] = []
+        self._buf: list[str] = []
+        self._skip_depth = 0
+
+    def _flush(self):
+        if self._buf:
+            data = "".join(self._buf).strip()
+            self._buf = []
+            if data:
+                self.lines.append(data)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._buf.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+class _LxmlTarget:
+    """
+    Parser target for lxml's feed parser. libxml2 may split one text node over
+    several data() calls, so pieces are buffered until the next tag/comment.
+    """
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self._buf: list[str] = []
+        self._skip_depth = 0
+
+    def _flush(self):
+        if self._buf:
+            data = "".join(self._buf).strip()
+            self._buf = []
+            if data:
+                self.lines.append(data)
+
+    def start(self, tag, attrib):
+        self._flush()
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def end(self, tag):
+        self._flush()
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def data(self, data):
+        if not self._skip_depth:
+            self._buf.append(data)
+
+    def comment(self, text):
+        self._flush()
+
+    def close(self):
+        self._flush()
+
+
+class _LxmlFeeder:
+    """Adapts lxml's feed parser to the feed()/close()/lines shape of _TextCollector."""
+
+    def __init__(self):
+        self.target = _LxmlTarget()
+        self.parser = etree.HTMLParser(target=self.target)
+        self.lines = self.target.lines
+
+    def feed(self, chunk: str):
+        self.parser.feed(chunk)
+
+    def close(self):
+        self.parser.close()
+
+
+def _stream_text(html: str, stop_when: StopFn | None, collector) -> str:
+    checked = 0
+    for pos in range(0, len(html), CHUNK_CHARS):
+        collector.feed(html[pos:pos + CHUNK_CHARS])
+        lines = collector.lines
+        if stop_when is not None and len(lines) > checked:
+            # Re-send two lines of overlap so matches spanning a chunk edge are seen
+            start = max(0, checked - 2)
+            checked = len(lines)
+            if stop_when("\n".join(lines[start:])):
+                return "\n".join(lines)
+    collector.close()
+    return "\n".join(collector.lines)
+
+
+# ======== FALLBACK BACKEND ========
+
+def _bs4_text(html: str) -> str:
+    return BeautifulSoup(html, "html.parser").get_text(separator="\n", strip=True)
+
+
+# ======== PUBLIC API ========
+
+def html_to_text(html: str, stop_when: StopFn | None = None,
+                 backend: str | None = None, max_chars: int = HTML_MAX_CHARS) -> str:
+    """
+    Visible text of `html`, one text node per line.
+
+    `stop_when` (streaming backends) is called after each parsed chunk with
+    the new text; returning True ends parsing early.
+    """
+    if not html:
+        return ""
+    html = html[:max_chars]
+    backend = backend or HTML_TEXT_BACKEND
+
+    try:
+        if backend == "lxml" and etree is not None:
+            return _stream_text(html, stop_when, _LxmlFeeder())
+        if backend in ("stream", "lxml"):
+            return _stream_text(html, stop_when, _TextCollector())
+    except Exception as e:
+        print(f"⚠️ {backend} text extraction failed ({e}); falling back to BeautifulSoup")
+    return _bs4_text(html)
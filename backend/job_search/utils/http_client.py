@@ -0,0 +1,64 @@
+import os
+import contextvars
+from contextlib import asynccontextmanager
+
+import httpx
+
+# ======== SHARED ASYNC CLIENT ========
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+
+_client: httpx.AsyncClient | None = None
+# Set inside private_async_client(): code on that loop uses it instead of _client
+_scoped_client: contextvars.ContextVar[httpx.AsyncClient | None] = contextvars.ContextVar(
+    "scoped_http_client", default=None)
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        ),
+        timeout=httpx.Timeout(12.0, connect=5.0),
+    )
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Process-wide httpx client so every async fetch reuses pooled, kept-alive
+    connections instead of opening a new TCP/TLS session per request.
+    """
+    scoped = _scoped_client.get()
+    if scoped is not None:
+        return scoped
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _new_client()
+    return _client
+
+
+@asynccontextmanager
+async def private_async_client():
+    """
+    A client of its own for a short-lived event loop (asyncio.run on a
+    worker thread): get_async_client() returns it within the block, and it
+    is closed on exit. The process-wide client, bound to the server's loop,
+    is never touched.
+    """
+    client = _new_client()
+    token = _scoped_client.set(client)
+    try:
+        yield client
+    finally:
+        _scoped_client.reset(token)
+        await client.aclose()
+
+
+async def close_async_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
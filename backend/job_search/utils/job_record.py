@@ -0,0 +1,218 @@
+"""
+Compact job representation for the search pipeline.
+
+Raw source dicts (JSearch returns ~50 keys per posting, most unused) are
+converted once, on arrival, into JobRecords: __slots__ objects holding only
+the fields the pipeline and the UI use. Descriptions, by far the largest
+field, live in a DescriptionStore shared by one result set and are
+referenced by id, so cross-posted duplicates keep a single copy.
+
+The pipeline sets fields as attributes; plain dicts arriving from elsewhere
+(e.g. enrichment-queue payloads) are converted with as_record() first.
+Read-only dict access (get, [], `in`) is kept for code that accepts either
+shape; a slot holding None counts as missing for get(), like an absent key.
+
+`posted_ts` (epoch seconds) is derived once from the posting date fields
+and kept current by set_posted_at(), so date filters and recency sorts
+compare integers instead of re-parsing strings. It and `cluster_id` are
+internal: to_dict() leaves them out of API payloads.
+"""
+
+import time
+import hashlib
+from datetime import datetime, timezone
+from typing import Iterable
+
+from .date_extractor import scan_text
+
+
+# ======== FIELDS ========
+
+# JSearch field names; generic sources' title/company/description are mapped onto them
+RECORD_FIELDS = (
+    "job_id", "job_title", "employer_name", "employer_logo", "job_publisher",
+    "job_apply_link", "job_employment_type", "job_is_remote",
+    "job_city", "job_state", "job_country", "location",
+    "job_min_salary", "job_max_salary", "job_salary_period",
+    "job_posted_at_datetime_utc", "posted",
+    "cluster_id", "pay_score", "pay_percentile",
+    "posted_ts",  # derived, see posted_epoch()
+)
+_GENERIC_NAMES = {"title": "job_title", "company": "employer_name", "description": "job_description"}
+_FIELD_SET = frozenset(RECORD_FIELDS)
+_DATE_FIELDS = frozenset(("job_posted_at_datetime_utc", "posted"))
+# Pipeline bookkeeping, never sent to clients
+INTERNAL_FIELDS = frozenset(("posted_ts", "cluster_id"))
+
+
+def posted_epoch(iso: str | None, posted: str | None = None, timestamp=None,
+                 now: float | None = None) -> int | None:
+    """
+    Posting time as epoch seconds, from (in order) an ISO 8601 datetime,
+    JSearch's job_posted_at_timestamp, or free text like "3 days ago"
+    (relative to `now`). None when nothing parses.
+    """
+    if iso:
+        try:
+            dt = datetime.fromisoformat(str(iso).replace("Z", "+00:00"))
+            return int((dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp())
+        except ValueError:
+            pass
+    if timestamp:
+        try:
+            return int(timestamp)
+        except (TypeError, ValueError):
+            pass
+    if posted:
+        ref = datetime.fromtimestamp(now if now is not None else time.time(), timezone.utc)
+        info = scan_text(str(posted), ref)
+        if info:
+            return int(datetime.fromisoformat(info.posted_at.replace("Z", "+00:00")).timestamp())
+    return None
+
+
+class DescriptionStore:
+    """Job descriptions of one result set, stored once per distinct text."""
+
+    __slots__ = ("_texts",)
+
+    def __init__(self):
+        self._texts: dict[str, str] = {}
+
+    def put(self, text: str | None) -> str | None:
+        if not text:
+            return None
+        desc_id = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).hexdigest()
+        self._texts.setdefault(desc_id, text)
+        return desc_id
+
+    def get(self, desc_id: str | None) -> str | None:
+        return self._texts.get(desc_id) if desc_id else None
+
+    def __len__(self):
+        return len(self._texts)
+
+
+class JobRecord:
+    __slots__ = RECORD_FIELDS + ("description_id", "_store", "_extra")
+
+    def __init__(self, store: DescriptionStore):
+        for name in RECORD_FIELDS:
+            setattr(self, name, None)
+        self.description_id = None
+        self._store = store
+        self._extra: dict | None = None
+
+    @classmethod
+    def from_raw(cls, raw: dict, store: DescriptionStore) -> "JobRecord":
+        """Keep the pipeline's fields of a source dict; everything else is dropped."""
+        record = cls(store)
+        for key, value in raw.items():
+            key = _GENERIC_NAMES.get(key, key)
+            if key in _FIELD_SET:
+                if getattr(record, key) is None:
+                    setattr(record, key, value)
+            elif key == "job_description":
+                record.description_id = record.description_id or store.put(value)
+        # A timestamp from the source, or one derived earlier (e.g. a search-index
+        # payload), beats re-parsing relative text like "3 days ago" against today
+        record.posted_ts = posted_epoch(record.job_posted_at_datetime_utc, record.posted,
+                                        raw.get("job_posted_at_timestamp") or raw.get("posted_ts"))
+        return record
+
+    def set_posted_at(self, iso: str | None):
+        """
+        Assign the posting datetime and re-derive posted_ts from it. Without a
+        usable datetime the existing posted_ts stands: relative text like
+        "3 days ago" is only parsed when there's nothing else, so it can't
+        drift with each later call.
+        """
+        self.job_posted_at_datetime_utc = iso
+        self.posted_ts = posted_epoch(iso) or self.posted_ts or posted_epoch(None, self.posted)
+
+    # ---- dict-style access ----
+
+    def __getitem__(self, key):
+        key = _GENERIC_NAMES.get(key, key)
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if key == "job_description":
+            return self._store.get(self.description_id)
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        key = _GENERIC_NAMES.get(key, key)
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+            if key == "posted":
+                self.posted_ts = posted_epoch(self.job_posted_at_datetime_utc, value) or self.posted_ts
+            elif key in _DATE_FIELDS:
+                self.set_posted_at(value)
+        elif key == "job_description":
+            self.description_id = self._store.put(value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    # ---- output ----
+
+    def to_dict(self, fields: Iterable[str] | None = None) -> dict:
+        """
+        Plain dict of the set public fields (plus job_description); `fields`
+        projects to those columns. INTERNAL_FIELDS are never included.
+        """
+        if fields is not None:
+            return {f: self.get(f) for f in fields if f not in INTERNAL_FIELDS}
+        out = {
+            name: getattr(self, name) for name in RECORD_FIELDS
+            if name not in INTERNAL_FIELDS and getattr(self, name) is not None
+        }
+        if self.description_id:
+            out["job_description"] = self._store.get(self.description_id)
+        if self._extra:
+            out.update(self._extra)
+        return out
+
+    def __repr__(self):
+        return f"JobRecord({self.job_id!r}, {self.job_title!r})"
+
+
+def as_record(job, store: DescriptionStore | None = None) -> JobRecord:
+    """`job` itself if it's a JobRecord, else a new record built from the dict."""
+    if isinstance(job, JobRecord):
+        return job
+    return JobRecord.from_raw(job, store or DescriptionStore())
+
+
+def to_plain(job, fields: Iterable[str] | None = None) -> dict:
+    """to_dict for records, projection for plain dicts (e.g. jobs from the enrichment queue)."""
+    if isinstance(job, JobRecord):
+        return job.to_dict(fields)
+    return {f: job.get(f) for f in fields} if fields is not None else job
+
+
+def posted_timestamp(job) -> int | None:
+    """`posted_ts` of a record; parsed on the fly for plain dicts."""
+    if isinstance(job, JobRecord):
+        return job.posted_ts
+    return job.get("posted_ts") or posted_epoch(job.get("job_posted_at_datetime_utc"), job.get("posted"),
+                                                job.get("job_posted_at_timestamp"))
+
+
+def parse_fields(fields: str | None) -> list[str] | None:
+    """"job_title,pay_score" -> ["job_title", "pay_score"]; empty -> None (all fields)."""
+    names = [f.strip() for f in (fields or "").split(",") if f.strip()]
+    return names or None
@@ -1,48 +1,74 @@
-# file: backend/job_search/utils/merger.py
 from typing import List, Dict, Any
 
+from .dedup import assign_clusters
+from .job_record import JobRecord, DescriptionStore, posted_timestamp
 
-def merge_all_results(list_of_job_lists: List[List[Dict[str, Any]]]) -> list[dict]:
+
+def _job_key(job: dict) -> tuple | None:
+    """
+    Identity used for deduplication: the source's job_id when present,
+    otherwise (title, company). Accepts both generic (title/company) and
+    JSearch (job_title/employer_name) field names.
+    """
+    if job.get("job_id"):
+        return ("id", str(job["job_id"]))
+    title = str(job.get("title") or job.get("job_title") or "").strip().lower()
+    company = str(job.get("company") or job.get("employer_name") or "").strip().lower()
+    if not title or not company:
+        return None  # skip incomplete entries
+    return (title, company)
+
+
+def sort_key(job) -> float:
+    """
+    Recency key from the precomputed posting timestamp (smaller = more
+    recent); jobs without a date sort last.
+    """
+    ts = posted_timestamp(job)
+    return -ts if ts is not None else float("inf")
+
+
+class ResultMerger:
+    """
+    Incremental version of merge_all_results: feed each source's batch to
+    `add()` as soon as it arrives, then read the merged list with `results()`.
+    New jobs are kept as compact JobRecords sharing one DescriptionStore.
+    """
+
+    def __init__(self):
+        self.merged: list[JobRecord] = []
+        self.seen: set[tuple] = set()
+        self.descriptions = DescriptionStore()
+
+    def add(self, jobs: List[Dict[str, Any]]) -> list[JobRecord]:
+        """Merge one batch; returns the jobs that were new."""
+        added = []
+        for job in jobs or []:
+            key = _job_key(job)
+            if key is None or key in self.seen:
+                continue
+            self.seen.add(key)
+            record = JobRecord.from_raw(job, self.descriptions)
+            self.merged.append(record)
+            added.append(record)
+        return added
+
+    def results(self) -> list[JobRecord]:
+        """Merged jobs, newest first, each tagged with a near-duplicate `cluster_id`."""
+        # Sort ascending: newer (larger timestamp) first
+        return assign_clusters(sorted(self.merged, key=sort_key))
+
+
+def merge_all_results(list_of_job_lists: List[List[Dict[str, Any]]]) -> list[JobRecord]:
     """
     Combine and deduplicate job results from multiple APIs or sources.
 
-    - Deduplicates by (title, company)
+    - Deduplicates by job_id, else (title, company)
+    - Tags near-duplicates (reposts, cross-site copies) with a shared `cluster_id`
     - Returns a single merged list
-    - Sorted by recency if 'posted' text (e.g., "3 days ago") is available
+    - Sorted by recency (posting timestamp, or 'posted' text like "3 days ago")
     """
-    merged: list[dict] = []
-    seen: set[tuple[str, str]] = set()
-
+    merger = ResultMerger()
     for sublist in list_of_job_lists or []:
-        for job in sublist or []:
-            title = str(job.get("title", "")).strip().lower()
-            company = str(job.get("company", "")).strip().lower()
-            key = (title, company)
-            if not title or not company:
-                continue  # skip incomplete entries
-            if key not in seen:
-                seen.add(key)
-                merged.append(job)
-
-    def sort_key(job: dict) -> int:
-        """
-        Attempt to convert human-readable 'posted' field (e.g. '3 days ago')
-        into a numeric age (smaller = more recent).
-        """
-        posted = str(job.get("posted", "")).lower()
-        try:
-            num = int(posted.split()[0])
-        except (ValueError, IndexError):
-            return 999
-
-        if "day" in posted:
-            return num
-        elif "week" in posted:
-            return num * 7
-        elif "month" in posted:
-            return num * 30
-        return 999
-
-    # Sort ascending: newer (smaller day count) first
-    merged.sort(key=sort_key)
-    return merged
+        merger.add(sublist)
+    return merger.results()
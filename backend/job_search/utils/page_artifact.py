@@ -0,0 +1,232 @@
+import time
+import asyncio
+import requests
+from urllib.parse import urlparse
+
+from typing import Callable
+
+from .html_text import html_to_text, StopFn
+from .domain_scheduler import scheduler, Deadline
+from .page_fetcher import get_rendered_html, get_rendered_html_async
+from .http_client import get_async_client
+
+
+# ======== CONSTANTS ========
+
+FETCH_TIMEOUT = 12      # seconds, plain GET
+RENDER_TIMEOUT = 20     # seconds, browser navigation
+
+REQUEST_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.8",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+# Keywords that indicate we hit a CAPTCHA, bot-check, or blank stub page
+BLOCK_PHRASES = [
+    "enable javascript", "please verify you are a human", "robot check",
+    "access denied", "forbidden", "sorry, we just need to make sure",
+    "/captcha", "unusual traffic", "are you a robot",
+]
+
+
+# ======== HELPERS ========
+
+def looks_blocked(html: str) -> bool:
+    if not html:
+        return True
+    l = html.lower()
+    # small pages or containing bot-check language
+    return any(phrase in l for phrase in BLOCK_PHRASES) or len(l) < 800
+
+
+# ======== PAGE ARTIFACT ========
+
+class PageArtifact:
+    """
+    One job's apply-link page, fetched at most once over HTTP and rendered at
+    most once in the browser pool, so every extractor reads the same copy.
+
+    Nothing is downloaded until an extractor calls `fetch()` or `render()`.
+    `html`/`text` always hold the best version seen so far and `blocked`
+    tells whether that version looks like a bot-check page. `text` is parsed
+    from `html` on first access, so extractors that can answer from the raw
+    markup (e.g. JSON-LD dates) never pay for it.
+
+    `stop_factory` builds a fresh html_to_text `stop_when` callback for each
+    parse (plain and rendered), so text extraction can stop as soon as the
+    extractors' evidence has been seen.
+
+    Every GET/render asks the domain scheduler first (it may skip the GET or
+    both for a misbehaving host) and is bounded by the job's `deadline`.
+    """
+
+    def __init__(self, url: str | None, stop_factory: Callable[[], StopFn] | None = None,
+                 deadline: Deadline | None = None):
+        self.url = url or ""
+        self.stop_factory = stop_factory
+        self.deadline = deadline or Deadline()
+        self.host = urlparse(self.url).hostname or ""
+        self.html: str | None = None
+        self.blocked = True
+        self.fetched = False
+        self.rendered = False
+        self._text: str | None = None
+        self._parsed = True
+
+    def _set_html(self, html: str):
+        self.html = html
+        self.blocked = looks_blocked(html)
+        self._text = None
+        self._parsed = False
+
+    def _parse(self):
+        if self._parsed:
+            return
+        self._parsed = True
+        try:
+            stop_when = self.stop_factory() if self.stop_factory else None
+            self._text = html_to_text(self.html, stop_when)
+        except Exception:
+            self._text = None
+
+    @property
+    def text(self) -> str | None:
+        """Visible text of `html`, parsed on first access."""
+        self._parse()
+        return self._text
+
+    async def text_async(self) -> str | None:
+        """`text` with the parse (CPU-bound) kept off the event loop."""
+        if not self._parsed:
+            await asyncio.to_thread(self._parse)
+        return self._text
+
+    # Timeouts are computed after the domain slot is acquired, so time spent
+    # queueing for the host counts against the job's deadline; scheduler.begin()
+    # then claims the request (a half-open breaker lets only one through)
+
+    def _fetch_timeout(self) -> float | None:
+        if scheduler.plan(self.host) != "fetch":
+            return None
+        return self.deadline.timeout(FETCH_TIMEOUT)
+
+    def _render_timeout(self) -> int | None:
+        if scheduler.plan(self.host) == "skip" or not scheduler.can_render(self.host):
+            return None
+        timeout = self.deadline.timeout(RENDER_TIMEOUT)
+        return int(timeout * 1000) if timeout else None
+
+    def _record(self, kind: str, html: str | None, started: float):
+        blocked = looks_blocked(html) if html else False
+        scheduler.record(self.host, kind, ok=bool(html) and not blocked,
+                         blocked=blocked, latency=time.monotonic() - started)
+
+    def _accept_render(self, html: str | None) -> bool:
+        # Keep a usable plain-HTTP copy over a rendered bot-check page
+        return bool(html) and (not looks_blocked(html) or self.blocked)
+
+    def fetch(self) -> "PageArtifact":
+        """Plain HTTP GET of the page (first call only; skipped for render-first hosts)."""
+        if self.fetched or not self.url:
+            return self
+        self.fetched = True
+        if self._fetch_timeout() is None:
+            return self
+
+        html = None
+        with scheduler.slot(self.host, self.deadline) as acquired:
+            timeout = self._fetch_timeout() if acquired else None
+            if timeout is None or not scheduler.begin(self.host, "fetch"):
+                return self
+            started = time.monotonic()
+            try:
+                res = requests.get(self.url, timeout=timeout, headers=REQUEST_HEADERS)
+                if res.status_code == 200:
+                    html = res.text
+            except Exception:
+                pass
+        self._record("fetch", html, started)
+        if html:
+            self._set_html(html)
+        return self
+
+    def render(self) -> "PageArtifact":
+        """Browser-rendered copy of the page (first call only)."""
+        if self.rendered or not self.url:
+            return self
+        self.rendered = True
+        if self._render_timeout() is None:
+            return self
+
+        with scheduler.slot(self.host, self.deadline) as acquired:
+            timeout = self._render_timeout() if acquired else None
+            if timeout is None or not scheduler.begin(self.host, "render"):
+                return self
+            started = time.monotonic()
+            html = get_rendered_html(self.url, timeout=timeout)
+        self._record("render", html, started)
+        if self._accept_render(html):
+            self._set_html(html)
+        return self
+
+    async def fetch_async(self) -> "PageArtifact":
+        """Async `fetch()` over the shared httpx client."""
+        if self.fetched or not self.url:
+            return self
+        self.fetched = True
+        if self._fetch_timeout() is None:
+            return self
+
+        html = None
+        async with scheduler.async_slot(self.host, self.deadline) as acquired:
+            timeout = self._fetch_timeout() if acquired else None
+            if timeout is None or not scheduler.begin(self.host, "fetch"):
+                return self
+            started = time.monotonic()
+            try:
+                res = await get_async_client().get(self.url, headers=REQUEST_HEADERS, timeout=timeout)
+                if res.status_code == 200:
+                    html = res.text
+            except Exception:
+                pass
+        self._record("fetch", html, started)
+        if html:
+            self._set_html(html)
+        return self
+
+    async def render_async(self) -> "PageArtifact":
+        """Async `render()` over the shared async browser pool."""
+        if self.rendered or not self.url:
+            return self
+        self.rendered = True
+        if self._render_timeout() is None:
+            return self
+
+        async with scheduler.async_slot(self.host, self.deadline) as acquired:
+            timeout = self._render_timeout() if acquired else None
+            if timeout is None or not scheduler.begin(self.host, "render"):
+                return self
+            started = time.monotonic()
+            html = await get_rendered_html_async(self.url, timeout=timeout)
+        self._record("render", html, started)
+        if self._accept_render(html):
+            self._set_html(html)
+        return self
+
+    @property
+    def visible_text(self) -> str | None:
+        """Extracted text, or None when the page is missing or blocked."""
+        if self.blocked:
+            return None
+        return self.text
+
+    async def visible_text_async(self) -> str | None:
+        """Async `visible_text`."""
+        if self.blocked:
+            return None
+        return await self.text_async()
@@ -1,17 +1,269 @@
+import os
+import queue
+import atexit
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
 from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 
-def get_rendered_html(url, timeout=20000):
-    """Fetch a webpage with JavaScript rendering using headless Chromium."""
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, timeout=timeout, wait_until="networkidle")
+
+# ======== POOL CONFIG ========
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+# Restart a browser after this many rendered pages to cap memory creep
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "50"))
+# Hard ceiling for a single render, including time spent waiting in the queue (seconds)
+RENDER_DEADLINE = float(os.getenv("RENDER_DEADLINE", "35"))
+
+
+# ======== BROWSER WORKERS ========
+
+class _BrowserWorker(threading.Thread):
+    """
+    Owns one warm Chromium process. Playwright's sync API is bound to the thread
+    that started it, so each browser lives on its own thread and pulls render
+    tasks off the pool's shared queue.
+    """
+
+    def __init__(self, tasks: queue.Queue, max_pages: int):
+        super().__init__(daemon=True)
+        self.tasks = tasks
+        self.max_pages = max_pages
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._pages_served = 0
+
+    def _start_browser(self):
+        if self._pw is None:
+            self._pw = sync_playwright().start()
+        self._browser = self._pw.chromium.launch(headless=True)
+        self._context = self._browser.new_context()
+        self._page = self._context.new_page()
+        self._pages_served = 0
+
+    def _close_browser(self):
+        try:
+            if self._browser is not None:
+                self._browser.close()
+        except Exception:
+            pass
+        self._browser = self._context = self._page = None
+
+    def _reset_page(self):
+        """Swap in a fresh page after a failed render; restart the browser if that fails too."""
+        try:
+            self._page.close()
+            self._page = self._context.new_page()
+        except Exception:
+            self._close_browser()
+
+    def _render(self, url: str, timeout: int) -> str:
+        if self._browser is None or self._pages_served >= self.max_pages:
+            self._close_browser()
+            self._start_browser()
+
+        self._pages_served += 1
+        self._page.goto(url, timeout=timeout, wait_until="networkidle")
+        # Give dynamic sites a tiny extra settle time
+        self._page.wait_for_timeout(500)
+        html = self._page.content()
+        # Drop the previous document so the reused page doesn't keep it alive
+        self._page.goto("about:blank")
+        return html
+
+    def run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                break
+            future, url, timeout = task
+            # Skip renders whose caller already gave up
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._render(url, timeout))
+            except Exception as e:
+                self._reset_page()
+                future.set_exception(e)
+
+        self._close_browser()
+        if self._pw is not None:
+            self._pw.stop()
+
+
+class BrowserPool:
+    """
+    Fixed set of long-lived headless browsers shared by every request.
+
+    - At most `size` renders run at once; the rest wait in a FIFO queue
+    - Each browser is recycled after `max_pages` renders
+    - `render()` gives up after `deadline` seconds and cancels the task if it
+      has not started yet
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_pages: int = BROWSER_MAX_PAGES):
+        self.tasks: queue.Queue = queue.Queue()
+        self.workers = [_BrowserWorker(self.tasks, max_pages) for _ in range(max(1, size))]
+        for w in self.workers:
+            w.start()
+
+    def submit(self, url: str, timeout: int = 20000) -> Future:
+        future: Future = Future()
+        self.tasks.put((future, url, timeout))
+        return future
+
+    def render(self, url: str, timeout: int = 20000, deadline: float = RENDER_DEADLINE) -> str | None:
+        future = self.submit(url, timeout)
+        try:
+            return future.result(timeout=deadline)
+        except FutureTimeout:
+            future.cancel()
+            raise TimeoutError(f"render exceeded {deadline}s deadline")
+
+    def shutdown(self):
+        for _ in self.workers:
+            self.tasks.put(None)
+        for w in self.workers:
+            w.join(timeout=10)
+
+
+_pool: BrowserPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+# ======== ASYNC POOL ========
+
+class _AsyncBrowserSlot:
+    """One warm Chromium with a reusable context/page, owned by the async pool."""
+
+    def __init__(self, pw, max_pages: int):
+        self.pw = pw
+        self.max_pages = max_pages
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.pages_served = 0
+
+    async def close(self):
+        try:
+            if self.browser is not None:
+                await self.browser.close()
+        except Exception:
+            pass
+        self.browser = self.context = self.page = None
+
+    async def render(self, url: str, timeout: int) -> str:
+        if self.browser is None or self.pages_served >= self.max_pages:
+            await self.close()
+            self.browser = await self.pw.chromium.launch(headless=True)
+            self.context = await self.browser.new_context()
+            self.page = await self.context.new_page()
+            self.pages_served = 0
+
+        self.pages_served += 1
+        try:
+            await self.page.goto(url, timeout=timeout, wait_until="networkidle")
             # Give dynamic sites a tiny extra settle time
-            page.wait_for_timeout(500)
-            html = page.content()
-            browser.close()
+            await self.page.wait_for_timeout(500)
+            html = await self.page.content()
+            await self.page.goto("about:blank")
             return html
+        except BaseException:
+            # Failed or cancelled mid-navigation: don't hand a dirty page to the next caller
+            await self.close()
+            raise
+
+
+class AsyncBrowserPool:
+    """
+    asyncio counterpart of BrowserPool for the async pipeline. Browsers are
+    launched lazily on the event loop that first uses the pool; a render waits
+    for a free slot, so at most `size` renders run at once.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_pages: int = BROWSER_MAX_PAGES):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self._pw = None
+        self._slots: asyncio.Queue | None = None
+        self._start_lock = asyncio.Lock()
+
+    async def _ensure_started(self):
+        async with self._start_lock:
+            if self._slots is None:
+                self._pw = await async_playwright().start()
+                self._slots = asyncio.Queue()
+                for _ in range(self.size):
+                    self._slots.put_nowait(_AsyncBrowserSlot(self._pw, self.max_pages))
+
+    async def _render(self, url: str, timeout: int) -> str:
+        await self._ensure_started()
+        slot = await self._slots.get()
+        try:
+            return await slot.render(url, timeout)
+        finally:
+            self._slots.put_nowait(slot)
+
+    async def render(self, url: str, timeout: int = 20000, deadline: float = RENDER_DEADLINE) -> str:
+        # wait_for cancels the render (queued or running) once the deadline passes
+        return await asyncio.wait_for(self._render(url, timeout), deadline)
+
+    async def shutdown(self):
+        if self._slots is None:
+            return
+        while not self._slots.empty():
+            await self._slots.get_nowait().close()
+        await self._pw.stop()
+        self._slots = None
+
+
+_async_pool: AsyncBrowserPool | None = None
+
+
+def get_async_browser_pool() -> AsyncBrowserPool:
+    """Return the async browser pool for the running event loop's process."""
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = AsyncBrowserPool()
+    return _async_pool
+
+
+async def close_async_browser_pool():
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.shutdown()
+        _async_pool = None
+
+
+# ======== PUBLIC API ========
+
+def get_rendered_html(url, timeout=20000):
+    """Fetch a webpage with JavaScript rendering using the shared headless Chromium pool."""
+    try:
+        return get_browser_pool().render(url, timeout=timeout)
+    except Exception as e:
+        print(f"⚠️ Render error for {url}: {e}")
+        return None
+
+
+async def get_rendered_html_async(url, timeout=20000):
+    """Async version of get_rendered_html backed by the shared AsyncBrowserPool."""
+    try:
+        return await get_async_browser_pool().render(url, timeout=timeout)
     except Exception as e:
         print(f"⚠️ Render error for {url}: {e}")
         return None
@@ -0,0 +1,203 @@
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+# ======== IN-PROCESS BACKEND ========
+
+class LRUCache:
+    """
+    Thread-safe in-memory cache with per-entry TTL and LRU eviction by both
+    entry count and total bytes.
+
+    Values are stored JSON-encoded: that gives an honest byte size and means
+    callers that mutate a returned value (the pipeline edits jobs in place)
+    never corrupt the cached copy.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            blob, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return json.loads(blob)
+
+    def set(self, key: str, value, ttl: float):
+        blob = json.dumps(value).encode("utf-8")
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (blob, time.time() + ttl)
+            self._bytes += len(blob)
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        blob, _ = self._data.pop(key)
+        self._bytes -= len(blob)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# ======== SQLITE BACKEND ========
+
+class SQLiteCache:
+    """
+    Same interface as LRUCache, persisted in a SQLite file so entries survive
+    restarts and are shared by every worker process on the host.
+
+    Entry count and byte total are tracked in memory, so a write costs a
+    primary-key lookup and an insert. Expired/LRU eviction runs every
+    `evict_every` writes (or as soon as a cap is exceeded) and trims to
+    `low_water` of the caps, so it isn't re-triggered on the next write;
+    the totals are re-counted then, picking up other processes' writes.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10_000, max_bytes: int = 256 * 1024 * 1024,
+                 evict_every: int = 256, low_water: float = 0.9):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.low_water = low_water
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_lru ON cache(last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expiry ON cache(expires_at)")
+        self._count, self._bytes = self._totals()
+        self._writes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def _totals(self) -> tuple[int, int]:
+        return self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+
+    def _delete(self, key: str, size: int):
+        self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        self._count -= 1
+        self._bytes -= size
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, size FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if row[1] <= now:
+                self._delete(key, row[2])
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value, ttl: float):
+        blob = json.dumps(value).encode("utf-8")
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl, now),
+            )
+            if old is None:
+                self._count += 1
+            self._bytes += len(blob) - (old[0] if old else 0)
+            self._writes += 1
+            if (self._writes >= self.evict_every or self._count > self.max_entries
+                    or self._bytes > self.max_bytes):
+                self._evict(now)
+
+    def _evict(self, now: float):
+        self._writes = 0
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        self._count, self._bytes = self._totals()
+        if self._count <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+        target_count = int(self.max_entries * self.low_water)
+        target_bytes = int(self.max_bytes * self.low_water)
+        while self._count > target_count or self._bytes > target_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM cache ORDER BY last_access LIMIT 500"
+            ).fetchall()
+            if not rows:
+                break
+            self._conn.execute("BEGIN")
+            for key, size in rows:
+                if self._count <= target_count and self._bytes <= target_bytes:
+                    break
+                self._delete(key, size)
+                self.evictions += 1
+            self._conn.execute("COMMIT")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._count = self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+            ).fetchone()
+        return {
+            "backend": "sqlite",
+            "entries": count,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,92 @@
+import os
+import time
+import sqlite3
+import threading
+import numpy as np
+
+
+# ======== CONFIG ========
+
+SALARY_DIST_PATH = os.getenv("SALARY_DIST_PATH", "salary_distribution.sqlite3")
+# Keep at most this many (most recent) samples per keyword/location
+MAX_SAMPLES_PER_KEY = int(os.getenv("SALARY_DIST_MAX_SAMPLES", "5000"))
+# Percentile scoring kicks in once a key has this much history
+MIN_SAMPLES = int(os.getenv("SALARY_DIST_MIN_SAMPLES", "30"))
+
+
+def _norm(value) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def distribution_key(keyword, location) -> str:
+    return f"{_norm(keyword)}|{_norm(location)}"
+
+
+class SalaryDistribution:
+    """
+    Persistent annualized salaries seen per keyword/location, one sample per
+    job_id so repeat searches don't double count a posting.
+    """
+
+    def __init__(self, path: str = SALARY_DIST_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS samples (
+                key TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                annual REAL NOT NULL,
+                seen_at REAL NOT NULL,
+                PRIMARY KEY (key, job_id)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS samples_age ON samples(key, seen_at)")
+
+    def record(self, key: str, job_ids: list[str], annual: np.ndarray):
+        """Upsert one sample per job; NaN salaries are ignored."""
+        now = time.time()
+        rows = [(key, str(j), float(a), now) for j, a in zip(job_ids, annual) if j and np.isfinite(a)]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?)", rows)
+            self._conn.execute(
+                "DELETE FROM samples WHERE key = ? AND job_id NOT IN ("
+                "SELECT job_id FROM samples WHERE key = ? ORDER BY seen_at DESC LIMIT ?)",
+                (key, key, MAX_SAMPLES_PER_KEY),
+            )
+
+    def sorted_samples(self, key: str) -> np.ndarray:
+        with self._lock:
+            rows = self._conn.execute("SELECT annual FROM samples WHERE key = ?", (key,)).fetchall()
+        return np.sort(np.fromiter((r[0] for r in rows), dtype=float, count=len(rows)))
+
+    def percentiles(self, key: str, annual: np.ndarray) -> np.ndarray | None:
+        """
+        Percentile (0–1) of each salary within the key's history, NaN where the
+        salary is missing; None while the history is too small to trust.
+        """
+        history = self.sorted_samples(key)
+        if len(history) < MIN_SAMPLES:
+            return None
+        # Mid-rank percentile so ties land in the middle of their run
+        lo = np.searchsorted(history, annual, side="left")
+        hi = np.searchsorted(history, annual, side="right")
+        pct = (lo + hi) / (2.0 * len(history))
+        return np.where(np.isfinite(annual), pct, np.nan)
+
+
+_dist: SalaryDistribution | None = None
+_dist_lock = threading.Lock()
+
+
+def get_salary_distribution() -> SalaryDistribution:
+    """Process-wide distribution; first use may come from several worker threads at once."""
+    global _dist
+    with _dist_lock:
+        if _dist is None:
+            _dist = SalaryDistribution()
+        return _dist
@@ -1,31 +1,119 @@
 import re
-import requests
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+from typing import NamedTuple
 
 # ✅ Relative import so Render and local environments both work
-from .page_fetcher import get_rendered_html
+from .page_artifact import PageArtifact
+from .domain_scheduler import is_known_blocked
+
+
+# ======== COMPILED PATTERNS ========
+
+_KEYWORD_RE = re.compile(r"pay|salary|wage|rate|compensation")
+_KEYWORD_RE_I = re.compile(_KEYWORD_RE.pattern, re.I)
+_HEADER_RE = re.compile(r"(Pay|Salary|Wage|Rate|Compensation)[:\s]*", re.I)
+_AMOUNT = r"\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?"
+_PERIOD = r"(?:per\s?(?:hour|annum|year)|/ ?hr|hourly)"
+_SALARY_RES = [
+    # e.g., $15 - $16 per hour | $20/hr | $45,000 per year | 16-18 hourly
+    re.compile(
+        rf"\$\s?{_AMOUNT}(?:\s?[-–to]{{1,3}}\s?\$?{_AMOUNT})?\s?{_PERIOD}", re.I
+    ),
+    # Lines that say Salary/Pay/etc followed by a number
+    re.compile(
+        rf"\b(?:Pay|Salary|Wage|Rate|Compensation)\b[:\s]*\$?{_AMOUNT}"
+        rf"(?:\s?[-–to]{{1,3}}\s?\$?{_AMOUNT})?(?:\s?{_PERIOD})?",
+        re.I,
+    ),
+]
+_DOLLAR_RE = re.compile(r"\$\s?\d")
+_DIGIT_RE = re.compile(r"\d")
+_NUMBER_RE = re.compile(r"\d{1,3}(?:,\d{3})*(?:\.\d+)?")
+_PERIOD_RES = [
+    ("hour", re.compile(r"hour|/ ?hr\b|hourly", re.I)),
+    ("year", re.compile(r"year|annum|annual", re.I)),
+    ("month", re.compile(r"month", re.I)),
+    ("week", re.compile(r"week", re.I)),
+]
+_CURRENCY_RES = [
+    ("CAD", re.compile(r"\bCAD\b|C\$", re.I)),
+    ("USD", re.compile(r"\bUSD\b|US\$", re.I)),
+]
 
 
-# ======== CONSTANTS ========
+class SalaryInfo(NamedTuple):
+    """Structured salary match. `currency` is set only when the text names it."""
+    text: str
+    min: float | None
+    max: float | None
+    period: str | None
+    currency: str | None
 
-# Domains that almost always require a headless browser (anti-bot pages)
-BLOCKED_DOMAINS = {
-    "indeed.com", "ca.indeed.com", "emplois.ca.indeed.com",
-    "simplyhired.ca", "fr.simplyhired.ca",
-    "glassdoor.ca", "glassdoor.com",
-    "ziprecruiter.com", "www.ziprecruiter.com",
-}
 
-# Keywords that indicate we hit a CAPTCHA, bot-check, or blank stub page
-BLOCK_PHRASES = [
-    "enable javascript", "please verify you are a human", "robot check",
-    "access denied", "forbidden", "sorry, we just need to make sure",
-    "/captcha", "unusual traffic", "are you a robot",
-]
+# ======== SALARY TEXT EXTRACTION ========
 
+def _candidate_lines(text: str):
+    """
+    Yield each line that mentions a pay keyword and contains a digit, once,
+    in order. A bare "Salary:"-style header line is joined with the line that
+    follows it. Only lines around keyword hits are ever sliced out of the page.
+    """
+    # Case-sensitive search over a lowercased copy is far cheaper than re.I;
+    # offsets only line up when lowercasing kept the length (ASCII-ish text)
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        hits = _KEYWORD_RE.finditer(lowered)
+    else:
+        hits = _KEYWORD_RE_I.finditer(text)
+
+    last_start = -1
+    for m in hits:
+        start = text.rfind("\n", 0, m.start()) + 1
+        if start == last_start:
+            continue
+        last_start = start
+        end = text.find("\n", m.end())
+        if end == -1:
+            end = len(text)
+        line = text[start:end].strip()
+        if end < len(text) and _HEADER_RE.fullmatch(line):
+            next_end = text.find("\n", end + 1)
+            line = f"{line} {text[end + 1:next_end if next_end != -1 else len(text)].strip()}"
+        # Every pattern below needs at least one digit
+        if _DIGIT_RE.search(line):
+            yield line
+
+
+def _to_float(s: str) -> float:
+    return float(s.replace(",", ""))
+
+
+def _describe(matched: str, context: str) -> SalaryInfo:
+    nums = _NUMBER_RE.findall(matched)
+    low = _to_float(nums[0]) if nums else None
+    high = _to_float(nums[1]) if len(nums) > 1 else None
+    period = next((name for name, rx in _PERIOD_RES if rx.search(matched)), None)
+    currency = next((code for code, rx in _CURRENCY_RES if rx.search(context)), None)
+    return SalaryInfo(matched, low, high, period, currency)
+
+
+def extract_salary(text: str) -> SalaryInfo | None:
+    """
+    Single pass over `text` returning the first salary mention as a
+    SalaryInfo (text, min, max, period, currency), or None.
+    """
+    if not text:
+        return None
+
+    for line in _candidate_lines(text):
+        for rx in _SALARY_RES:
+            m = rx.search(line)
+            if m:
+                return _describe(m.group().strip(), line)
+        # fallback: if it mentions salary/pay and has a $number, take the line
+        if _DOLLAR_RE.search(line):
+            return _describe(line, line)
+    return None
 
-# ======== SALARY TEXT EXTRACTION ========
 
 def extract_salary_from_text(text: str):
     """
@@ -36,41 +124,8 @@ def extract_salary_from_text(text: str):
       - Rate: $16/hour
       - $45,000 per year, etc.
     """
-    if not text:
-        return None
-
-    lines = text.splitlines()
-    combined = []
-    for i, line in enumerate(lines):
-        line = line.strip()
-        # Merge "Salary:" or "Pay:" header lines with next line content
-        if re.match(r"^(Pay|Salary|Wage|Rate|Compensation)[:\s]*$", line, re.I) and i + 1 < len(lines):
-            combined.append(f"{line} {lines[i+1].strip()}")
-        else:
-            combined.append(line)
-
-    salary_patterns = [
-        # e.g., $15 - $16 per hour | $20/hr | $45,000 per year | 16-18 hourly
-        r"\$\s?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?"
-        r"(?:\s?[-–to]{1,3}\s?\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)?"
-        r"\s?(?:per\s?(?:hour|annum|year)|/ ?hr|hourly)",
-        # Lines that say Salary/Pay/etc followed by a number
-        r"\b(?:Pay|Salary|Wage|Rate|Compensation)\b[:\s]*\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?"
-        r"(?:\s?[-–to]{1,3}\s?\$?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?)?"
-        r"(?:\s?(?:per\s?(?:hour|annum|year)|/ ?hr|hourly))?",
-    ]
-
-    for line in combined:
-        lower = line.lower()
-        if any(k in lower for k in ["pay", "salary", "wage", "rate", "compensation"]):
-            for pattern in salary_patterns:
-                m = re.search(pattern, line, re.IGNORECASE)
-                if m:
-                    return m.group().strip()
-            # fallback: if it mentions salary/pay and has a $number, take the line
-            if re.search(r"\$\s?\d", line):
-                return line.strip()
-    return None
+    info = extract_salary(text)
+    return info.text if info else None
 
 
 def parse_salary_range(salary_text: str):
@@ -81,90 +136,71 @@ def parse_salary_range(salary_text: str):
     if not salary_text or "Error" in salary_text:
         return None, None
 
-    nums = re.findall(r"\d{1,3}(?:,\d{3})*(?:\.\d+)?", salary_text)
+    nums = _NUMBER_RE.findall(salary_text)
     if not nums:
         return None, None
 
-    def to_float(s):
-        return float(s.replace(",", ""))
-
     if len(nums) == 1:
-        return to_float(nums[0]), None
-    return to_float(nums[0]), to_float(nums[1])
-
-
-# ======== NETWORK HELPERS ========
-
-def _looks_blocked(html: str) -> bool:
-    if not html:
-        return True
-    l = html.lower()
-    # small pages or containing bot-check language
-    return any(phrase in l for phrase in BLOCK_PHRASES) or len(l) < 800
-
-
-def _requests_text(url: str):
-    """Try plain requests to get visible text. Return text or None if blocked."""
-    try:
-        res = requests.get(
-            url,
-            timeout=12,
-            headers={
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                "Accept-Language": "en-US,en;q=0.8",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            },
-        )
-        html = res.text
-        if res.status_code != 200 or _looks_blocked(html):
-            return None
-        soup = BeautifulSoup(html, "html.parser")
-        return soup.get_text(separator="\n", strip=True)
-    except Exception:
-        return None
-
-
-def _playwright_text(url: str):
-    """Render with Playwright and return visible text or None."""
-    html = get_rendered_html(url)
-    if not html or _looks_blocked(html):
-        return None
-    soup = BeautifulSoup(html, "html.parser")
-    return soup.get_text(separator="\n", strip=True)
+        return _to_float(nums[0]), None
+    return _to_float(nums[0]), _to_float(nums[1])
 
 
 # ======== MAIN PIPELINE ========
 
-def extract_salary_for_job(job: dict) -> str:
+def find_salary_for_job(job: dict, page: PageArtifact | None = None) -> SalaryInfo | None:
     """
     Best-effort extraction pipeline for a single JSearch job dict:
       1) Try job_description (fast, often already has salary)
       2) Try requests on job_apply_link
       3) If domain is known-blocked or requests looked blocked, render via Playwright
-      Returns a human-readable string or "Salary: None found".
+      Returns a SalaryInfo or None.
+
+    Pass the job's shared `page` so other extractors reuse the same download.
     """
-    desc = job.get("job_description") or ""
-    from_desc = extract_salary_from_text(desc)
+    from_desc = extract_salary(job.get("job_description") or "")
     if from_desc:
         return from_desc
 
-    url = job.get("job_apply_link") or ""
-    if not url:
-        return "Salary: None found"
+    if page is None:
+        page = PageArtifact(job.get("job_apply_link"))
+    if not page.url:
+        return None
 
-    host = urlparse(url).hostname or ""
-    text = _requests_text(url)
+    page.fetch()
 
     # If blocked or domain known to block bots, use Playwright rendering
-    if text is None or host in BLOCKED_DOMAINS:
-        text = _playwright_text(url)
+    if page.blocked or is_known_blocked(page.host):
+        page.render()
+
+    return extract_salary(page.visible_text)
+
+
+async def find_salary_for_job_async(job: dict, page: PageArtifact | None = None) -> SalaryInfo | None:
+    """Async version of find_salary_for_job (httpx + async browser pool)."""
+    from_desc = extract_salary(job.get("job_description") or "")
+    if from_desc:
+        return from_desc
+
+    if page is None:
+        page = PageArtifact(job.get("job_apply_link"))
+    if not page.url:
+        return None
+
+    await page.fetch_async()
+
+    if page.blocked or is_known_blocked(page.host):
+        await page.render_async()
+
+    return extract_salary(await page.visible_text_async())
+
+
+def extract_salary_for_job(job: dict, page: PageArtifact | None = None) -> str:
+    """find_salary_for_job as a human-readable string or "Salary: None found"."""
+    info = find_salary_for_job(job, page)
+    return info.text if info else "Salary: None found"
 
-    if not text:
-        return "Salary: None found"
 
-    found = extract_salary_from_text(text)
-    return found or "Salary: None found"
+async def extract_salary_for_job_async(job: dict, page: PageArtifact | None = None) -> str:
+    """Async version of extract_salary_for_job."""
+    info = await find_salary_for_job_async(job, page)
+    return info.text if info else "Salary: None found"
@@ -0,0 +1,386 @@
+"""
+Local full-text and faceted index over every job the pipeline has seen.
+
+Enriched jobs are upserted after each live search. Later searches can be
+answered from here in milliseconds, with JSearch refreshed in the background
+(see INDEX_MODE in job_search.aggregator).
+
+- SQLite FTS5 over title + description (porter stemming), ranked by BM25
+  with titles weighted higher
+- plain columns for the facets/filters: location, employment type,
+  annualized salary, posting time (epoch seconds), remote flag
+- one row per posting (job_id, else canonical apply URL, else title+company);
+  re-seeing a posting merges into its row, so enrichment found earlier is
+  kept when a later copy lacks it
+- rows not seen for INDEX_TTL_DAYS are pruned
+- each live search records which rows it returned (query_jobs), so a repeat
+  of the same query gets exactly that set back instead of whatever the FTS
+  match happens to find
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from .enrichment_cache import canonicalize_url
+from .job_record import to_plain, posted_timestamp
+
+
+# ======== CONFIG ========
+
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "search_index.sqlite3")
+INDEX_TTL_DAYS = float(os.getenv("INDEX_TTL_DAYS", "30"))
+PRUNE_INTERVAL = 3600  # seconds between TTL sweeps
+TITLE_WEIGHT = 10.0
+
+# Result-set specific fields that mean nothing outside the search that produced them
+_VOLATILE = ("cluster_id", "pay_score", "pay_percentile", "job_description")
+
+DATE_WINDOWS = {"today": 1, "week": 7, "month": 30}
+SALARY_BUCKETS = ((0, 30000), (30000, 50000), (50000, 75000), (75000, 100000),
+                  (100000, 150000), (150000, None))
+
+
+def _job_key(job) -> str | None:
+    if job.get("job_id"):
+        return f"id:{job['job_id']}"
+    url = canonicalize_url(job.get("job_apply_link") or "")
+    if url:
+        return f"url:{url}"
+    title = str(job.get("job_title") or "").strip().lower()
+    company = str(job.get("employer_name") or "").strip().lower()
+    return f"tc:{title}|{company}" if title and company else None
+
+
+def _fts_query(text: str) -> str | None:
+    """User keywords as an FTS5 query: every word quoted (no syntax errors), all required."""
+    words = [w for w in "".join(c if c.isalnum() else " " for c in (text or "")).split() if w]
+    return " ".join(f'"{w}"' for w in words) or None
+
+
+def _norm_type(value: str | None) -> str:
+    return "".join(c for c in (value or "").lower() if c.isalpha())
+
+
+def _location_label(job) -> str:
+    parts = [job.get("job_city"), job.get("job_state"), job.get("job_country")]
+    label = ", ".join(str(p) for p in parts if p)
+    return label or str(job.get("location") or "")
+
+
+def _load_rows(rows) -> list[dict]:
+    """(payload, description) rows -> job dicts."""
+    results = []
+    for payload, description in rows:
+        job = json.loads(payload)
+        if description:
+            job["job_description"] = description
+        results.append(job)
+    return results
+
+
+class SearchIndex:
+    def __init__(self, path: str = SEARCH_INDEX_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                job_key TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL DEFAULT '',
+                description TEXT NOT NULL DEFAULT '',
+                payload TEXT NOT NULL,
+                location TEXT NOT NULL DEFAULT '',
+                country TEXT NOT NULL DEFAULT '',
+                employment_type TEXT NOT NULL DEFAULT '',
+                is_remote INTEGER NOT NULL DEFAULT 0,
+                annual_salary REAL,
+                posted_ts INTEGER,
+                indexed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_posted ON jobs(posted_ts);
+            CREATE INDEX IF NOT EXISTS jobs_indexed ON jobs(indexed_at);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                title, description, content='jobs', content_rowid='id', tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+                INSERT INTO jobs_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE OF title, description ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO jobs_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END;
+
+            CREATE TABLE IF NOT EXISTS refreshes (
+                query_key TEXT PRIMARY KEY,
+                refreshed_at REAL NOT NULL,
+                live_count INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS query_jobs (
+                query_key TEXT NOT NULL,
+                job_key TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                PRIMARY KEY (query_key, job_key)
+            ) WITHOUT ROWID;
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(refreshes)")}
+        if "live_count" not in columns:
+            # Indexes created before live results were recorded; live_count stays NULL for old rows
+            self._conn.execute("ALTER TABLE refreshes ADD COLUMN live_count INTEGER")
+        self._last_prune = 0.0
+
+    # ---- writes ----
+
+    def upsert(self, jobs, annual_salaries=None) -> int:
+        """
+        Index (or refresh) jobs. `annual_salaries` (e.g. from
+        aggregator.salary_columns) feeds the salary facet; NaN/None = unknown.
+        Returns the number of rows written.
+        """
+        now = time.time()
+        rows = []
+        for i, job in enumerate(jobs):
+            key = _job_key(job)
+            if key is None:
+                continue
+            plain = dict(to_plain(job))
+            description = plain.get("job_description") or ""
+            for field in _VOLATILE:
+                plain.pop(field, None)
+            # posted_ts isn't in API payloads; keep it so a reloaded job has the same date
+            posted_ts = posted_timestamp(job)
+            plain["job_posted_at_timestamp"] = posted_ts
+            annual = annual_salaries[i] if annual_salaries is not None else None
+            annual = float(annual) if annual is not None and annual == annual else None
+            rows.append((
+                key, str(job.get("job_title") or ""), description,
+                json.dumps({k: v for k, v in plain.items() if v is not None}, default=str),
+                _location_label(job).lower(), str(job.get("job_country") or "").lower(),
+                _norm_type(job.get("job_employment_type")), 1 if job.get("job_is_remote") else 0,
+                annual, posted_ts, now,
+            ))
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT INTO jobs (job_key, title, description, payload, location, country,
+                                      employment_type, is_remote, annual_salary, posted_ts, indexed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(job_key) DO UPDATE SET
+                        title = CASE WHEN excluded.title != '' THEN excluded.title ELSE jobs.title END,
+                        description = CASE WHEN excluded.description != '' THEN excluded.description
+                                           ELSE jobs.description END,
+                        payload = json_patch(jobs.payload, excluded.payload),
+                        location = CASE WHEN excluded.location != '' THEN excluded.location ELSE jobs.location END,
+                        country = CASE WHEN excluded.country != '' THEN excluded.country ELSE jobs.country END,
+                        employment_type = CASE WHEN excluded.employment_type != '' THEN excluded.employment_type
+                                               ELSE jobs.employment_type END,
+                        is_remote = excluded.is_remote,
+                        annual_salary = COALESCE(excluded.annual_salary, jobs.annual_salary),
+                        posted_ts = COALESCE(excluded.posted_ts, jobs.posted_ts),
+                        indexed_at = excluded.indexed_at
+                    """,
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            if now - self._last_prune > PRUNE_INTERVAL:
+                self._last_prune = now
+                cutoff = now - INDEX_TTL_DAYS * 86400
+                self._conn.execute("DELETE FROM jobs WHERE indexed_at < ?", (cutoff,))
+                self._conn.execute("DELETE FROM refreshes WHERE refreshed_at < ?", (cutoff,))
+                self._conn.execute("DELETE FROM query_jobs WHERE query_key NOT IN (SELECT query_key FROM refreshes)")
+        return len(rows)
+
+    def mark_refreshed(self, query_key: str, jobs=()):
+        """Record a live search for `query_key` and the jobs it returned, in order."""
+        keys = list(dict.fromkeys(k for k in map(_job_key, jobs) if k is not None))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO refreshes (query_key, refreshed_at, live_count) VALUES (?, ?, ?)",
+                    (query_key, time.time(), len(keys)),
+                )
+                self._conn.execute("DELETE FROM query_jobs WHERE query_key = ?", (query_key,))
+                self._conn.executemany(
+                    "INSERT INTO query_jobs (query_key, job_key, rank) VALUES (?, ?, ?)",
+                    [(query_key, key, rank) for rank, key in enumerate(keys)],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def refreshed_at(self, query_key: str) -> float | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT refreshed_at FROM refreshes WHERE query_key = ?", (query_key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def live_results(self, query_key: str, limit: int = 200) -> dict | None:
+        """
+        The jobs the last live search for `query_key` returned, still in the
+        index, in their original order:
+
+            {"refreshed_at": float, "live_count": int | None, "results": [job dicts]}
+
+        None when the query was never searched live. Rows pruned since then
+        are missing, so len(results) can be below live_count.
+        """
+        with self._lock:
+            refresh = self._conn.execute(
+                "SELECT refreshed_at, live_count FROM refreshes WHERE query_key = ?", (query_key,)
+            ).fetchone()
+            if refresh is None:
+                return None
+            rows = self._conn.execute(
+                """
+                SELECT jobs.payload, jobs.description FROM query_jobs
+                JOIN jobs ON jobs.job_key = query_jobs.job_key
+                WHERE query_jobs.query_key = ? ORDER BY query_jobs.rank LIMIT ?
+                """,
+                (query_key, limit),
+            ).fetchall()
+        return {"refreshed_at": refresh[0], "live_count": refresh[1], "results": _load_rows(rows)}
+
+    # ---- reads ----
+
+    def _where(self, query, location, job_type, country, date_posted, min_salary, max_salary, remote, now):
+        """(FTS query, SQL condition for the other filters, its params)."""
+        clauses, params = [], []
+        fts = _fts_query(query)
+        city = (location or "").split(",")[0].strip().lower()
+        if city:
+            clauses.append("jobs.location LIKE ?")
+            params.append(f"%{city}%")
+        if job_type:
+            clauses.append("jobs.employment_type LIKE ?")
+            params.append(f"%{_norm_type(job_type)}%")
+        if country:
+            clauses.append("jobs.country = ?")
+            params.append(country.lower())
+        max_days = DATE_WINDOWS.get(date_posted)
+        if max_days is not None:
+            clauses.append("jobs.posted_ts >= ?")
+            params.append(now - (max_days + 1) * 86400)
+        if min_salary is not None:
+            clauses.append("jobs.annual_salary >= ?")
+            params.append(min_salary)
+        if max_salary is not None:
+            clauses.append("jobs.annual_salary <= ?")
+            params.append(max_salary)
+        if remote is not None:
+            clauses.append("jobs.is_remote = ?")
+            params.append(1 if remote else 0)
+        return fts, " AND ".join(clauses) or "1", params
+
+    def search(self, query: str = "", location: str = "", job_type: str = "", country: str = "",
+               date_posted: str = "all", min_salary: float | None = None, max_salary: float | None = None,
+               remote: bool | None = None, limit: int = 50, offset: int = 0, facets: bool = True,
+               now: float | None = None) -> dict:
+        """
+        Jobs matching every given filter, best BM25 match first (newest first
+        without a query), with facet counts over all matches:
+
+            {"total": int, "results": [job dicts], "facets": {
+                "location": {label: n}, "employment_type": {type: n},
+                "salary": {"50000-75000": n, ...}, "posted": {"today": n, "week": n, "month": n, "older": n}}}
+
+        The "posted" counts are cumulative (a job from today also counts for week and month).
+        """
+        now = time.time() if now is None else now
+        fts, filters, filter_params = self._where(query, location, job_type, country, date_posted,
+                                                  min_salary, max_salary, remote, now)
+        if fts:
+            # bm25 is only available inside the FTS query itself
+            sql = f"""
+                SELECT jobs.payload, jobs.description FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+                WHERE jobs_fts MATCH ? AND {filters}
+                ORDER BY bm25(jobs_fts, {TITLE_WEIGHT}, 1.0), jobs.posted_ts DESC LIMIT ? OFFSET ?
+            """
+            select_params = [fts, *filter_params, limit, offset]
+            where = f"jobs.id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?) AND {filters}"
+            params = [fts, *filter_params]
+        else:
+            sql = f"""
+                SELECT payload, description FROM jobs WHERE {filters}
+                ORDER BY posted_ts IS NULL, posted_ts DESC LIMIT ? OFFSET ?
+            """
+            select_params = [*filter_params, limit, offset]
+            where, params = filters, filter_params
+
+        with self._lock:
+            rows = self._conn.execute(sql, select_params).fetchall()
+            total = self._conn.execute(f"SELECT COUNT(*) FROM jobs WHERE {where}", params).fetchone()[0]
+            facet_counts = self._facets(where, params, now) if facets else {}
+
+        return {"total": total, "results": _load_rows(rows), "facets": facet_counts}
+
+    def _facets(self, where: str, params: list, now: float) -> dict:
+        locations = self._conn.execute(
+            f"SELECT location, COUNT(*) AS n FROM jobs WHERE {where} AND location != '' "
+            "GROUP BY location ORDER BY n DESC LIMIT 20", params
+        ).fetchall()
+        types = self._conn.execute(
+            f"SELECT employment_type, COUNT(*) FROM jobs WHERE {where} AND employment_type != '' "
+            "GROUP BY employment_type ORDER BY 2 DESC", params
+        ).fetchall()
+
+        salary_cases = " ".join(
+            f"WHEN annual_salary >= {lo} {f'AND annual_salary < {hi}' if hi else ''} "
+            f"THEN '{lo}-{hi or ''}'"
+            for lo, hi in SALARY_BUCKETS
+        )
+        salaries = self._conn.execute(
+            f"SELECT CASE {salary_cases} END AS bucket, COUNT(*) FROM jobs "
+            f"WHERE {where} AND annual_salary IS NOT NULL GROUP BY bucket", params
+        ).fetchall()
+
+        day = 86400
+        posted = self._conn.execute(
+            f"""
+            SELECT SUM(posted_ts >= ?), SUM(posted_ts >= ?), SUM(posted_ts >= ?), SUM(posted_ts < ?)
+            FROM jobs WHERE {where} AND posted_ts IS NOT NULL
+            """,
+            [now - 2 * day, now - 8 * day, now - 31 * day, now - 31 * day, *params],
+        ).fetchone()
+
+        return {
+            "location": dict(locations),
+            "employment_type": dict(types),
+            "salary": {bucket: n for bucket, n in salaries if bucket},
+            "posted": dict(zip(("today", "week", "month", "older"), (n or 0 for n in posted))),
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            jobs = self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            queries = self._conn.execute("SELECT COUNT(*) FROM refreshes").fetchone()[0]
+        return {"jobs": jobs, "queries": queries}
+
+
+_index: SearchIndex | None = None
+
+
+def get_search_index() -> SearchIndex:
+    global _index
+    if _index is None:
+        _index = SearchIndex()
+    return _index
@@ -1,12 +1,26 @@
 # file: backend/main.py
-from fastapi import FastAPI, UploadFile
+from fastapi import FastAPI, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import json
+import os
 
-from resume_parser.parser import parse_resume_with_gpt, pdf_to_text
-from job_search.aggregator import job_search_pipeline
-from personality_fit.job_fit_analysis import calculate_fit_scores
+from resume_parser.parser import parse_resume_text
+from resume_parser.ingest import ingest_resume, shutdown_ingest_pool, ResumeTooLarge
+from job_search.aggregator import job_search_pipeline_async, stream_job_search, shutdown_refresh_pool
+from job_search.api_clients.jsearch_api import jsearch_cache_stats
+from job_search.utils.enrichment_cache import enrichment_cache_stats
+from job_search.utils.enrichment_queue import get_enrichment_queue
+from job_search.utils.domain_scheduler import scheduler
+from job_search.utils.http_client import close_async_client
+from job_search.utils.page_fetcher import close_async_browser_pool
+from job_search.utils.job_record import JobRecord, to_plain, parse_fields
+from job_search.utils.search_index import get_search_index
+from personality_fit.job_fit_analysis import calculate_fit_scores_async
+from personality_fit.llm_client import close_llm_client
+from personality_fit.jd_cache import jd_cache_stats
+from utils.fast_json import FastJSONResponse, dumps
+from utils.compression import CompressionMiddleware
 
 app = FastAPI(title="CareerPilot API", version="1.0")
 
@@ -18,6 +32,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/br for complete responses above the threshold; streams pass through
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("COMPRESS_MIN_BYTES", "1024")))
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_async_client()
+    await close_async_browser_pool()
+    await close_llm_client()
+    shutdown_ingest_pool()
+    shutdown_refresh_pool()
+
 @app.get("/")
 def root():
     return {"message": "CareerPilot backend running successfully!"}
@@ -26,17 +51,77 @@ def root():
 def health_check():
     return {"status": "ok"}
 
+@app.get("/cache_stats")
+def cache_stats():
+    return {
+        "jsearch": jsearch_cache_stats(),
+        "enrichment": enrichment_cache_stats(),
+        "enrichment_queue": get_enrichment_queue().stats(),
+        "jd_traits": jd_cache_stats(),
+        "search_index": get_search_index().stats(),
+    }
+
+@app.get("/domain_stats")
+def domain_stats():
+    return {"domains": scheduler.stats()}
+
 @app.post("/parse_resume")
 async def parse_resume(file: UploadFile):
-    pdf_bytes = await file.read()
-    text = pdf_to_text(pdf_bytes)
-    parsed_data = parse_resume_with_gpt(text)
-    return parsed_data
+    # UploadFile.file is a spooled temp file; reading and parsing happen off the event loop
+    try:
+        text = await ingest_resume(file.file, file.filename)
+    except ResumeTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:  # unsupported file type
+        raise HTTPException(status_code=400, detail=str(e))
+    return parse_resume_text(text)
 
 @app.get("/get_jobs")
-def get_jobs(keyword: str, location: str, job_type: str = "", country: str = "us", date_posted: str = "all"):
-    jobs = job_search_pipeline(keyword, location, job_type, country, date_posted)
-    return {"results": jobs}
+async def get_jobs(keyword: str, location: str, job_type: str = "", country: str = "us",
+                   date_posted: str = "all", fields: str = ""):
+    """`fields` (comma-separated, e.g. job_title,employer_name,pay_score) limits the columns returned."""
+    jobs = await job_search_pipeline_async(keyword, location, job_type, country, date_posted)
+    columns = parse_fields(fields)
+    return FastJSONResponse({"results": [to_plain(job, columns) for job in jobs]})
+
+@app.get("/search_jobs")
+def search_jobs(q: str = "", location: str = "", job_type: str = "", country: str = "",
+                date_posted: str = "all", min_salary: float | None = None, max_salary: float | None = None,
+                remote: bool | None = None, limit: int = 50, offset: int = 0, fields: str = ""):
+    """Previously seen jobs from the local index: BM25-ranked matches plus facet counts. No live calls."""
+    found = get_search_index().search(q, location, job_type, country, date_posted, min_salary, max_salary,
+                                      remote, min(limit, 200), offset)
+    columns = parse_fields(fields)
+    found["results"] = [to_plain(job, columns) for job in found["results"]]
+    return FastJSONResponse(found)
+
+def _encoder(columns):
+    def default(obj):
+        if isinstance(obj, JobRecord):
+            return obj.to_dict(columns)
+        return str(obj)
+    return default
+
+async def _ndjson(events, columns=None):
+    default = _encoder(columns)
+    async for event in events:
+        yield dumps(event, default=default) + b"\n"
+
+async def _sse(events, columns=None):
+    default = _encoder(columns)
+    async for event in events:
+        yield f"event: {event['event']}\ndata: {dumps(event, default=default).decode()}\n\n"
+
+@app.get("/get_jobs/stream")
+async def get_jobs_stream(keyword: str, location: str, job_type: str = "", country: str = "us",
+                          date_posted: str = "all", format: str = "ndjson", fields: str = ""):
+    """Raw results first, then enrichment updates as they finish (NDJSON, or SSE with format=sse)."""
+    events = stream_job_search(keyword, location, job_type, country, date_posted)
+    columns = parse_fields(fields)
+    if format == "sse":
+        return StreamingResponse(_sse(events, columns), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
+    return StreamingResponse(_ndjson(events, columns), media_type="application/x-ndjson")
 
 class FitRequest(BaseModel):
     candidate: dict
@@ -44,10 +129,10 @@ class FitRequest(BaseModel):
 
 @app.post("/fit_score")
 async def fit_score(request: FitRequest):
-    scores = calculate_fit_scores(request.candidate, request.job_descriptions)
-    return {"results": scores}
+    scores = await calculate_fit_scores_async(request.candidate, request.job_descriptions)
+    return FastJSONResponse({"results": scores})
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     print(f"❌ Unexpected error: {exc}")
-    return {"error": str(exc)}
+    return FastJSONResponse({"error": str(exc)}, status_code=500)
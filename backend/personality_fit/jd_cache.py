@@ -0,0 +1,51 @@
+# file: backend/personality_fit/jd_cache.py
+"""
+Persistent cache of per-job-description trait/environment vectors.
+
+A JD's ratings don't depend on the candidate, so they are stored once per
+(normalized description, model, prompt version) and every candidate is
+scored against the cached vectors locally.
+"""
+
+import os
+import hashlib
+
+from job_search.utils.response_cache import SQLiteCache
+
+# ========== CONFIG ==========
+JD_CACHE_PATH = os.getenv("JD_CACHE_PATH", "jd_traits_cache.sqlite3")
+JD_CACHE_TTL = int(os.getenv("JD_CACHE_TTL", str(180 * 24 * 3600)))
+
+_store = None
+
+
+def _get_store() -> SQLiteCache:
+    global _store
+    if _store is None:
+        _store = SQLiteCache(JD_CACHE_PATH, max_entries=200_000, max_bytes=256 * 1024 * 1024)
+    return _store
+
+
+# ========== KEYS ==========
+def normalize_jd(text: str) -> str:
+    """Case and whitespace never change the ratings, so they don't change the key."""
+    return " ".join((text or "").lower().split())
+
+
+def jd_hash(text: str, model: str, prompt_version: str) -> str:
+    payload = f"{model}|{prompt_version}|{normalize_jd(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ========== PUBLIC API ==========
+def get_jd_vectors(key: str) -> dict | None:
+    """Cached {"job_traits": ..., "job_env": ...} for a jd_hash, or None."""
+    return _get_store().get(key)
+
+
+def put_jd_vectors(key: str, vectors: dict):
+    _get_store().set(key, vectors, JD_CACHE_TTL)
+
+
+def jd_cache_stats() -> dict:
+    return _get_store().stats()
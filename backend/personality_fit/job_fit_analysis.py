@@ -1,25 +1,24 @@
 # file: backend/personality_fit/job_fit_analysis.py
 import os
 import json
-import time
+import asyncio
 import numpy as np
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from personality_fit.jd_cache import jd_hash, get_jd_vectors, put_jd_vectors
+from personality_fit.llm_client import get_llm_client, close_llm_client
 
 # ========== SETUP ==========
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-# ========== SAFE WRAPPER ==========
-def safe_llm_request(**kwargs):
-    """Retry OpenAI API requests with exponential backoff."""
-    for delay in [1, 2, 4]:
-        try:
-            return client.chat.completions.create(**kwargs)
-        except Exception as e:
-            print(f"⚠️ LLM error: {e}. Retrying in {delay}s...")
-            time.sleep(delay)
-    raise RuntimeError("OpenAI request failed after retries.")
+# Input-token budget per JD-analysis call, and the cap on jobs per call (output size grows per job)
+JD_BATCH_MAX_TOKENS = int(os.getenv("JD_BATCH_MAX_TOKENS", "6000"))
+JD_BATCH_MAX_JOBS = int(os.getenv("JD_BATCH_MAX_JOBS", "8"))
+# Longer descriptions are cut to this many tokens before rating
+JD_MAX_TOKENS = int(os.getenv("JD_MAX_TOKENS", "2500"))
+# Batches in flight per request (the LLM client also enforces a process-wide cap)
+JD_BATCH_CONCURRENCY = int(os.getenv("JD_BATCH_CONCURRENCY", "4"))
+JD_BATCH_RETRIES = 2
 
 # ========== LOAD CANDIDATE TRAITS ==========
 def load_candidate_profile(path="candidate_scores.json"):
@@ -70,27 +69,71 @@ def satisfaction_score(user_env_vec, job_env_vec):
     ]
     return 100 * sum(sims) / sum(ENV_W.values())
 
-# ========== MAIN CALCULATOR ==========
-def calculate_fit_scores(job_descriptions: list[str]) -> list[dict]:
-    """
-    Takes a list of job description texts and returns personality fit + satisfaction scores.
-    """
-    candidate = load_candidate_profile()
-    user_traits = candidate["traits"]
-    user_env = candidate["environment"]
+# ========== JD ANALYSIS ==========
+MODEL = "gpt-4o-mini"
+# Bump whenever SYSTEM_PROMPT or the rating transform changes; old cache entries are then ignored
+PROMPT_VERSION = "v2"
 
-    SYSTEM_PROMPT = """
-    You are a psychometric evidence analyst.
-    You will complete the Hiring-Manager Job-Requirements Survey item by item for multiple Job Descriptions.
-    Every rating must be grounded in explicit textual evidence from the JD. Absence of evidence = 3.
-    Output strictly in JSON format with jobs, traits, and environment as numeric lists.
-    """
+SYSTEM_PROMPT = """
+You are a psychometric evidence analyst.
+You will complete the Hiring-Manager Job-Requirements Survey item by item for multiple Job Descriptions.
+Every rating must be grounded in explicit textual evidence from the JD. Absence of evidence = 3.
+Output strictly in JSON format with jobs, traits, and environment as numeric lists.
+Set each job's job_id to the number in its "=== JOB n ===" header.
+"""
+
+
+def job_vectors(job: dict) -> dict:
+    """Turn one job's raw 1–5 survey ratings into 0–100 traits and 0–1 environment scores."""
+    traits_raw = job.get("traits", {})
+    env_raw = job.get("environment", {})
+
+    job_traits = {
+        t: round(100 * float(np.mean([(v - 1) / 4 for v in vals])), 2)
+        for t, vals in traits_raw.items()
+        if vals
+    }
+    job_env = {
+        e: round(float(np.mean([(v - 1) / 4 for v in vals])), 3)
+        for e, vals in env_raw.items()
+        if vals
+    }
 
-    # Merge all job descriptions into one batch for efficiency
+    # Flip S for stability (higher = more stable)
+    if "S" in job_traits:
+        job_traits["S"] = 100 - job_traits["S"]
+
+    return {"job_traits": job_traits, "job_env": job_env}
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English prose; close enough for packing
+    return len(text) // 4 + 8
+
+
+def pack_batches(job_descriptions: list[str], max_tokens: int = JD_BATCH_MAX_TOKENS,
+                 max_jobs: int = JD_BATCH_MAX_JOBS) -> list[list[int]]:
+    """Greedily pack JD indexes, in order, into batches bounded by token estimate and job count."""
+    batches, current, used = [], [], 0
+    for i, jd in enumerate(job_descriptions):
+        cost = estimate_tokens(jd)
+        if current and (used + cost > max_tokens or len(current) >= max_jobs):
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _rate_batch(job_descriptions: list[str]) -> list[dict | None]:
+    """One LLM call for the given JDs; vectors in input order, None where the model skipped a job."""
+    # Several job descriptions per call, each under its own numbered header
     jd_batch = "\n\n".join([f"=== JOB {i+1} ===\n{jd}" for i, jd in enumerate(job_descriptions)])
 
-    response = safe_llm_request(
-        model="gpt-4o-mini",
+    response = await get_llm_client().chat(
+        model=MODEL,
         temperature=0.0,
         response_format={"type": "json_object"},
         messages=[
@@ -101,32 +144,115 @@ def calculate_fit_scores(job_descriptions: list[str]) -> list[dict]:
 
     jd_json = json.loads(response.choices[0].message.content)
 
+    rated: list[dict | None] = [None] * len(job_descriptions)
+    for pos, job in enumerate(jd_json.get("jobs", [])):
+        try:
+            index = int(job.get("job_id", pos + 1)) - 1
+        except (TypeError, ValueError):
+            index = pos
+        if 0 <= index < len(rated) and rated[index] is None:
+            rated[index] = job_vectors(job)
+    return rated
+
+
+async def _try_batch(job_descriptions: list[str]) -> list[dict | None] | None:
+    """_rate_batch, or None if the call failed or the JSON is incomplete (e.g. truncated)."""
+    try:
+        rated = await _rate_batch(job_descriptions)
+    except Exception as e:
+        print(f"⚠️ JD batch of {len(job_descriptions)} failed: {e}")
+        return None
+    if any(vec is None or not vec["job_traits"] for vec in rated):
+        print(f"⚠️ JD batch of {len(job_descriptions)} returned incomplete ratings")
+        return None
+    return rated
+
+
+async def _rate_job_descriptions(job_descriptions: list[str]) -> list[dict | None]:
+    """
+    Rate JDs in token-bounded batches sent concurrently. Only batches that
+    fail validation are re-sent, split in half so an oversized answer fits.
+    Results come back in input order; None where every attempt failed.
+    """
+    max_chars = JD_MAX_TOKENS * 4
+    texts = [jd[:max_chars] for jd in job_descriptions]
+    rated: list[dict | None] = [None] * len(texts)
+    sem = asyncio.Semaphore(JD_BATCH_CONCURRENCY)
+
+    async def run(batch):
+        async with sem:
+            return await _try_batch([texts[i] for i in batch])
+
+    pending = pack_batches(texts)
+    for attempt in range(JD_BATCH_RETRIES + 1):
+        outcomes = await asyncio.gather(*(run(b) for b in pending))
+        failed = []
+        for batch, result in zip(pending, outcomes):
+            if result is None:
+                failed.append(batch)
+                continue
+            for i, vec in zip(batch, result):
+                rated[i] = vec
+        if not failed:
+            break
+        pending = []
+        for batch in failed:
+            half = (len(batch) + 1) // 2
+            pending += [batch[:half], batch[half:]] if len(batch) > 1 else [batch]
+
+    return rated
+
+
+async def analyze_job_descriptions(job_descriptions: list[str]) -> list[dict | None]:
+    """
+    Trait/environment vectors for each JD, in input order. Cached JDs are
+    served from the JD cache; only misses (deduplicated) go to the LLM.
+    """
+    keys = [jd_hash(jd, MODEL, PROMPT_VERSION) for jd in job_descriptions]
+    # The JD cache is SQLite; keep its reads and writes off the event loop
+    vectors = await asyncio.to_thread(lambda: [get_jd_vectors(k) for k in keys])
+
+    misses: dict[str, str] = {}
+    for key, jd, hit in zip(keys, job_descriptions, vectors):
+        if hit is None and key not in misses:
+            misses[key] = jd
+
+    if misses:
+        print(f"⏱️ Rating {len(misses)} new job descriptions ({len(keys) - len(misses)} cached)")
+        rated = dict(zip(misses, await _rate_job_descriptions(list(misses.values()))))
+        fresh = {key: vec for key, vec in rated.items() if vec and vec["job_traits"]}
+        await asyncio.to_thread(lambda: [put_jd_vectors(key, vec) for key, vec in fresh.items()])
+        vectors = [hit if hit is not None else rated.get(key) for key, hit in zip(keys, vectors)]
+
+    return vectors
+
+
+# ========== MAIN CALCULATOR ==========
+async def calculate_fit_scores_async(candidate: dict | None, job_descriptions: list[str]) -> list[dict]:
+    """
+    Takes a candidate profile ({"traits", "environment"}; None loads the local
+    profile) and a list of job description texts, and returns personality fit
+    + satisfaction scores. JD ratings are cached, so re-scoring is nearly free.
+    A JD that couldn't be rated (every retry failed) gets {"job_id", "error"}
+    instead, so results still line up with the input.
+    """
+    candidate = candidate or load_candidate_profile()
+    user_traits = candidate["traits"]
+    user_env = candidate["environment"]
+
     results = []
-    for job in jd_json.get("jobs", []):
-        traits_raw = job.get("traits", {})
-        env_raw = job.get("environment", {})
-
-        job_traits = {
-            t: round(100 * np.mean([(v - 1) / 4 for v in vals]), 2)
-            for t, vals in traits_raw.items()
-            if vals
-        }
-        job_env = {
-            e: round(np.mean([(v - 1) / 4 for v in vals]), 3)
-            for e, vals in env_raw.items()
-            if vals
-        }
-
-        # Flip S for stability (higher = more stable)
-        if "S" in job_traits:
-            job_traits["S"] = 100 - job_traits["S"]
+    for i, vec in enumerate(await analyze_job_descriptions(job_descriptions)):
+        if vec is None:
+            results.append({"job_id": str(i + 1), "error": "Job description could not be rated; try again later."})
+            continue
+        job_traits, job_env = vec["job_traits"], vec["job_env"]
 
         fit = round(fit_score(user_traits, job_traits), 2)
         satisfaction = round(satisfaction_score(user_env, job_env), 2)
 
         results.append(
             {
-                "job_id": job.get("job_id", str(len(results) + 1)),
+                "job_id": str(i + 1),
                 "fit": fit,
                 "satisfaction": satisfaction,
                 "job_traits": job_traits,
@@ -135,3 +261,14 @@ def calculate_fit_scores(job_descriptions: list[str]) -> list[dict]:
         )
 
     return results
+
+
+def calculate_fit_scores(candidate: dict | None, job_descriptions: list[str]) -> list[dict]:
+    """Blocking wrapper around calculate_fit_scores_async for scripts (not for the event loop)."""
+    async def run():
+        try:
+            return await calculate_fit_scores_async(candidate, job_descriptions)
+        finally:
+            await close_llm_client()
+
+    return asyncio.run(run())
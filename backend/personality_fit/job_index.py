@@ -0,0 +1,324 @@
+# file: backend/personality_fit/job_index.py
+"""
+Nearest-neighbour index of job personality vectors.
+
+Each job is a 12-dimensional point (7 HEXACOG traits + 5 environment dims)
+scaled by FIT_W / ENV_W, so plain L1 distance D between a candidate and a
+job gives back the pair's scores: D = (100 − fit) + (100 − satisfaction)
+when every dimension is present, and the reported score is 100 − D/2
+(= the average of fit and satisfaction, as matrix_scoring with
+fit_weight=0.5). Missing dimensions are filled with the neutral midpoint.
+
+Layout (inverted file with triangle-inequality pruning):
+  - points are clustered around C centroids and stored cluster by cluster,
+    each cluster sorted by its distance to the centroid
+  - a query visits clusters by lower bound d(q, c) − radius(c) and stops once
+    no cluster can beat the current k-th best; inside a cluster only the
+    ring |d(q, c) − d(p, c)| ≤ k-th best can contain closer points
+  - inserts go to a small in-memory delta scanned exhaustively; deletes are
+    tombstones; compact() folds both back into the clustered layout, and
+    retrains the centroids once the index has grown RETRAIN_GROWTH times
+    past the size they were trained on
+  - save() writes plain .npy files into a new version directory, then swaps
+    manifest.json to point at it, so load() never sees arrays from two
+    different saves; load() memory-maps the version the manifest names
+"""
+
+import os
+import json
+import time
+import shutil
+import numpy as np
+
+from personality_fit.job_fit_analysis import FIT_W, ENV_W
+from personality_fit.matrix_scoring import TRAIT_KEYS, ENV_KEYS
+
+# ========== CONFIG ==========
+# Inserts kept outside the clustered layout before compact() runs automatically
+DELTA_MAX = int(os.getenv("JOB_INDEX_DELTA_MAX", "20000"))
+# compact() retrains centroids once the index is this many times the trained size
+RETRAIN_GROWTH = float(os.getenv("JOB_INDEX_RETRAIN_GROWTH", "2.0"))
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE = 100_000
+# Larger than any L1 distance (each half of the scaled space spans 0–100)
+RING_STRIDE = 512.0
+
+DIMS = TRAIT_KEYS + ENV_KEYS
+_SCALE = np.array(
+    [FIT_W[k] / sum(FIT_W.values()) for k in TRAIT_KEYS]
+    + [100.0 * ENV_W[k] / sum(ENV_W.values()) for k in ENV_KEYS],
+    dtype=np.float32,
+)
+_NEUTRAL = np.array([50.0] * len(TRAIT_KEYS) + [0.5] * len(ENV_KEYS), dtype=np.float32)
+
+_FILES = ("centroids", "radii", "offsets", "points", "dist", "ids", "alive")
+_MANIFEST = "manifest.json"
+
+
+# ========== VECTORS ==========
+def to_point(traits: dict, env: dict) -> np.ndarray:
+    """Trait (0–100) and environment (0–1) dicts -> scaled 12-d point."""
+    raw = _NEUTRAL.copy()
+    for i, k in enumerate(DIMS):
+        v = (traits if i < len(TRAIT_KEYS) else env).get(k)
+        if v is not None:
+            raw[i] = v
+    return raw * _SCALE
+
+
+def job_point(vec: dict) -> np.ndarray:
+    return to_point(vec.get("job_traits") or {}, vec.get("job_env") or {})
+
+
+def candidate_point(profile: dict) -> np.ndarray:
+    return to_point(profile.get("traits") or {}, profile.get("environment") or {})
+
+
+def _l1(points: np.ndarray, q: np.ndarray) -> np.ndarray:
+    return np.abs(points - q).sum(axis=1)
+
+
+def _nearest_centroid(points: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    """
+    Cluster assignment by squared L2 via one matrix product per chunk. Only
+    affects how tight clusters are; the pruning bounds are exact L1.
+    """
+    c_sq = (centroids ** 2).sum(axis=1)
+    out = np.empty(len(points), dtype=np.int32)
+    for s in range(0, len(points), chunk):
+        block = points[s:s + chunk]
+        out[s:s + chunk] = np.argmin(c_sq[None, :] - 2.0 * block @ centroids.T, axis=1)
+    return out
+
+
+def _train_centroids(points: np.ndarray, n_clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    sample = points[rng.choice(len(points), min(len(points), KMEANS_SAMPLE), replace=False)]
+    centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assign = _nearest_centroid(sample, centroids)
+        counts = np.bincount(assign, minlength=n_clusters)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        # Reseed empty clusters on random sample points
+        centroids[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+    return centroids
+
+
+# ========== INDEX ==========
+class JobIndex:
+    def __init__(self):
+        self.centroids = np.zeros((0, len(DIMS)), dtype=np.float32)
+        self.radii = np.zeros(0, dtype=np.float32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.points = np.zeros((0, len(DIMS)), dtype=np.float32)
+        self.dist = np.zeros(0, dtype=np.float32)
+        self.ids = np.zeros(0, dtype=str)
+        self.alive = np.zeros(0, dtype=bool)
+        self.trained_size = 0  # points the centroids were trained on
+        self._rows: dict[str, int] | None = None
+        self._keys: np.ndarray | None = None
+        self._delta: dict[str, np.ndarray] = {}
+        self._delta_cache = None
+
+    def __len__(self):
+        return int(self.alive.sum()) + len(self._delta)
+
+    # ---- building ----
+
+    @classmethod
+    def build(cls, job_ids: list[str], points: np.ndarray, n_clusters: int | None = None) -> "JobIndex":
+        """Index `points` (rows from job_point) under `job_ids`."""
+        index = cls()
+        points = np.asarray(points, dtype=np.float32).reshape(-1, len(DIMS))
+        if len(points):
+            n_clusters = n_clusters or max(1, min(len(points), int(np.sqrt(len(points)))))
+            index.centroids = _train_centroids(points, n_clusters)
+            index.trained_size = len(points)
+            # dtype=str sizes the fixed-width column to the longest id (never truncates)
+            index._layout(np.asarray(job_ids, dtype=str), points)
+        return index
+
+    def _layout(self, ids: np.ndarray, points: np.ndarray):
+        """Store points cluster by cluster, each sorted by distance to its centroid."""
+        assign = _nearest_centroid(points, self.centroids) if len(points) else np.zeros(0, np.int32)
+        dist = np.abs(points - self.centroids[assign]).sum(axis=1).astype(np.float32)
+        order = np.lexsort((dist, assign))
+        counts = np.bincount(assign, minlength=len(self.centroids))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.points = np.ascontiguousarray(points[order])
+        self.dist = dist[order]
+        self.ids = ids[order]
+        self.alive = np.ones(len(order), dtype=bool)
+        self.radii = np.zeros(len(self.centroids), dtype=np.float32)
+        nonempty = counts > 0
+        # Each cluster's dist slice is ascending, so its radius is the last entry
+        self.radii[nonempty] = self.dist[self.offsets[1:][nonempty] - 1]
+        self._rows = None
+        self._keys = None
+
+    def compact(self):
+        """
+        Fold pending inserts and deletes into the clustered layout. Centroids
+        are kept unless the index has outgrown them (see RETRAIN_GROWTH).
+        """
+        ids = [self.ids[self.alive]]
+        points = [np.asarray(self.points[self.alive])]
+        if self._delta:
+            ids.append(np.array(list(self._delta), dtype=str))
+            points.append(np.stack(list(self._delta.values())))
+        ids, points = np.concatenate(ids), np.concatenate(points)
+        if not len(self.centroids) or len(points) > RETRAIN_GROWTH * max(self.trained_size, 1):
+            fresh = JobIndex.build(ids, points)
+            self.__dict__.update(fresh.__dict__)
+        else:
+            self._layout(ids, points)
+        self._delta = {}
+        self._delta_cache = None
+
+    # ---- updates ----
+
+    def _row_of(self, job_id: str) -> int | None:
+        if self._rows is None:
+            self._rows = {job_id: i for i, job_id in enumerate(self.ids.tolist())}
+        return self._rows.get(job_id)
+
+    def add(self, job_id: str, point: np.ndarray):
+        """Insert or replace one job."""
+        self.remove(job_id)
+        self._delta[job_id] = np.asarray(point, dtype=np.float32)
+        self._delta_cache = None
+        if len(self._delta) >= DELTA_MAX:
+            self.compact()
+
+    def remove(self, job_id: str) -> bool:
+        """Tombstone a job (e.g. when the posting expires)."""
+        if self._delta.pop(job_id, None) is not None:
+            self._delta_cache = None
+            return True
+        row = self._row_of(job_id)
+        if row is None or not self.alive[row]:
+            return False
+        if not self.alive.flags.writeable:
+            self.alive = self.alive.copy()
+        self.alive[row] = False
+        return True
+
+    # ---- queries ----
+
+    def _ring_keys(self) -> np.ndarray:
+        """cluster * RING_STRIDE + d(p, c) per row: one sorted array for every cluster's ring."""
+        if self._keys is None:
+            clusters = np.repeat(np.arange(len(self.centroids)), np.diff(self.offsets))
+            self._keys = clusters * RING_STRIDE + self.dist.astype(np.float64)
+        return self._keys
+
+    def _delta_arrays(self) -> tuple[list[str], np.ndarray]:
+        if self._delta_cache is None:
+            ids = list(self._delta)
+            pts = np.stack([self._delta[i] for i in ids]) if ids else np.zeros((0, len(DIMS)), np.float32)
+            self._delta_cache = (ids, pts)
+        return self._delta_cache
+
+    def query(self, q: np.ndarray, k: int = 10) -> list[tuple[str, float]]:
+        """k best jobs for candidate point `q`: [(job_id, score 0–100)], best first."""
+        q = np.asarray(q, dtype=np.float32)
+        n_base = len(self.points)
+        delta_ids, delta_points = self._delta_arrays()
+        # Rows >= n_base refer to the delta
+        best_d = _l1(delta_points, q)
+        best_row = np.arange(n_base, n_base + len(delta_ids))
+
+        def merge(d, rows):
+            nonlocal best_d, best_row
+            best_d = np.concatenate([best_d, d])
+            best_row = np.concatenate([best_row, rows])
+            if len(best_d) > k:
+                keep = np.argpartition(best_d, k - 1)[:k]
+                best_d, best_row = best_d[keep], best_row[keep]
+            return best_d.max() if len(best_d) >= k else np.inf
+
+        kth = merge(best_d[:0], best_row[:0])
+        if len(self.centroids):
+            dq = _l1(self.centroids, q)
+            lower = np.maximum(dq - self.radii, 0.0)
+            order = np.argsort(lower)
+            pos, step = 0, 1
+            # Clusters are visited in growing groups, best lower bound first
+            while pos < len(order):
+                group = order[pos:pos + step]
+                pos, step = pos + step, min(step * 2, 32)
+                group = group[lower[group] < kth]
+                if not len(group):
+                    break
+                if kth == np.inf:
+                    lo, hi = self.offsets[group], self.offsets[group + 1]
+                else:
+                    # |d(q,c) − d(p,c)| ≤ d(q,p): only this ring of each cluster can hold closer points
+                    keys, base = self._ring_keys(), group * RING_STRIDE
+                    lo = np.searchsorted(keys, base + dq[group] - kth, side="left")
+                    hi = np.searchsorted(keys, base + dq[group] + kth, side="right")
+                lengths = hi - lo
+                rows = np.repeat(lo - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+                rows = rows[self.alive[rows]]
+                kth = merge(_l1(self.points[rows], q), rows)
+
+        results = []
+        for i in np.argsort(best_d, kind="stable"):
+            row = int(best_row[i])
+            job_id = str(self.ids[row]) if row < n_base else delta_ids[row - n_base]
+            results.append((job_id, round(100.0 - float(best_d[i]) / 2, 2)))
+        return results
+
+    def query_profile(self, profile: dict, k: int = 10) -> list[tuple[str, float]]:
+        """query() for a generate_candidate_profile() dict."""
+        return self.query(candidate_point(profile), k)
+
+    # ---- persistence ----
+
+    def save(self, path: str):
+        """
+        Compact and write one .npy per array into a new version directory under
+        `path`, then point manifest.json at it. The previous version is kept
+        for readers still opening it; older ones are removed.
+        """
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        previous = _read_manifest(path)
+        version = f"v{time.time_ns()}"
+        os.makedirs(os.path.join(path, version))
+        for name in _FILES:
+            np.save(os.path.join(path, version, f"{name}.npy"), getattr(self, name))
+        tmp = os.path.join(path, f"{_MANIFEST}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": version, "trained_size": self.trained_size}, f)
+        # Atomic swap: a reader sees either the old manifest or the new one
+        os.replace(tmp, os.path.join(path, _MANIFEST))
+
+        keep = {version, previous.get("version")}
+        for entry in os.listdir(path):
+            if entry.startswith("v") and entry not in keep:
+                shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str) -> "JobIndex":
+        """Memory-map a saved index; tombstones and inserts stay in memory until save()."""
+        manifest = _read_manifest(path)
+        if not manifest:
+            raise FileNotFoundError(f"No job index manifest in {path}")
+        index = cls()
+        for name in _FILES:
+            setattr(index, name, np.load(os.path.join(path, manifest["version"], f"{name}.npy"), mmap_mode="r"))
+        index.alive = np.array(index.alive)
+        index.trained_size = int(manifest.get("trained_size") or len(index.points))
+        return index
+
+
+def _read_manifest(path: str) -> dict:
+    try:
+        with open(os.path.join(path, _MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
@@ -0,0 +1,146 @@
+# file: backend/personality_fit/llm_client.py
+"""
+Shared async OpenAI client for the personality-fit LLM calls.
+
+- one AsyncOpenAI client (OPENAI_BASE_URL points it at any OpenAI-compatible
+  server, e.g. a local fake for testing)
+- a global concurrency cap and a requests-per-minute limiter
+- jittered exponential backoff that honours Retry-After, bounded by a
+  per-request deadline; waiting never blocks the event loop
+- identical in-flight requests share one API call
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+
+import openai
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+# ========== CONFIG ==========
+load_dotenv()
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Requests started per minute across the process (0 = unlimited)
+LLM_RPM = float(os.getenv("LLM_RPM", "300"))
+# Total seconds one request may take, retries and backoff included
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "90"))
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+RETRYABLE = (
+    openai.RateLimitError,
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.InternalServerError,
+)
+
+
+class LLMDeadlineExceeded(RuntimeError):
+    pass
+
+
+# ========== RATE LIMITING ==========
+class _RateLimiter:
+    """Evenly spaced request starts: at most `rpm` per minute."""
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self.next_start = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        start = max(now, self.next_start)
+        self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Seconds the server asked us to wait, from Retry-After(-ms) headers."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:  # HTTP-date form; fall back to our own backoff
+        return None
+    return None
+
+
+# ========== CLIENT ==========
+class LLMClient:
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY, rpm: float = LLM_RPM):
+        # max_retries=0: retries are handled here so their waits respect our deadline
+        self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=OPENAI_BASE_URL,
+                                   max_retries=0)
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._limiter = _RateLimiter(rpm)
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def chat(self, deadline: float = LLM_DEADLINE, **kwargs):
+        """
+        chat.completions.create(**kwargs) with retries. Concurrent calls with
+        identical kwargs share a single request and its result.
+        """
+        key = hashlib.sha256(json.dumps(kwargs, sort_keys=True, default=str).encode()).hexdigest()
+        shared = self._inflight.get(key)
+        if shared is not None:
+            return await asyncio.shield(shared)
+
+        task = asyncio.ensure_future(self._chat_with_retries(time.monotonic() + deadline, kwargs))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _chat_with_retries(self, expires_at: float, kwargs: dict):
+        for attempt in range(LLM_MAX_ATTEMPTS):
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                async with self._sem:
+                    await self._limiter.wait()
+                    return await self._client.chat.completions.create(
+                        timeout=max(0.1, expires_at - time.monotonic()), **kwargs
+                    )
+            except RETRYABLE as e:
+                delay = _retry_after(e)
+                if delay is None:
+                    # Full jitter keeps many waiting requests from retrying in lockstep
+                    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+                if attempt + 1 == LLM_MAX_ATTEMPTS or time.monotonic() + delay >= expires_at:
+                    raise
+                print(f"⚠️ LLM error: {e}. Retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+        raise LLMDeadlineExceeded("LLM request deadline exceeded")
+
+    async def close(self):
+        await self._client.close()
+
+
+_llm: LLMClient | None = None
+
+
+def get_llm_client() -> LLMClient:
+    global _llm
+    if _llm is None:
+        _llm = LLMClient()
+    return _llm
+
+
+async def close_llm_client():
+    global _llm
+    if _llm is not None:
+        await _llm.close()
+        _llm = None
@@ -0,0 +1,152 @@
+# file: backend/personality_fit/matrix_scoring.py
+"""
+Batch version of fit_score / satisfaction_score for many candidates × many jobs.
+
+Profiles are packed into dense float32 matrices with a fixed dimension order
+(TRAIT_KEYS, ENV_KEYS) plus boolean masks for missing dimensions. A missing
+dimension contributes 0 to the weighted sum, exactly as the per-pair
+functions skip it, so every cell matches fit_score / satisfaction_score.
+"""
+
+import numpy as np
+
+from personality_fit.job_fit_analysis import FIT_W, ENV_W
+
+# ========== LAYOUT ==========
+TRAIT_KEYS = tuple(FIT_W)
+ENV_KEYS = tuple(ENV_W)
+
+_FIT_WEIGHTS = np.array([FIT_W[k] for k in TRAIT_KEYS], dtype=np.float32)
+_ENV_WEIGHTS = np.array([ENV_W[k] for k in ENV_KEYS], dtype=np.float32)
+
+# Rows of candidates scored per step; bounds the temporary (rows × jobs) buffers
+CHUNK_ROWS = 256
+
+
+class ProfileMatrix:
+    """Packed traits (0–100) and environment (0–1) vectors with presence masks."""
+
+    __slots__ = ("traits", "trait_mask", "env", "env_mask")
+
+    def __init__(self, traits, trait_mask, env, env_mask):
+        self.traits = traits
+        self.trait_mask = trait_mask
+        self.env = env
+        self.env_mask = env_mask
+
+    def __len__(self):
+        return len(self.traits)
+
+
+def _pack(rows: list[dict], keys: tuple) -> tuple[np.ndarray, np.ndarray]:
+    values = np.array(
+        [[np.nan if row.get(k) is None else row[k] for k in keys] for row in rows],
+        dtype=np.float32,
+    ).reshape(len(rows), len(keys))
+    mask = np.isfinite(values)
+    return np.where(mask, values, 0.0).astype(np.float32), mask
+
+
+def pack_candidates(profiles: list[dict]) -> ProfileMatrix:
+    """Profiles shaped like generate_candidate_profile() output ({"traits", "environment"})."""
+    traits, trait_mask = _pack([p.get("traits") or {} for p in profiles], TRAIT_KEYS)
+    env, env_mask = _pack([p.get("environment") or {} for p in profiles], ENV_KEYS)
+    return ProfileMatrix(traits, trait_mask, env, env_mask)
+
+
+def pack_jobs(vectors: list[dict]) -> ProfileMatrix:
+    """Job vectors shaped like calculate_fit_scores() results ({"job_traits", "job_env"})."""
+    traits, trait_mask = _pack([v.get("job_traits") or {} for v in vectors], TRAIT_KEYS)
+    env, env_mask = _pack([v.get("job_env") or {} for v in vectors], ENV_KEYS)
+    return ProfileMatrix(traits, trait_mask, env, env_mask)
+
+
+# ========== SCORING ==========
+def _weighted_similarity(a, a_mask, b, b_mask, weights, scale) -> np.ndarray:
+    """
+    100 * Σ w·(1 − |a − b|/scale) over dims present in both, / Σ w, computed as
+    Σ w·m_a·m_b (one matrix product) minus Σ (w/scale)·m_a·m_b·|a − b|
+    (one in-place pass per dimension; mask multiplies skipped when complete).
+    """
+    a_w = a_mask * weights
+    out = (a_w @ b_mask.T.astype(np.float32)).astype(np.float32)
+    tmp = np.empty_like(out)
+    for k in range(len(weights)):
+        np.subtract(a[:, k, None], b[None, :, k], out=tmp)
+        np.abs(tmp, out=tmp)
+        tmp *= (a_w[:, k, None] / scale)
+        if not b_mask[:, k].all():
+            tmp *= b_mask[None, :, k]
+        out -= tmp
+    out *= 100.0 / weights.sum()
+    return out
+
+
+def fit_matrix(candidates: ProfileMatrix, jobs: ProfileMatrix) -> np.ndarray:
+    """(candidates × jobs) matrix of fit_score values."""
+    return _weighted_similarity(candidates.traits, candidates.trait_mask,
+                                jobs.traits, jobs.trait_mask, _FIT_WEIGHTS, 100.0)
+
+
+def satisfaction_matrix(candidates: ProfileMatrix, jobs: ProfileMatrix) -> np.ndarray:
+    """(candidates × jobs) matrix of satisfaction_score values."""
+    return _weighted_similarity(candidates.env, candidates.env_mask,
+                                jobs.env, jobs.env_mask, _ENV_WEIGHTS, 1.0)
+
+
+def _rows(m: ProfileMatrix, start: int, stop: int) -> ProfileMatrix:
+    return ProfileMatrix(m.traits[start:stop], m.trait_mask[start:stop],
+                         m.env[start:stop], m.env_mask[start:stop])
+
+
+def score_chunks(candidates: ProfileMatrix, jobs: ProfileMatrix, fit_weight: float = 0.5,
+                 chunk_rows: int = CHUNK_ROWS):
+    """
+    Yield (row_offset, scores) blocks of the combined score
+    fit_weight·fit + (1 − fit_weight)·satisfaction, CHUNK_ROWS candidates at a
+    time, so the full matrix never has to be held in memory.
+    """
+    for start in range(0, len(candidates), chunk_rows):
+        block = _rows(candidates, start, start + chunk_rows)
+        scores = np.zeros((len(block), len(jobs)), dtype=np.float32)
+        if fit_weight:
+            scores += fit_weight * fit_matrix(block, jobs)
+        if fit_weight != 1.0:
+            scores += (1.0 - fit_weight) * satisfaction_matrix(block, jobs)
+        yield start, scores
+
+
+def _top_k_rows(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Column indexes and values of the k best entries per row, best first."""
+    k = min(k, scores.shape[1])
+    idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    vals = np.take_along_axis(scores, idx, axis=1)
+    order = np.argsort(-vals, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(vals, order, axis=1)
+
+
+def top_k_jobs(candidates: ProfileMatrix, jobs: ProfileMatrix, k: int = 10,
+               fit_weight: float = 0.5, chunk_rows: int = CHUNK_ROWS):
+    """Best k jobs per candidate: (indexes, scores), both shaped (candidates × k)."""
+    k = min(k, len(jobs))
+    idx = np.empty((len(candidates), k), dtype=np.int64)
+    vals = np.empty((len(candidates), k), dtype=np.float32)
+    for start, scores in score_chunks(candidates, jobs, fit_weight, chunk_rows):
+        idx[start:start + len(scores)], vals[start:start + len(scores)] = _top_k_rows(scores, k)
+    return idx, vals
+
+
+def top_k_candidates(candidates: ProfileMatrix, jobs: ProfileMatrix, k: int = 10,
+                     fit_weight: float = 0.5, chunk_rows: int = CHUNK_ROWS):
+    """Best k candidates per job: (indexes, scores), both shaped (jobs × k)."""
+    k = min(k, len(candidates))
+    best_idx = np.empty((len(jobs), 0), dtype=np.int64)
+    best_vals = np.empty((len(jobs), 0), dtype=np.float32)
+    for start, scores in score_chunks(candidates, jobs, fit_weight, chunk_rows):
+        # Merge this chunk's columns into the running per-job top k
+        cand_vals = np.concatenate([best_vals, scores.T], axis=1)
+        chunk_idx = np.broadcast_to(np.arange(start, start + len(scores)), (len(jobs), len(scores)))
+        cand_idx = np.concatenate([best_idx, chunk_idx], axis=1)
+        pick, best_vals = _top_k_rows(cand_vals, k)
+        best_idx = np.take_along_axis(cand_idx, pick, axis=1)
+    return best_idx, best_vals
@@ -0,0 +1,188 @@
+"""
+Resume Ingestion
+----------------
+Turns an uploaded resume (in-memory bytes or a spooled temp file) into plain
+text without blocking the event loop.
+
+- uploads are read in chunks and rejected as soon as they exceed the byte cap
+- PDF/DOCX/TXT parsing runs in a bounded process pool, so concurrent uploads
+  parse in parallel instead of serializing on the GIL; workers are spawned,
+  so they don't inherit the server's event loop, sockets or browser state
+- PDFs are read page by page (up to the page cap) with PDFium when available,
+  falling back to pdfminer
+"""
+
+import io
+import os
+import asyncio
+import multiprocessing
+from typing import BinaryIO, Union
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+from docx import Document
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTTextContainer
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # optional fast path (installed with pdfplumber)
+    pdfium = None
+
+
+# =============== CONFIG ===============
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", "200000"))
+RESUME_WORKERS = int(os.getenv("RESUME_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Parses waiting for a worker; further uploads wait before their bytes are shipped
+RESUME_MAX_PENDING = int(os.getenv("RESUME_MAX_PENDING", str(RESUME_WORKERS * 4)))
+READ_CHUNK = 256 * 1024
+
+SUPPORTED = {".pdf", ".docx", ".txt"}
+
+
+class ResumeTooLarge(ValueError):
+    pass
+
+
+# =============== EXTRACTORS (run in worker processes) ===============
+
+def _capped_join(parts, max_chars: int) -> str:
+    out, total = [], 0
+    for part in parts:
+        out.append(part)
+        total += len(part)
+        if total >= max_chars:
+            break
+    return "\n".join(out)[:max_chars]
+
+
+def _pdf_pages_pdfium(data: bytes, max_pages: int):
+    pdf = pdfium.PdfDocument(data)
+    try:
+        for i in range(min(len(pdf), max_pages)):
+            page = pdf[i]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range()
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+    finally:
+        pdf.close()
+
+
+def _pdf_pages_pdfminer(data: bytes, max_pages: int):
+    for layout in extract_pages(io.BytesIO(data), maxpages=max_pages):
+        yield "".join(el.get_text() for el in layout if isinstance(el, LTTextContainer))
+
+
+def _pdf_text(data: bytes, max_pages: int, max_chars: int) -> str:
+    if pdfium is not None:
+        try:
+            text = _capped_join(_pdf_pages_pdfium(data, max_pages), max_chars)
+            if text.strip():
+                return text
+        except Exception as e:
+            print(f"⚠️ PDFium extraction failed ({e}); falling back to pdfminer")
+    return _capped_join(_pdf_pages_pdfminer(data, max_pages), max_chars)
+
+
+def _docx_text(data: bytes, max_chars: int) -> str:
+    doc = Document(io.BytesIO(data))
+    return _capped_join((p.text for p in doc.paragraphs), max_chars)
+
+
+def extract_text_from_bytes(data: bytes, suffix: str, max_pages: int = RESUME_MAX_PAGES,
+                            max_chars: int = RESUME_MAX_CHARS) -> str:
+    """Raw text of a PDF, DOCX, or TXT file's bytes."""
+    if suffix == ".pdf":
+        return _pdf_text(data, max_pages, max_chars)
+    elif suffix == ".docx":
+        return _docx_text(data, max_chars)
+    elif suffix == ".txt":
+        return data[:max_chars * 4].decode("utf-8", errors="replace")[:max_chars]
+    else:
+        raise ValueError("Unsupported file type. Please upload PDF, DOCX, or TXT.")
+
+
+# =============== INPUT ===============
+
+def detect_suffix(filename: str | None, head: bytes) -> str:
+    """File type from the name, or from magic bytes when the name doesn't say."""
+    suffix = os.path.splitext(filename or "")[1].lower()
+    if suffix in SUPPORTED:
+        return suffix
+    if head.startswith(b"%PDF"):
+        return ".pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return ".docx"
+    raise ValueError("Unsupported file type. Please upload PDF, DOCX, or TXT.")
+
+
+def read_capped(source: Union[bytes, BinaryIO], max_bytes: int = RESUME_MAX_BYTES) -> bytes:
+    """Bytes of `source`, read in chunks; raises ResumeTooLarge past `max_bytes`."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        if len(source) > max_bytes:
+            raise ResumeTooLarge(f"Resume exceeds {max_bytes // (1024 * 1024)} MB limit.")
+        return bytes(source)
+
+    buf = io.BytesIO()
+    while True:
+        chunk = source.read(READ_CHUNK)
+        if not chunk:
+            return buf.getvalue()
+        if buf.tell() + len(chunk) > max_bytes:
+            raise ResumeTooLarge(f"Resume exceeds {max_bytes // (1024 * 1024)} MB limit.")
+        buf.write(chunk)
+
+
+# =============== WORKER POOL ===============
+
+_pool: ProcessPoolExecutor | None = None
+_pending: asyncio.Semaphore | None = None
+
+
+def get_ingest_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=RESUME_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_ingest_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def ingest_resume(source: Union[bytes, BinaryIO], filename: str | None = None) -> str:
+    """
+    Extract text from an upload. `source` is bytes or a binary file object
+    (e.g. UploadFile.file, a SpooledTemporaryFile); reading and parsing both
+    happen off the event loop. A file the parser can't read (corrupt,
+    truncated) is a 400, not a server error.
+    """
+    global _pending
+    if _pending is None:
+        _pending = asyncio.Semaphore(RESUME_MAX_PENDING)
+
+    data = await asyncio.to_thread(read_capped, source)
+    suffix = detect_suffix(filename, data[:8])
+
+    async with _pending:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(get_ingest_pool(), extract_text_from_bytes, data, suffix)
+        except BrokenProcessPool:
+            raise  # our failure (worker died), not the upload's
+        except Exception as e:
+            print(f"⚠️ Resume parse failed ({type(e).__name__}: {e})")
+            raise HTTPException(status_code=400,
+                                detail=f"Could not read the {suffix[1:].upper()} file; it may be corrupt or truncated.") from e
@@ -9,8 +9,9 @@ import re
 import json
 from typing import Dict, Optional
 from pathlib import Path
-from docx import Document
-from pdfminer.high_level import extract_text
+
+from .ingest import extract_text_from_bytes
+from .skills import extract_skills
 
 
 # =============== UTILITIES ===============
@@ -18,15 +19,7 @@ from pdfminer.high_level import extract_text
 def read_file_text(file_path: str) -> str:
     """Extract raw text from a PDF, DOCX, or TXT file."""
     path = Path(file_path)
-    if path.suffix.lower() == ".pdf":
-        return extract_text(path)
-    elif path.suffix.lower() == ".docx":
-        doc = Document(path)
-        return "\n".join(p.text for p in doc.paragraphs)
-    elif path.suffix.lower() == ".txt":
-        return path.read_text(encoding="utf-8")
-    else:
-        raise ValueError("Unsupported file type. Please upload PDF, DOCX, or TXT.")
+    return extract_text_from_bytes(path.read_bytes(), path.suffix.lower())
 
 
 def clean_text(text: str) -> str:
@@ -39,26 +32,29 @@ def clean_text(text: str) -> str:
 # =============== PARSER CORE ===============
 
 def parse_resume(file_path: str) -> Dict[str, Optional[str]]:
-    """Extract key information from a resume."""
-    raw_text = clean_text(read_file_text(file_path))
+    """Extract key information from a resume file."""
+    return parse_resume_text(read_file_text(file_path))
+
+
+def parse_resume_text(text: str) -> Dict[str, Optional[str]]:
+    """Extract key information from a resume's raw text (see ingest.ingest_resume)."""
+    raw_text = clean_text(text)
 
     # Example regex patterns (simple baseline)
     email = re.search(r"[\w\.-]+@[\w\.-]+\.\w+", raw_text)
     phone = re.search(r"\+?\d[\d\s\-]{7,}\d", raw_text)
     name = raw_text.split("\n")[0].strip() if raw_text else None
 
-    # Find key skills
-    skills_keywords = [
-        "Python", "Java", "C++", "Machine Learning", "Excel", "Communication",
-        "Leadership", "SQL", "Data Analysis", "FastAPI", "Django", "React"
-    ]
-    found_skills = [s for s in skills_keywords if s.lower() in raw_text.lower()]
+    # Find skills (taxonomy-based, most mentioned first)
+    hits = sorted(extract_skills(raw_text).values(), key=lambda h: -h.count)
+    found_skills = [h.name for h in hits]
 
     return {
         "name": name,
         "email": email.group(0) if email else None,
         "phone": phone.group(0) if phone else None,
         "skills": found_skills or None,
+        "skill_ids": [h.id for h in hits],
         "summary_length": len(raw_text.split()),
     }
 
@@ -0,0 +1,192 @@
+"""
+Skills Extraction
+-----------------
+Single-pass skill tagging for resumes and job descriptions.
+
+The taxonomy has one skill per line: {"id", "name", "category", "aliases",
+"case_sensitive"}. The bundled data/skills_taxonomy.jsonl is only a seed
+(~350 skills across tech, office, retail, service and trades work);
+deployments point SKILLS_TAXONOMY_PATH at their full taxonomy in the same
+format. Scan cost depends on the text, not on the taxonomy size.
+Every name/alias is split into word tokens and inserted into a token trie,
+compiled once per process. Scanning tokenizes the text once and walks the
+trie from each token, keeping the longest match, so:
+  - matches always start and end on word boundaries ("Java" never matches
+    inside "JavaScript")
+  - multi-word skills win over their parts ("Machine Learning", not "Learning")
+  - separators don't matter ("CI/CD" == "CI CD", "problem-solving" ==
+    "problem solving")
+Terms listed under "case_sensitive" (e.g. "Go", "R", "POS") must also match
+the original spelling exactly, to keep common words from counting as skills.
+Those and other very short terms are also rejected when glued to "&", "-"
+or "/" ("R&D", "C-suite", "Go-getter"), unless the slash joins two skills
+("UX/UI", "C/C++").
+"""
+
+import os
+import re
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+# =============== CONFIG ===============
+
+DEFAULT_TAXONOMY = Path(__file__).parent / "data" / "skills_taxonomy.jsonl"
+SKILLS_TAXONOMY_PATH = os.getenv("SKILLS_TAXONOMY_PATH", str(DEFAULT_TAXONOMY))
+
+# Word tokens: alphanumeric runs, internal dots (node.js, asp.net), a leading
+# dot (.net) and trailing +/# (c++, c#)
+_TOKEN_RE = re.compile(r"\.?[a-z0-9]+(?:\.[a-z0-9]+)*[+#]*", re.I)
+
+_END = "\0"  # trie key holding the terms that end at a node
+_GLUE = ("&", "-")  # never a list separator: "R&D", "C-suite"
+SHORT_TERM = 2  # terms this short (in characters) get the joiner check
+
+
+class SkillHit(NamedTuple):
+    id: str
+    name: str
+    category: Optional[str]
+    count: int
+    offsets: List[Tuple[int, int]]
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, int, int]]:
+    """(lowercased token, start, end) for every word token in `text`."""
+    for m in _TOKEN_RE.finditer(text):
+        yield m.group().lower(), m.start(), m.end()
+
+
+# =============== ENGINE ===============
+
+class SkillExtractor:
+    def __init__(self, taxonomy: Iterable[dict]):
+        self.skills: Dict[str, dict] = {}
+        self._trie: dict = {}
+        self.max_tokens = 0
+        for entry in taxonomy:
+            self.add_skill(entry)
+
+    @classmethod
+    def from_file(cls, path: str = SKILLS_TAXONOMY_PATH) -> "SkillExtractor":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def add_skill(self, entry: dict):
+        skill_id = entry["id"]
+        self.skills[skill_id] = entry
+        exact = set(entry.get("case_sensitive") or [])
+        terms = {entry["name"], *(entry.get("aliases") or []), *exact}
+        for term in terms:
+            tokens = [tok for tok, _, _ in tokenize(term)]
+            if not tokens:
+                continue
+            node = self._trie
+            for tok in tokens:
+                node = node.setdefault(tok, {})
+            guarded = term in exact or len(term) <= SHORT_TERM
+            node.setdefault(_END, []).append((skill_id, term if term in exact else None, guarded))
+            self.max_tokens = max(self.max_tokens, len(tokens))
+
+    def _match_at(self, text: str, tokens: list, i: int):
+        """Longest term starting at token i: (skill_id, start, end, last token, guarded) or None."""
+        node, best, j, n = self._trie, None, i, len(tokens)
+        while j < n and j - i < self.max_tokens:
+            node = node.get(tokens[j][0])
+            if node is None:
+                break
+            for skill_id, exact, guarded in node.get(_END, ()):
+                start, end = tokens[i][1], tokens[j][2]
+                if exact is None or text[start:end] == exact:
+                    best = (skill_id, start, end, j, guarded)
+                    break
+            j += 1
+        return best
+
+    def _clear_of_joiners(self, text: str, tokens: list, match, prev_end: int) -> bool:
+        """A short/case-sensitive match may only touch "/" when the other side is a skill too."""
+        _, start, end, j, _ = match
+        left = text[start - 1] if start > 0 else ""
+        right = text[end] if end < len(text) else ""
+        if left in _GLUE or right in _GLUE:
+            return False
+        if left == "/" and prev_end != start - 1:
+            return False
+        if right == "/":
+            nxt = j + 1
+            if nxt >= len(tokens) or tokens[nxt][1] != end + 1 or self._match_at(text, tokens, nxt) is None:
+                return False
+        return True
+
+    def scan(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """(skill_id, start, end) for every leftmost-longest match, in text order."""
+        if not text:
+            return
+        tokens = list(tokenize(text))
+        i, n, prev_end = 0, len(tokens), -1
+        while i < n:
+            best = self._match_at(text, tokens, i)
+            if best is not None and best[4] and not self._clear_of_joiners(text, tokens, best, prev_end):
+                best = None
+            if best is None:
+                i += 1
+            else:
+                yield best[:3]
+                prev_end = best[2]
+                i = best[3] + 1
+
+    def extract(self, text: str) -> Dict[str, SkillHit]:
+        """Skills found in `text` with counts and (start, end) offsets, in order of first mention."""
+        offsets: Dict[str, List[Tuple[int, int]]] = {}
+        for skill_id, start, end in self.scan(text):
+            offsets.setdefault(skill_id, []).append((start, end))
+        return {
+            skill_id: SkillHit(skill_id, self.skills[skill_id]["name"], self.skills[skill_id].get("category"),
+                               len(spans), spans)
+            for skill_id, spans in offsets.items()
+        }
+
+    def tag(self, text: str) -> Dict[str, int]:
+        """Skill id -> mention count; the compact form used to tag job descriptions."""
+        counts: Dict[str, int] = {}
+        for skill_id, _, _ in self.scan(text):
+            counts[skill_id] = counts.get(skill_id, 0) + 1
+        return counts
+
+
+# =============== PUBLIC API ===============
+
+_extractor: Optional[SkillExtractor] = None
+
+
+def get_skill_extractor() -> SkillExtractor:
+    """Process-wide extractor, compiled from the taxonomy file on first use."""
+    global _extractor
+    if _extractor is None:
+        _extractor = SkillExtractor.from_file()
+    return _extractor
+
+
+def extract_skills(text: str) -> Dict[str, SkillHit]:
+    return get_skill_extractor().extract(text)
+
+
+def tag_job_descriptions(descriptions: Iterable[str]) -> List[Dict[str, int]]:
+    """Skill counts for each job description, for matching resumes to jobs."""
+    extractor = get_skill_extractor()
+    return [extractor.tag(text or "") for text in descriptions]
+
+
+def skill_overlap(resume_skills: Iterable[str], job_skills: Iterable[str]) -> float:
+    """Share (0–1) of a job's skills that the resume has."""
+    job = set(job_skills)
+    return len(job & set(resume_skills)) / len(job) if job else 0.0
+
+
+# =============== TEST ENTRY POINT ===============
+
+if __name__ == "__main__":
+    sample = "Built REST APIs in Python/Django and JavaScript (React, Node.js); CI/CD with Docker. Cash handling, POS."
+    for hit in extract_skills(sample).values():
+        print(f"{hit.id:24} {hit.count}  {hit.offsets}")
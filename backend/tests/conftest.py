@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the packages the same way the app does (run from backend/)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from utils.compression import CompressionMiddleware, add_vary
+
+
+def make_app(body: bytes, headers=()):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"), *headers]})
+        await send({"type": "http.response.body", "body": body})
+    return TestClient(CompressionMiddleware(app, minimum_size=100))
+
+
+def test_compressed_response_merges_into_existing_vary():
+    client = make_app(b"x" * 500, [(b"vary", b"Origin")])
+    r = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers.get_list("vary") == ["Origin, Accept-Encoding"]
+    assert r.content == b"x" * 500
+
+
+def test_small_response_passes_through_with_vary():
+    r = make_app(b"tiny").get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+    assert r.headers.get_list("vary") == ["Accept-Encoding"]
+
+
+def test_identity_client_still_gets_vary():
+    r = make_app(b"x" * 500).get("/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers
+    assert r.headers.get_list("vary") == ["Accept-Encoding"]
+
+
+def test_add_vary_does_not_duplicate():
+    assert add_vary([(b"Vary", b"accept-encoding, Origin")]) == [(b"vary", b"accept-encoding, Origin")]
+    assert add_vary([(b"vary", b"*")]) == [(b"vary", b"*")]
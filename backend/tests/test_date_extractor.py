@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from job_search.utils.date_extractor import extract_from_markup, parse_date, scan_text
+
+NOW = datetime(2026, 10, 15, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("text, posted_at, confidence", [
+    ("Posted 3 days ago", "2026-10-12T12:00:00Z", "medium"),
+    ("Posted today", "2026-10-15T12:00:00Z", "medium"),
+    ("just posted", "2026-10-15T12:00:00Z", "medium"),
+    ("Posted on Oct 1, 2026", "2026-10-01T00:00:00Z", "medium"),
+    # Bounds and rounded counts are only low confidence
+    ("Job posted 30+ days ago", "2026-09-15T12:00:00Z", "low"),
+    ("Posted 2 months ago", "2026-08-15T12:00:00Z", "low"),
+])
+def test_scan_text(text, posted_at, confidence):
+    info = scan_text(text, NOW)
+    assert (info.posted_at, info.confidence, info.source) == (posted_at, confidence, "text")
+
+
+def test_scan_text_ignores_non_posting_phrases():
+    assert scan_text("Apply today! Interviews start next week.", NOW) is None
+
+
+def test_medium_match_beats_earlier_low_match():
+    info = scan_text("Updated 2 months ago\nPosted 3 days ago", NOW)
+    assert info.posted_at == "2026-10-12T12:00:00Z"
+
+
+@pytest.mark.parametrize("html, source, confidence", [
+    ('<script type="application/ld+json">{"datePosted": "2026-10-01T00:00:00Z"}</script>', "jsonld", "high"),
+    ('<meta property="article:published_time" content="2026-10-01">', "meta", "medium"),
+    ('<time datetime="2026-10-01">Oct 1</time>', "time", "medium"),
+])
+def test_extract_from_markup(html, source, confidence):
+    info = extract_from_markup(html, NOW)
+    assert (info.posted_at, info.source, info.confidence) == ("2026-10-01T00:00:00Z", source, confidence)
+
+
+def test_markup_prefers_jsonld_and_skips_implausible_dates():
+    html = ('<time datetime="2026-10-03">x</time>'
+            '<script>{"datePosted": "2031-01-01"}</script><script>{"datePosted": "2026-10-01"}</script>')
+    assert extract_from_markup(html, NOW).source == "jsonld"
+    assert extract_from_markup(html, NOW).posted_at == "2026-10-01T00:00:00Z"
+    assert extract_from_markup('<meta name="x" content="2026-10-02">', NOW) is None
+
+
+@pytest.mark.parametrize("value", ["2026-10-01", "2026-10-01T00:00:00Z", "Oct 1, 2026", "10/01/2026"])
+def test_parse_date(value):
+    assert parse_date(value) == datetime(2026, 10, 1, tzinfo=timezone.utc)
@@ -0,0 +1,46 @@
+import numpy as np
+
+from job_search.utils.job_record import as_record
+from job_search.utils.dedup import assign_clusters, cluster_ids, minhash_signature, normalize_company
+
+DESCRIPTION = (
+    "We are hiring a full-time cashier to run the register, handle returns, keep the front "
+    "of the store tidy and help customers find what they need. Weekend availability required."
+)
+
+
+def job(title="Cashier", company="Corner Market Inc.", city="Austin", description=DESCRIPTION):
+    return {"job_title": title, "employer_name": company, "job_city": city, "job_description": description}
+
+
+def test_signature_is_deterministic_and_similarity_tracks_overlap():
+    a, b = minhash_signature(DESCRIPTION), minhash_signature(DESCRIPTION)
+    assert np.array_equal(a, b)
+    reworded = DESCRIPTION.replace("Weekend availability required.", "Apply in store.")
+    unrelated = minhash_signature("Senior backend engineer building distributed payment systems in Go.")
+    assert np.mean(a == minhash_signature(reworded)) > np.mean(a == unrelated)
+
+
+def test_company_suffixes_are_ignored():
+    assert normalize_company("Corner Market Inc.") == normalize_company("corner market")
+
+
+def test_reposts_cluster_onto_the_first_occurrence():
+    jobs = [
+        job(),
+        job(title="Line Cook", description="Prep and cook menu items on the line during dinner service."),
+        job(company="Corner Market"),                       # same posting, company suffix dropped
+        job(description=DESCRIPTION + " Apply today."),      # lightly edited repost
+    ]
+    assert cluster_ids(jobs) == [0, 1, 0, 0]
+
+
+def test_same_text_at_other_company_or_city_is_not_a_duplicate():
+    jobs = [job(), job(company="Other Grocer"), job(city="Denver")]
+    assert cluster_ids(jobs) == [0, 1, 2]
+
+
+def test_assign_clusters_tags_in_place():
+    jobs = [as_record(job()), as_record(job())]
+    assert assign_clusters(jobs) is jobs
+    assert [j.cluster_id for j in jobs] == [0, 0]
@@ -0,0 +1,75 @@
+import time
+
+from job_search.utils import domain_scheduler
+from job_search.utils.domain_scheduler import DomainScheduler, Deadline, BREAKER_THRESHOLD
+
+
+def _trip(sched, host, kind="fetch"):
+    for _ in range(BREAKER_THRESHOLD):
+        sched.record(host, kind, ok=False)
+
+
+def _expire_cooldown(sched, host, kind="fetch"):
+    breaker = getattr(sched._state(host), kind)
+    breaker.open_until = time.monotonic() - 1
+
+
+def test_half_open_breaker_lets_a_single_trial_through():
+    sched = DomainScheduler()
+    _trip(sched, "a.example")
+    assert not sched.begin("a.example", "fetch")
+
+    _expire_cooldown(sched, "a.example")
+    assert sched.plan("a.example") == "fetch"
+    assert sched.begin("a.example", "fetch")
+    # Trial is out: everyone else waits for its verdict
+    assert not sched.begin("a.example", "fetch")
+    assert sched.plan("a.example") == "render"
+
+    sched.record("a.example", "fetch", ok=True)
+    assert sched.begin("a.example", "fetch") and sched.begin("a.example", "fetch")
+
+
+def test_failed_trial_reopens_the_breaker():
+    sched = DomainScheduler()
+    _trip(sched, "a.example")
+    _expire_cooldown(sched, "a.example")
+    assert sched.begin("a.example", "fetch")
+    sched.record("a.example", "fetch", ok=False)
+    assert not sched.begin("a.example", "fetch")
+
+
+def test_lost_trial_expires_after_a_cooldown():
+    sched = DomainScheduler()
+    _trip(sched, "a.example")
+    _expire_cooldown(sched, "a.example")
+    assert sched.begin("a.example", "fetch")
+    sched._state("a.example").fetch.trial_started -= domain_scheduler.BREAKER_COOLDOWN + 1
+    assert sched.begin("a.example", "fetch")
+
+
+def test_deadline_rejection_gives_back_the_reserved_start():
+    sched = DomainScheduler()
+    state = sched._state("a.example")
+    state.next_start = time.monotonic() + 5  # host busy for a while
+    before = state.next_start
+    with sched.slot("a.example", Deadline(1)) as acquired:
+        assert not acquired
+    assert state.next_start == before
+
+
+def test_idle_hosts_are_evicted(monkeypatch):
+    monkeypatch.setattr(domain_scheduler, "MAX_HOSTS", 10)
+    sched = DomainScheduler()
+    for i in range(10):
+        sched._state(f"h{i}.example")
+    with sched.slot("h0.example") as acquired:
+        assert acquired
+        sched._state("new.example")  # over the cap: LRU idle hosts go, h0 is in use
+        assert "h0.example" in sched._hosts
+    assert len(sched._hosts) <= 10 and "new.example" in sched._hosts
+
+    monkeypatch.setattr(domain_scheduler, "HOST_IDLE_TTL", 0)
+    sched._last_sweep = 0
+    sched._state("other.example")
+    assert list(sched._hosts) == ["other.example"]
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from job_search.utils import enrichment_queue
+from job_search.utils.enrichment_queue import EnrichmentQueue, MAX_ATTEMPTS
+
+JOB = {"job_id": "j1", "job_apply_link": "https://jobs.example.com/apply/1?utm_source=x"}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return EnrichmentQueue(str(tmp_path / "queue.sqlite3"))
+
+
+def expire_lease(queue, url_key):
+    queue._conn.execute("UPDATE tasks SET locked_until = ? WHERE url_key = ?", (time.time() - 1, url_key))
+
+
+def make_ready(queue, url_key):
+    queue._conn.execute("UPDATE tasks SET next_run_at = ? WHERE url_key = ?", (time.time() - 1, url_key))
+
+
+def test_claim_complete(queue):
+    assert queue.enqueue(JOB)
+    assert not queue.enqueue(JOB)  # already queued
+    url_key, lease, job = queue.claim()
+    assert job["job_id"] == "j1"
+    assert queue.claim() is None  # leased
+    assert queue.complete(url_key, lease)
+    assert queue.stats() == {"done": 1}
+
+
+def test_expired_lease_is_reclaimed_and_the_stale_worker_is_ignored(queue):
+    queue.enqueue(JOB)
+    url_key, stale, _ = queue.claim()
+    expire_lease(queue, url_key)
+
+    _, fresh, _ = queue.claim()
+    assert fresh != stale
+    assert not queue.complete(url_key, stale)
+    assert not queue.fail(url_key, stale, "late")
+    assert queue.stats() == {"running": 1}
+
+    assert queue.complete(url_key, fresh)
+    assert queue.stats() == {"done": 1}
+
+
+def test_fail_backs_off_then_gives_up(queue, monkeypatch):
+    monkeypatch.setattr(enrichment_queue, "RETRY_BASE_DELAY", 10)
+    queue.enqueue(JOB)
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        url_key, lease, _ = queue.claim()
+        assert queue.fail(url_key, lease, f"blocked #{attempt}")
+        status, attempts, next_run_at = queue._conn.execute(
+            "SELECT status, attempts, next_run_at FROM tasks").fetchone()
+        assert attempts == attempt
+        if attempt < MAX_ATTEMPTS:
+            assert status == "pending"
+            assert next_run_at - time.time() >= 10 * 2 ** (attempt - 1) * 0.8 - 1
+            assert queue.claim() is None  # still backing off
+            make_ready(queue, url_key)
+    assert status == "failed"
+    assert queue.claim() is None
+
+    assert queue.enqueue(JOB)  # a later cache miss queues it afresh
+    assert queue._conn.execute("SELECT status, attempts FROM tasks").fetchone() == ("pending", 0)
+
+
+def test_old_queue_files_get_the_lease_column(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    old = EnrichmentQueue(path)
+    old._conn.execute("ALTER TABLE tasks DROP COLUMN lease")
+    queue = EnrichmentQueue(path)
+    queue.enqueue(JOB)
+    url_key, lease, _ = queue.claim()
+    assert queue.complete(url_key, lease)
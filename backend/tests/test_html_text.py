@@ -0,0 +1,42 @@
+import pytest
+
+from job_search.utils import html_text
+from job_search.utils.html_text import html_to_text
+
+PAGE = (
+    "<html><head><style>p { color: red }</style><script>var pay = '$99 per hour';</script></head>"
+    "<body><h1>Cashier</h1><p>Pay: <b>$15</b> per hour</p><!-- hidden -->"
+    "<p>Posted 3 days ago</p></body></html>"
+)
+BACKENDS = ["stream", "bs4"] + (["lxml"] if html_text.etree is not None else [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_match_beautifulsoup(backend):
+    assert html_to_text(PAGE, backend=backend) == "Cashier\nPay:\n$15\nper hour\nPosted 3 days ago"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_max_chars_caps_the_html_read(backend):
+    page = "<p>first</p>" + "<p>filler</p>" * 100 + "<p>last</p>"
+    text = html_to_text(page, backend=backend, max_chars=200)
+    assert text.startswith("first") and "last" not in text
+
+
+@pytest.mark.parametrize("backend", [b for b in BACKENDS if b != "bs4"])
+def test_stop_when_ends_parsing_early(backend, monkeypatch):
+    monkeypatch.setattr(html_text, "CHUNK_CHARS", 64)
+    page = "<p>Pay: $15 per hour</p>" + "<p>more text</p>" * 200 + "<p>the end</p>"
+    seen = []
+
+    def stop(new_text):
+        seen.append(new_text)
+        return "$15" in new_text
+
+    text = html_to_text(page, stop_when=stop, backend=backend)
+    assert "$15" in text and "the end" not in text
+    assert len(seen) == 1
+
+
+def test_empty_page():
+    assert html_to_text("") == ""
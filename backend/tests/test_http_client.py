@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+from job_search import aggregator
+from job_search.utils import http_client
+
+
+def test_sync_fetch_uses_a_private_client_and_leaves_the_shared_one_open(monkeypatch):
+    async def shared():
+        return http_client.get_async_client()
+
+    loop = asyncio.new_event_loop()
+    shared_client = loop.run_until_complete(shared())
+    seen = []
+
+    async def fetch_all_sources(*args, **kwargs):
+        seen.append(http_client.get_async_client())
+        return []
+
+    monkeypatch.setattr(aggregator, "fetch_all_sources", fetch_all_sources)
+    # As from _refresh_in_background: asyncio.run on a worker thread
+    worker = threading.Thread(target=aggregator.fetch_all_sources_sync, args=("cashier", "Austin"))
+    worker.start()
+    worker.join()
+
+    assert seen and seen[0] is not shared_client and seen[0].is_closed
+    assert not shared_client.is_closed
+    assert loop.run_until_complete(shared()) is shared_client
+    loop.run_until_complete(http_client.close_async_client())
+    loop.close()
+
+
+def test_refresh_pool_shutdown(monkeypatch):
+    ran = threading.Event()
+    monkeypatch.setattr(aggregator, "search_live", lambda *args: ran.set())
+    aggregator._refresh_in_background("cashier", "Austin", None, "us", "all")
+    assert ran.wait(5)
+    aggregator.shutdown_refresh_pool()
+    assert aggregator._refresh_pool is None
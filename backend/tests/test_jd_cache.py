@@ -0,0 +1,51 @@
+import asyncio
+import hashlib
+
+import pytest
+
+from job_search.utils.response_cache import SQLiteCache
+from personality_fit import jd_cache, job_fit_analysis
+from personality_fit.jd_cache import jd_hash, normalize_jd
+
+VECTORS = {"job_traits": {"C": 100.0}, "job_env": {"autonomy": 1.0}}
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    store = SQLiteCache(str(tmp_path / "jd.sqlite3"))
+    monkeypatch.setattr(jd_cache, "_store", store)
+    return store
+
+
+def test_key_is_model_version_and_normalized_jd():
+    jd = "  Barista\n\nEarly   SHIFTS "
+    assert normalize_jd(jd) == "barista early shifts"
+    expected = hashlib.sha256(b"gpt-4o-mini|v2|barista early shifts").hexdigest()
+    assert jd_hash(jd, "gpt-4o-mini", "v2") == expected
+    assert jd_hash("barista early shifts", "gpt-4o-mini", "v2") == expected
+    assert jd_hash(jd, "gpt-4o-mini", "v3") != expected
+    assert jd_hash(jd, "gpt-4o", "v2") != expected
+    assert jd_hash("barista late shifts", "gpt-4o-mini", "v2") != expected
+
+
+def test_prompt_version_bump_misses_the_old_entries(monkeypatch, store):
+    calls = []
+
+    async def rate(jds):
+        calls.append(list(jds))
+        return [VECTORS for _ in jds]
+
+    monkeypatch.setattr(job_fit_analysis, "_rate_job_descriptions", rate)
+    jds = ["Barista, early shifts", "BARISTA,  early shifts", "Line cook"]
+
+    first = asyncio.run(job_fit_analysis.analyze_job_descriptions(jds))
+    assert first == [VECTORS] * 3
+    assert calls == [["Barista, early shifts", "Line cook"]]  # same normalized JD rated once
+
+    assert asyncio.run(job_fit_analysis.analyze_job_descriptions(jds)) == [VECTORS] * 3
+    assert len(calls) == 1  # all hits
+
+    monkeypatch.setattr(job_fit_analysis, "PROMPT_VERSION", "v-next")
+    asyncio.run(job_fit_analysis.analyze_job_descriptions(jds))
+    assert len(calls) == 2 and len(calls[1]) == 2  # old-version entries ignored
+    assert store.stats()["entries"] == 4
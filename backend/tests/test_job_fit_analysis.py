@@ -0,0 +1,49 @@
+import re
+import json
+import asyncio
+from types import SimpleNamespace
+
+from job_search.utils.response_cache import SQLiteCache
+from personality_fit import jd_cache, job_fit_analysis
+
+CANDIDATE = {
+    "traits": {"H": 50, "S": 50, "X": 50, "A": 50, "C": 50, "O": 50, "G": 50},
+    "environment": {"structure": 0.5, "sociality": 0.5, "stability": 0.5, "creativity": 0.5, "autonomy": 0.5},
+}
+
+
+class StubLLM:
+    """Rates every JD 5s; any batch containing a 'poison' JD fails."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def chat(self, **kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        self.batches.append(len(re.findall(r"=== JOB \d+ ===", prompt)))
+        if "poison" in prompt:
+            raise RuntimeError("upstream 500")
+        jobs = [{"job_id": n, "traits": {"C": [5]}, "environment": {"autonomy": [5]}}
+                for n in re.findall(r"=== JOB (\d+) ===", prompt)]
+        content = json.dumps({"jobs": jobs})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_failed_jds_come_back_as_errors_after_split_and_retry(monkeypatch, tmp_path):
+    monkeypatch.setattr(jd_cache, "_store", SQLiteCache(str(tmp_path / "jd.sqlite3")))
+    llm = StubLLM()
+    monkeypatch.setattr(job_fit_analysis, "get_llm_client", lambda: llm)
+
+    jds = ["Warehouse lead, forklift", "Barista, early shifts", "poison pill posting"]
+    results = asyncio.run(job_fit_analysis.calculate_fit_scores_async(CANDIDATE, jds))
+
+    # One batch of 3 fails, is split into 2 + 1; the poisoned single is retried once more
+    assert llm.batches[0] == 3
+    assert sorted(llm.batches[1:3]) == [1, 2]
+    assert llm.batches[3:] == [1]
+
+    assert [r["job_id"] for r in results] == ["1", "2", "3"]
+    assert "fit" in results[0] and "fit" in results[1]
+    assert "error" in results[2] and "fit" not in results[2]
+    # Only the rated JDs were cached
+    assert jd_cache.jd_cache_stats()["entries"] == 2
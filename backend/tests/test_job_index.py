@@ -0,0 +1,93 @@
+import os
+import json
+
+import numpy as np
+import pytest
+
+from personality_fit import job_index
+from personality_fit.job_index import JobIndex, DIMS, _SCALE
+
+
+def random_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    raw = np.concatenate([rng.uniform(0, 100, (n, 7)), rng.uniform(0, 1, (n, len(DIMS) - 7))], axis=1)
+    return (raw * _SCALE).astype(np.float32)
+
+
+def exhaustive(ids, points, q, k):
+    d = np.abs(points - q).sum(axis=1)
+    order = np.argsort(d, kind="stable")[:k]
+    return [ids[i] for i in order]
+
+
+@pytest.fixture(scope="module")
+def data():
+    points = random_points(3000)
+    ids = [f"job-{i}" for i in range(len(points))]
+    return ids, points
+
+
+def test_query_matches_exhaustive_scan(data):
+    ids, points = data
+    index = JobIndex.build(ids, points)
+    for q in random_points(20, seed=1):
+        got = [job_id for job_id, _ in index.query(q, 10)]
+        assert set(got) == set(exhaustive(ids, points, q, 10))
+
+
+def test_removed_and_added_jobs(data):
+    ids, points = data
+    index = JobIndex.build(ids, points)
+    q = points[0]
+    assert index.query(q, 1)[0] == ("job-0", 100.0)
+    index.remove("job-0")
+    assert "job-0" not in [j for j, _ in index.query(q, 5)]
+    index.add("new", q)
+    assert index.query(q, 1)[0][0] == "new"
+
+
+def test_compact_retrains_after_growth(monkeypatch):
+    monkeypatch.setattr(job_index, "RETRAIN_GROWTH", 2.0)
+    small = random_points(100)
+    index = JobIndex.build([f"a{i}" for i in range(100)], small)
+    assert index.trained_size == 100
+    for i, p in enumerate(random_points(150, seed=2)):
+        index.add(f"b{i}", p)
+    index.compact()
+    assert index.trained_size == 250
+    assert len(index.centroids) == int(np.sqrt(250))
+
+
+def test_save_load_roundtrip_keeps_one_consistent_version(tmp_path, data):
+    ids, points = data
+    index = JobIndex.build(ids, points)
+    for _ in range(3):
+        index.save(str(tmp_path))
+    versions = [e for e in os.listdir(tmp_path) if e.startswith("v")]
+    assert len(versions) == 2  # current + previous
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["version"] in versions
+
+    loaded = JobIndex.load(str(tmp_path))
+    assert loaded.trained_size == index.trained_size
+    q = random_points(1, seed=3)[0]
+    assert loaded.query(q, 10) == index.query(q, 10)
+
+
+def test_load_without_manifest_fails(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        JobIndex.load(str(tmp_path))
+
+
+def test_long_ids_survive_build_compact_and_reload(tmp_path):
+    points = random_points(40, seed=3)
+    long_id = "https://example.com/jobs/" + "x" * 200
+    index = JobIndex.build([f"job-{i}" for i in range(39)] + [long_id], points)
+    longer_id = long_id + "-and-then-some" * 10
+    index.add(longer_id, points[0])
+    index.save(str(tmp_path))
+
+    loaded = JobIndex.load(str(tmp_path))
+    assert {long_id, longer_id} <= set(loaded.ids.tolist())
+    assert loaded.remove(longer_id) and loaded.remove(long_id)
+    assert len(loaded) == 39
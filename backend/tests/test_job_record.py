@@ -0,0 +1,34 @@
+from job_search.utils.job_record import INTERNAL_FIELDS, DescriptionStore, JobRecord, as_record
+
+RAW = {
+    "job_id": "a", "job_title": "Cashier", "employer_name": "Corner Market",
+    "job_description": "Run the register.", "job_posted_at_datetime_utc": "2026-10-01T00:00:00Z",
+    "job_highlights": {"Qualifications": ["..."]},  # dropped on conversion
+}
+
+
+def test_to_dict_leaves_out_internal_fields():
+    record = as_record(RAW)
+    record.cluster_id = 0
+    out = record.to_dict()
+    assert record.posted_ts is not None
+    assert not INTERNAL_FIELDS & set(out)
+    assert out["job_description"] == "Run the register."
+    assert "job_highlights" not in out
+    assert record.to_dict(["job_title", "cluster_id", "posted_ts"]) == {"job_title": "Cashier"}
+
+
+def test_set_posted_at_keeps_posted_ts_current():
+    record = as_record(RAW)
+    record.set_posted_at("2026-10-02T00:00:00Z")
+    assert record.posted_ts == 1790899200
+    # Clearing the date keeps the last known timestamp
+    record.set_posted_at(None)
+    assert record.posted_ts == 1790899200
+
+
+def test_shared_description_store():
+    store = DescriptionStore()
+    a, b = JobRecord.from_raw(RAW, store), JobRecord.from_raw({**RAW, "job_id": "b"}, store)
+    assert a.description_id == b.description_id and len(store) == 1
+    assert as_record(a) is a
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import pytest
+
+from job_search.api_clients import jsearch_api
+from job_search.utils.response_cache import LRUCache, SQLiteCache
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+
+    def json(self):
+        return {"data": [{"job_id": "a"}]}
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return FakeResponse()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeClient()
+    monkeypatch.setattr(jsearch_api, "get_async_client", lambda: fake)
+    return fake
+
+
+def test_concurrent_identical_misses_share_one_api_call(client, monkeypatch):
+    monkeypatch.setattr(jsearch_api, "_cache", LRUCache())
+
+    async def run():
+        return await asyncio.gather(*(jsearch_api.fetch_jsearch_async("Cashier", "Austin") for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert client.calls == 1
+    assert all(r == {"data": [{"job_id": "a"}]} for r in results)
+    # Now cached
+    asyncio.run(jsearch_api.fetch_jsearch_async("cashier ", "austin"))
+    assert client.calls == 1 and not jsearch_api._inflight
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_fetch(client, monkeypatch):
+    monkeypatch.setattr(jsearch_api, "_cache", LRUCache())
+
+    async def run():
+        first = asyncio.create_task(jsearch_api.fetch_jsearch_async("cashier", "austin"))
+        second = asyncio.create_task(jsearch_api.fetch_jsearch_async("cashier", "austin"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == {"data": [{"job_id": "a"}]}
+    assert client.calls == 1
+
+
+def test_sqlite_backend_runs_off_the_event_loop(client, monkeypatch, tmp_path):
+    cache = SQLiteCache(str(tmp_path / "jsearch.sqlite3"))
+    threads = set()
+    for name in ("get", "set"):
+        method = getattr(cache, name)
+
+        def traced(*args, _method=method):
+            threads.add(threading.get_ident())
+            return _method(*args)
+
+        monkeypatch.setattr(cache, name, traced)
+    monkeypatch.setattr(jsearch_api, "_cache", cache)
+
+    async def run():
+        loop_thread = threading.get_ident()
+        await jsearch_api.fetch_jsearch_async("cashier", "austin")
+        await jsearch_api.fetch_jsearch_async("cashier", "austin")
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+    assert threads and loop_thread not in threads
+    assert client.calls == 1
@@ -0,0 +1,124 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from personality_fit import llm_client
+from personality_fit.llm_client import LLMClient, LLMDeadlineExceeded
+
+REQUEST = httpx.Request("POST", "https://api.test/v1/chat/completions")
+
+
+def api_error(cls, status, headers=None):
+    return cls("boom", response=httpx.Response(status, headers=headers or {}, request=REQUEST), body=None)
+
+
+class FakeCompletions:
+    """Raises the queued errors in order, then answers."""
+
+    def __init__(self, errors=(), hold: asyncio.Event | None = None):
+        self.errors = list(errors)
+        self.hold = hold
+        self.calls = 0
+
+    async def create(self, timeout=None, **kwargs):
+        self.calls += 1
+        if self.hold is not None:
+            await self.hold.wait()
+        if self.errors:
+            raise self.errors.pop(0)
+        return SimpleNamespace(answer=kwargs["messages"][0]["content"])
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """Record backoff waits instead of sleeping through them."""
+    waits, real_sleep = [], asyncio.sleep
+
+    async def fake_sleep(seconds, *args):
+        waits.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(llm_client.asyncio, "sleep", fake_sleep)
+    return waits
+
+
+def make_client(monkeypatch, completions):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    client = LLMClient(max_concurrency=4, rpm=0)
+    client._client = SimpleNamespace(chat=SimpleNamespace(completions=completions), close=None)
+    return client
+
+
+def chat(client, **kwargs):
+    return client.chat(model="m", messages=[{"role": "user", "content": "hi"}], **kwargs)
+
+
+def test_retries_429_and_5xx_then_succeeds(monkeypatch, delays):
+    fake = FakeCompletions([api_error(openai.RateLimitError, 429, {"retry-after": "2"}),
+                            api_error(openai.InternalServerError, 503)])
+    client = make_client(monkeypatch, fake)
+    result = asyncio.run(chat(client))
+    assert result.answer == "hi"
+    assert fake.calls == 3
+    assert delays[0] == 2.0  # Retry-After honoured
+    assert 0 <= delays[1] <= llm_client.BACKOFF_BASE * 2  # jittered backoff for the 503
+
+
+def test_retry_after_ms_wins(monkeypatch, delays):
+    fake = FakeCompletions([api_error(openai.RateLimitError, 429, {"retry-after-ms": "250", "retry-after": "9"})])
+    asyncio.run(chat(make_client(monkeypatch, fake)))
+    assert delays == [0.25]
+
+
+def test_gives_up_after_max_attempts(monkeypatch, delays):
+    fake = FakeCompletions([api_error(openai.InternalServerError, 500)] * 10)
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(chat(make_client(monkeypatch, fake)))
+    assert fake.calls == llm_client.LLM_MAX_ATTEMPTS
+    assert len(delays) == llm_client.LLM_MAX_ATTEMPTS - 1
+
+
+def test_does_not_wait_past_the_deadline(monkeypatch, delays):
+    fake = FakeCompletions([api_error(openai.RateLimitError, 429, {"retry-after": "30"})])
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(chat(make_client(monkeypatch, fake), deadline=5))
+    assert fake.calls == 1 and delays == []
+
+
+def test_expired_deadline_raises(monkeypatch, delays):
+    fake = FakeCompletions()
+    with pytest.raises(LLMDeadlineExceeded):
+        asyncio.run(chat(make_client(monkeypatch, fake), deadline=0))
+    assert fake.calls == 0
+
+
+def test_client_errors_are_not_retried(monkeypatch, delays):
+    fake = FakeCompletions([api_error(openai.BadRequestError, 400)])
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(chat(make_client(monkeypatch, fake)))
+    assert fake.calls == 1
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_request(monkeypatch):
+    async def run():
+        hold = asyncio.Event()
+        fake = FakeCompletions(hold=hold)
+        client = make_client(monkeypatch, fake)
+        first = asyncio.ensure_future(chat(client))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(chat(client))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        hold.set()
+        result = await second
+        return first, result, fake.calls
+
+    first, result, calls = asyncio.run(run())
+    assert first.cancelled()
+    assert result.answer == "hi"
+    assert calls == 1  # identical in-flight requests shared one API call
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from personality_fit.job_fit_analysis import fit_score, satisfaction_score
+from personality_fit.matrix_scoring import (
+    ENV_KEYS, TRAIT_KEYS, fit_matrix, pack_candidates, pack_jobs, satisfaction_matrix,
+    top_k_candidates, top_k_jobs,
+)
+
+
+def random_profiles(n, seed):
+    """Trait/env dicts with roughly one dimension in five missing."""
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(n):
+        traits = {k: float(rng.uniform(0, 100)) for k in TRAIT_KEYS if rng.random() > 0.2}
+        env = {k: float(rng.uniform(0, 1)) for k in ENV_KEYS if rng.random() > 0.2}
+        out.append((traits, env))
+    return out
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    candidates = [{"traits": t, "environment": e} for t, e in random_profiles(40, seed=0)]
+    jobs = [{"job_traits": t, "job_env": e} for t, e in random_profiles(60, seed=1)]
+    return candidates, jobs
+
+
+def test_matrices_match_per_pair_scores(profiles):
+    candidates, jobs = profiles
+    c, j = pack_candidates(candidates), pack_jobs(jobs)
+    fit, sat = fit_matrix(c, j), satisfaction_matrix(c, j)
+    for a, cand in enumerate(candidates):
+        for b, job in enumerate(jobs):
+            assert fit[a, b] == pytest.approx(fit_score(cand["traits"], job["job_traits"]), abs=1e-3)
+            assert sat[a, b] == pytest.approx(satisfaction_score(cand["environment"], job["job_env"]), abs=1e-3)
+
+
+def combined(candidates, jobs, fit_weight=0.5):
+    c, j = pack_candidates(candidates), pack_jobs(jobs)
+    return fit_weight * fit_matrix(c, j) + (1 - fit_weight) * satisfaction_matrix(c, j)
+
+
+@pytest.mark.parametrize("chunk_rows", [7, 256])
+def test_top_k_jobs_matches_full_sort(profiles, chunk_rows):
+    candidates, jobs = profiles
+    idx, vals = top_k_jobs(pack_candidates(candidates), pack_jobs(jobs), k=5, chunk_rows=chunk_rows)
+    full = combined(candidates, jobs)
+    assert idx.shape == (len(candidates), 5)
+    np.testing.assert_allclose(vals, -np.sort(-full, axis=1)[:, :5], atol=1e-4)
+    np.testing.assert_allclose(np.take_along_axis(full, idx, axis=1), vals, atol=1e-4)
+
+
+@pytest.mark.parametrize("chunk_rows", [7, 256])
+def test_top_k_candidates_matches_full_sort(profiles, chunk_rows):
+    candidates, jobs = profiles
+    idx, vals = top_k_candidates(pack_candidates(candidates), pack_jobs(jobs), k=3, chunk_rows=chunk_rows)
+    full = combined(candidates, jobs).T
+    assert idx.shape == (len(jobs), 3)
+    np.testing.assert_allclose(vals, -np.sort(-full, axis=1)[:, :3], atol=1e-4)
+    np.testing.assert_allclose(np.take_along_axis(full, idx, axis=1), vals, atol=1e-4)
+
+
+def test_k_larger_than_pool(profiles):
+    candidates, jobs = profiles
+    idx, _ = top_k_jobs(pack_candidates(candidates[:2]), pack_jobs(jobs[:3]), k=10)
+    assert idx.shape == (2, 3)
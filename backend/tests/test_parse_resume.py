@@ -0,0 +1,27 @@
+from fastapi.testclient import TestClient
+
+import main
+from resume_parser import ingest
+
+client = TestClient(main.app)
+
+
+def test_unsupported_type_is_a_400():
+    r = client.post("/parse_resume", files={"file": ("resume.exe", b"MZ...", "application/octet-stream")})
+    assert r.status_code == 400
+
+
+def test_oversized_upload_is_a_413():
+    body = b"x" * (ingest.RESUME_MAX_BYTES + 1)
+    r = client.post("/parse_resume", files={"file": ("resume.txt", body, "text/plain")})
+    assert r.status_code == 413
+
+
+def test_corrupt_pdf_is_a_400():
+    r = client.post("/parse_resume", files={"file": ("resume.pdf", b"%PDF-1.4 truncated" * 10, "application/pdf")})
+    assert r.status_code == 400
+
+
+def test_corrupt_docx_is_a_400():
+    r = client.post("/parse_resume", files={"file": ("resume.docx", b"PK\x03\x04junk", "application/octet-stream")})
+    assert r.status_code == 400
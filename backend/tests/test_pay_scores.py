@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+import pytest
+
+from job_search import aggregator
+from job_search.utils import salary_distribution
+from job_search.utils.job_record import as_record
+from job_search.utils.salary_distribution import SalaryDistribution, MIN_SAMPLES
+
+
+# The pre-vectorization formulas, kept here as the reference
+def baseline_fallback(job):
+    vals = [v for v in [job.get("job_min_salary"), job.get("job_max_salary")] if v]
+    if not vals:
+        return None
+    avg = np.mean(vals)
+    if avg < 1000:
+        avg *= 2080
+    lo, hi = 15000, 300000
+    avg = max(min(avg, hi), lo)
+    return round(1 + 9 * (np.log(avg) - np.log(lo)) / (np.log(hi) - np.log(lo)), 1)
+
+
+def baseline_scores(jobs):
+    def annual(job):
+        vals = [v for v in [job.get("job_min_salary"), job.get("job_max_salary")] if v]
+        if not vals:
+            return None
+        avg = np.mean(vals)
+        return avg * 2080 if avg < 1000 else avg
+
+    salaries = [a for a in map(annual, jobs) if a is not None]
+    if len(salaries) < 3:
+        return [baseline_fallback(job) for job in jobs]
+    mean = np.mean(salaries)
+    std = np.std(salaries) if np.std(salaries) > 0 else 1
+    out = []
+    for job in jobs:
+        a = annual(job)
+        out.append(None if a is None else round(1 + 9 / (1 + math.exp(-(a - mean) / std)), 1))
+    return out
+
+
+def random_jobs(n, seed):
+    rng = np.random.default_rng(seed)
+    jobs = []
+    for i in range(n):
+        kind = rng.integers(4)
+        if kind == 0:
+            lo = hi = None
+        elif kind == 1:  # hourly range
+            lo = float(rng.integers(12, 60))
+            hi = lo + float(rng.integers(0, 20))
+        else:
+            lo = float(rng.integers(20_000, 250_000))
+            hi = None if kind == 2 else lo + float(rng.integers(0, 80_000))
+        jobs.append({"job_id": f"j{i}", "job_min_salary": lo, "job_max_salary": hi})
+    return jobs
+
+
+@pytest.mark.parametrize("n,seed", [(1, 0), (2, 1), (3, 2), (10, 3), (200, 4)])
+def test_scores_match_baseline_formula(n, seed):
+    jobs = random_jobs(n, seed)
+    expected = baseline_scores(jobs)
+    scored = aggregator.compute_relative_pay_scores([as_record(dict(j)) for j in jobs])
+    assert [j.pay_score for j in scored] == expected
+
+
+def test_percentiles_switch_on_at_min_samples(monkeypatch, tmp_path):
+    dist = SalaryDistribution(str(tmp_path / "dist.sqlite3"))
+    monkeypatch.setattr(salary_distribution, "_dist", dist)
+    jobs = random_jobs(20, 5)
+    key = "cashier|austin"
+
+    history = np.linspace(20_000, 120_000, MIN_SAMPLES - 1)
+    dist.record(key, [f"h{i}" for i in range(len(history))], history)
+    below = aggregator.compute_relative_pay_scores([as_record(dict(j)) for j in jobs], key, record=False)
+    assert [j.pay_score for j in below] == baseline_scores(jobs)
+    assert all(j.pay_percentile is None for j in below)
+
+    dist.record(key, ["last"], np.array([130_000.0]))
+    above = aggregator.compute_relative_pay_scores([as_record(dict(j)) for j in jobs], key, record=False)
+    _, annual, _, _ = aggregator.salary_columns(above)
+    pct = dist.percentiles(key, annual)
+    for job, p in zip(above, pct):
+        if np.isnan(p):
+            assert job.pay_score is None and job.pay_percentile is None
+        else:
+            assert job.pay_score == round(1 + 9 * float(p), 1)
+            assert job.pay_percentile == round(float(p) * 100, 1)
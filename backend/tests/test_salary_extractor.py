@@ -0,0 +1,58 @@
+import pytest
+
+from job_search import aggregator
+from job_search.utils.job_record import as_record
+from job_search.utils.salary_extractor import SalaryInfo, extract_salary, parse_salary_range
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Pay: $15.00 - $16.00 per hour", SalaryInfo("$15.00 - $16.00 per hour", 15.0, 16.0, "hour", None)),
+    ("Pay rate $20/hr", SalaryInfo("$20/hr", 20.0, None, "hour", None)),
+    ("Salary:\n$45,000 per year", SalaryInfo("$45,000 per year", 45000.0, None, "year", None)),
+    ("Compensation is $52,000 CAD annually",
+     SalaryInfo("Compensation is $52,000 CAD annually", 52000.0, None, "year", "CAD")),
+])
+def test_extract_salary(text, expected):
+    assert extract_salary(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "No numbers about pay here", "We rate our staff highly\nOpen 24 hours"])
+def test_no_salary(text):
+    assert extract_salary(text) is None
+
+
+def test_first_mention_wins():
+    text = "About us\nPay: $18 per hour\nBonus pay: $500 per year"
+    assert extract_salary(text).min == 18.0
+
+
+def test_parse_salary_range():
+    assert parse_salary_range("$15.00 - $16.00 per hour") == (15.0, 16.0)
+    assert parse_salary_range("$45,000 per year") == (45000.0, None)
+    assert parse_salary_range(None) == (None, None)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    store = {}
+    monkeypatch.setattr(aggregator, "get_enrichment", lambda kind, job: store.get((kind, job["job_id"])))
+    monkeypatch.setattr(aggregator, "put_enrichment",
+                        lambda kind, job, value: store.__setitem__((kind, job["job_id"]), value))
+    return store
+
+
+def test_cache_hit_restores_salary_period(cache):
+    scraped = as_record({"job_id": "a"})
+    aggregator._store_salary(scraped, extract_salary("Pay: $20 per hour"))
+    assert scraped.job_salary_period == "HOUR"
+
+    repeat = as_record({"job_id": "a"})
+    aggregator._fill_from_cache(repeat)
+    assert (repeat.job_min_salary, repeat.job_salary_period) == (20.0, "HOUR")
+
+
+def test_cluster_duplicates_get_the_salary_period():
+    rep = as_record({"job_id": "a", "job_min_salary": 20.0, "job_salary_period": "HOUR"})
+    dup = as_record({"job_id": "b", "cluster_id": 0})
+    aggregator.share_cluster_enrichment([rep, dup])
+    assert (dup.job_min_salary, dup.job_salary_period) == (20.0, "HOUR")
@@ -0,0 +1,141 @@
+import time
+
+import pytest
+
+from job_search import aggregator
+from job_search.utils import job_record
+from job_search.utils.search_index import SearchIndex
+
+QUERY = ("retail cashier", "Austin, TX", None, "us", "all")
+
+
+def job(i, title="Cashier", company=None, description=None):
+    company = company or f"Store {i}"
+    return {
+        "job_id": f"job-{i}",
+        "job_title": title,
+        "employer_name": company,
+        "job_description": description or f"Run the register and help customers at {company} #{i}.",
+        "job_city": "Austin",
+        "job_state": "TX",
+        "job_country": "US",
+        "job_apply_link": f"https://jobs.example.com/{i}",
+        "job_posted_at_datetime_utc": "2026-10-01T00:00:00Z",
+    }
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    idx = SearchIndex(str(tmp_path / "search_index.sqlite3"))
+    monkeypatch.setattr(aggregator, "get_search_index", lambda: idx)
+    monkeypatch.setattr(aggregator, "INDEX_MODE", "prefer")
+    return idx
+
+
+def test_repeat_query_returns_the_live_results(index):
+    # None of these mention "retail", so an all-words FTS match finds nothing
+    live = [job(i) for i in range(15)]
+    aggregator.index_jobs(live, aggregator.index_query_key(*QUERY))
+    assert index.search("retail cashier", facets=False)["total"] == 0
+
+    hits, stale = aggregator.search_index_first(*QUERY)
+    assert not stale
+    assert sorted(j["job_id"] for j in hits) == sorted(j["job_id"] for j in live)
+
+
+def test_unseen_query_goes_live(index):
+    aggregator.index_jobs([job(i) for i in range(15)], aggregator.index_query_key(*QUERY))
+    assert aggregator.search_index_first("barista", "Austin, TX") == (None, True)
+
+
+def test_pruned_results_fall_back_to_live_when_index_has_fewer(index):
+    aggregator.index_jobs([job(i) for i in range(15)], aggregator.index_query_key(*QUERY))
+    with index._lock:
+        index._conn.execute("DELETE FROM jobs WHERE job_key IN ('id:job-0', 'id:job-1')")
+    assert aggregator.search_index_first(*QUERY) == (None, True)
+
+
+def test_index_answers_keep_duplicates_clustered(index):
+    text = "Cashier wanted at Corner Market. Run the register, stock shelves, greet customers."
+    live = [job(1, company="Corner Market", description=text),
+            job(2, company="Corner Market", description=text),
+            *[job(i) for i in range(3, 10)]]
+    aggregator.index_jobs(live, aggregator.index_query_key(*QUERY))
+
+    hits, _ = aggregator.search_index_first(*QUERY)
+    clusters = {j["job_id"]: j["cluster_id"] for j in hits}
+    assert clusters["job-1"] == clusters["job-2"]
+    assert len(set(clusters.values())) == len(hits) - 1
+
+
+def test_search_filters_and_facets(index):
+    index.upsert([job(1, title="Cashier"), job(2, title="Line Cook")])
+    found = index.search("cashier", location="Austin, TX")
+    assert [j["job_id"] for j in found["results"]] == ["job-1"]
+    assert found["facets"]["location"] == {"austin, tx, us": 1}
+    assert index.search("cashier", location="Denver")["total"] == 0
+
+
+def test_timestamp_only_jobs_survive_the_index_round_trip(index):
+    # Dated only by JSearch's epoch timestamp: no ISO field, no "posted" text
+    live = aggregator.ResultMerger()
+    live.add([{**job(i), "job_posted_at_datetime_utc": None, "job_posted_at_timestamp": 1790000000 + i}
+              for i in range(8)])
+    live = live.results()
+    assert len(aggregator.finalize_jobs(live, date_posted="all")) == 8
+
+    aggregator.index_jobs(live, aggregator.index_query_key(*QUERY))
+    hits, _ = aggregator.search_index_first(*QUERY)
+    assert sorted(j.posted_ts for j in hits) == [1790000000 + i for i in range(8)]
+    assert len(aggregator.finalize_jobs(hits, date_posted="all")) == 8
+
+
+def test_relative_dates_do_not_drift_on_reload(index, monkeypatch):
+    live = aggregator.ResultMerger()
+    live.add([{**job(1), "job_posted_at_datetime_utc": None, "posted": "3 days ago"}])
+    (record,) = live.results()
+    aggregator.index_jobs([record], aggregator.index_query_key(*QUERY))
+
+    later = time.time() + 2 * 86400
+    monkeypatch.setattr(job_record.time, "time", lambda: later)
+    monkeypatch.setattr(aggregator, "INDEX_FRESH_SECONDS", 3 * 86400)
+    (hit,), _ = aggregator.search_index_first(*QUERY)
+    assert hit.posted_ts == record.posted_ts
+
+
+def test_index_answers_pick_up_enrichment_finished_since(index, monkeypatch):
+    # Queue mode: indexed before the workers scraped the salary
+    live = aggregator.ResultMerger()
+    live.add([{**job(i), "job_min_salary": None, "job_max_salary": None} for i in range(6)])
+    aggregator.index_jobs(live.results(), aggregator.index_query_key(*QUERY))
+
+    cache = {("salary", "job-0"): {"found": True, "min": 18.0, "max": 20.0, "period": "hour"}}
+    monkeypatch.setattr(aggregator, "get_enrichment", lambda kind, j: cache.get((kind, j.job_id)))
+    hits, _ = aggregator.search_index_first(*QUERY)
+    filled = next(j for j in hits if j.job_id == "job-0")
+    assert (filled.job_min_salary, filled.job_salary_period) == (18.0, "HOUR")
+
+    # Written back, so the next answer has it without the cache
+    cache.clear()
+    hits, _ = aggregator.search_index_first(*QUERY)
+    assert next(j for j in hits if j.job_id == "job-0").job_min_salary == 18.0
+
+
+def test_index_answers_do_not_re_record_salaries(index, monkeypatch):
+    class Distribution:
+        recorded = 0
+
+        def percentiles(self, key, annual):
+            return None
+
+        def record(self, key, job_ids, annual):
+            Distribution.recorded += 1
+
+    monkeypatch.setattr(aggregator, "get_salary_distribution", Distribution)
+    monkeypatch.setattr(aggregator, "get_enrichment", lambda kind, j: None)
+    live = aggregator.ResultMerger()
+    live.add([{**job(i), "job_min_salary": 15.0 + i, "job_max_salary": 16.0 + i} for i in range(6)])
+    aggregator.index_jobs(live.results(), aggregator.index_query_key(*QUERY))
+
+    results = aggregator.job_search_pipeline(*QUERY)
+    assert len(results) == 6 and Distribution.recorded == 0
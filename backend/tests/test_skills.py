@@ -0,0 +1,35 @@
+import pytest
+
+from resume_parser.skills import get_skill_extractor
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return get_skill_extractor()
+
+
+def skills(extractor, text):
+    return [skill_id for skill_id, _, _ in extractor.scan(text)]
+
+
+@pytest.mark.parametrize("text", ["Led R&D projects", "Reported to the C-suite", "A real Go-getter"])
+def test_short_terms_glued_to_joiners_are_not_skills(extractor, text):
+    assert not {"r", "c", "go"} & set(skills(extractor, text))
+
+
+def test_standalone_short_terms_still_match(extractor):
+    assert skills(extractor, "Python, R and Go.") == ["python", "r", "go"]
+
+
+def test_slash_lists_of_skills_still_match(extractor):
+    found = skills(extractor, "UX/UI designer, AP/AR clerk, C/C++ developer")
+    assert found == ["ux-design", "ui-design", "accounts-payable", "accounts-receivable", "c", "cpp"]
+
+
+def test_case_sensitive_terms_need_exact_spelling(extractor):
+    assert "go" not in skills(extractor, "ready to go")
+    assert "go" in skills(extractor, "services written in Go")
+
+
+def test_longest_match_wins(extractor):
+    assert skills(extractor, "JavaScript and Java") == ["javascript", "java"]
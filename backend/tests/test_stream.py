@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from job_search import aggregator
+from job_search.utils.job_record import as_record
+
+
+def job(i, cluster_id):
+    return as_record({"job_id": f"job-{i}", "job_title": "Cashier", "employer_name": f"Store {cluster_id}",
+            "job_min_salary": None, "job_max_salary": None, "job_salary_period": None,
+            "job_posted_at_datetime_utc": None, "job_employment_type": "FULLTIME",
+            "job_country": "us", "cluster_id": cluster_id})
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    jobs = [job(0, 0), job(1, 0), job(2, 2)]
+    scraped = []
+
+    async def fetch_all_sources(*args):
+        return jobs
+
+    async def process_job_async(j):
+        scraped.append(j.job_id)
+        j.job_min_salary, j.job_max_salary, j.job_salary_period = 20.0, 22.0, "HOUR"
+        j.set_posted_at("2026-10-01T00:00:00Z")
+
+    monkeypatch.setattr(aggregator, "fetch_all_sources", fetch_all_sources)
+    monkeypatch.setattr(aggregator, "process_job_async", process_job_async)
+    monkeypatch.setattr(aggregator, "ENRICHMENT_MODE", "inline")
+    monkeypatch.setattr(aggregator, "index_jobs", lambda *args: None)
+    monkeypatch.setattr(aggregator, "distribution_key", lambda *args: None)
+    return jobs, scraped
+
+
+def collect(**kwargs):
+    async def run():
+        return [e async for e in aggregator.stream_job_search("cashier", "Austin, TX", **kwargs)]
+    return asyncio.run(run())
+
+
+def test_events_in_order_with_one_scrape_per_cluster(pipeline):
+    jobs, scraped = pipeline
+    events = collect()
+    kinds = [e["event"] for e in events]
+    assert kinds[0] == "results" and kinds[-1] == "done"
+    assert sorted(scraped) == ["job-0", "job-2"]
+
+    updates = sorted((e for e in events if e["event"] == "update"), key=lambda e: e["indexes"])
+    assert [e["indexes"] for e in updates] == [[0, 1], [2]]
+    assert updates[0]["job_ids"] == ["job-0", "job-1"]
+    assert updates[0]["fields"]["job_salary_period"] == "HOUR"
+
+
+def test_duplicates_get_the_representative_enrichment(pipeline):
+    jobs, _ = pipeline
+    done = collect()[-1]
+    assert len(done["results"]) == 3
+    dup = jobs[1]
+    assert (dup.job_min_salary, dup.job_salary_period) == (20.0, "HOUR")
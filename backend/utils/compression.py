@@ -0,0 +1,132 @@
+"""
+ASGI response compression negotiated from Accept-Encoding.
+
+- brotli ("br", when the brotli package is installed) or gzip, honouring
+  q-values; identity otherwise
+- only complete bodies of at least `minimum_size` bytes are compressed
+- streaming responses (NDJSON/SSE, or any body sent in several chunks) pass
+  through untouched, so events still reach the client as they're produced
+- every other response carries Vary: Accept-Encoding (merged into the app's
+  own Vary), compressed or not, so shared caches key on the encoding
+"""
+
+import gzip
+import asyncio
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+STREAMING_TYPES = (b"text/event-stream", b"application/x-ndjson")
+# Bodies above this are compressed in a thread rather than on the event loop
+THREAD_THRESHOLD = 256 * 1024
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """"gzip, br;q=0.8, *;q=0" -> {"gzip": 1.0, "br": 0.8, "*": 0.0}"""
+    prefs = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            prefs[name.strip().lower()] = q
+    return prefs
+
+
+def choose_encoding(header: str) -> str | None:
+    prefs = parse_accept_encoding(header)
+    offers = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for enc in offers:
+        q = prefs.get(enc, prefs.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def add_vary(headers) -> list:
+    """`headers` with Accept-Encoding merged into a single Vary header."""
+    out, tokens = [], []
+    for key, value in headers:
+        if key.lower() == b"vary":
+            tokens += [t.strip() for t in value.decode("latin-1").split(",") if t.strip()]
+        else:
+            out.append((key, value))
+    if "*" not in tokens and "accept-encoding" not in (t.lower() for t in tokens):
+        tokens.append("Accept-Encoding")
+    out.append((b"vary", ", ".join(tokens).encode("latin-1")))
+    return out
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 5, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+
+        start = None
+        passthrough = False
+
+        async def wrapped_send(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                response_headers = dict(message.get("headers") or [])
+                content_type = response_headers.get(b"content-type", b"")
+                if b"content-encoding" in response_headers or content_type.startswith(STREAMING_TYPES):
+                    passthrough = True
+                    await send(message)
+                elif encoding is None:
+                    # Identity for this client, but another might get gzip
+                    passthrough = True
+                    await send({**message, "headers": add_vary(message.get("headers") or [])})
+                else:
+                    start = message  # held until we know the body size
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                return await send(message)
+
+            body = message.get("body", b"")
+            if start is not None:
+                held, start = start, None
+                if message.get("more_body") or len(body) < self.minimum_size:
+                    # Streamed or too small: send as is
+                    passthrough = True
+                    await send({**held, "headers": add_vary(held.get("headers") or [])})
+                    return await send(message)
+
+                if len(body) > THREAD_THRESHOLD:
+                    compressed = await asyncio.to_thread(self.compress, body, encoding)
+                else:
+                    compressed = self.compress(body, encoding)
+                out_headers = [(k, v) for k, v in held.get("headers", []) if k.lower() != b"content-length"]
+                out_headers = add_vary(out_headers) + [
+                    (b"content-encoding", encoding.encode()),
+                    (b"content-length", str(len(compressed)).encode()),
+                ]
+                await send({**held, "headers": out_headers})
+                return await send({"type": "http.response.body", "body": compressed})
+            await send(message)
+
+        await self.app(scope, receive, wrapped_send)
@@ -0,0 +1,54 @@
+"""
+JSON encoding for API responses without FastAPI's jsonable_encoder walk.
+
+orjson (when installed) serializes dicts, lists, datetimes and numpy
+scalars/arrays natively in C; objects it doesn't know (JobRecords, ...)
+go through `default`. Without orjson the stdlib encoder is used with the
+same conversions.
+"""
+
+import json
+from typing import Any, Callable
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _to_builtin(obj):
+    """Objects neither encoder handles natively."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+
+def dumps(obj: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """UTF-8 JSON bytes."""
+    default = default or _to_builtin
+    if orjson is not None:
+        return orjson.dumps(obj, default=default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return _stdlib_dumps(obj, default)
+
+
+def _stdlib_dumps(obj, default) -> bytes:
+    def fallback(o):
+        if isinstance(o, np.generic):
+            return o.item()
+        return default(o)
+    return json.dumps(obj, default=fallback, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Return this from an endpoint to skip jsonable_encoder entirely."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)